@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput of reprocessing archived encrypted callbacks, one by one with
+``decrypt_message`` + ``parse_message`` against ``decrypt_and_parse_many``::
+
+    PYTHONPATH=. python benchmarks/bench_bulk_decrypt.py [count]
+"""
+import os
+import re
+import sys
+import time
+
+from wechatpy import parse_message
+from wechatpy.crypto import WeChatCrypto
+
+XML = """<xml>
+<ToUserName><![CDATA[toUser]]></ToUserName>
+<FromUserName><![CDATA[fromUser]]></FromUserName>
+<CreateTime>1348831860</CreateTime>
+<MsgType><![CDATA[text]]></MsgType>
+<Content><![CDATA[message {index}]]></Content>
+<MsgId>{index}</MsgId>
+</xml>"""
+
+
+def archive(crypto, count):
+    callbacks = []
+    for index in range(count):
+        encrypted = crypto.encrypt_message(XML.format(index=index), "nonce", "1411525903")
+        signature = re.search(r"<MsgSignature><!\[CDATA\[(\w+)\]\]>", encrypted).group(1)
+        callbacks.append((encrypted, signature, "1411525903", "nonce"))
+    return callbacks
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    crypto = WeChatCrypto("token", "kWxPEV2UEDyxWpmPdKC3F4dgPDmOvfKX1HGnEUDS1aR", "wx49f0ab532d5d035a")
+    callbacks = archive(crypto, count)
+
+    start = time.perf_counter()
+    for callback in callbacks:
+        parse_message(crypto.decrypt_message(*callback))
+    elapsed = time.perf_counter() - start
+    print(f"{'sequential':>24} {count / elapsed:>10.0f} msg/s")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        for ordered in (True, False):
+            start = time.perf_counter()
+            for _ in crypto.decrypt_and_parse_many(callbacks, workers=workers, ordered=ordered):
+                pass
+            elapsed = time.perf_counter() - start
+            name = f"{workers} workers{'' if ordered else ', unordered'}"
+            print(f"{name:>24} {count / elapsed:>10.0f} msg/s")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
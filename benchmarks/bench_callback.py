@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+End-to-end cost of an encrypted (safe mode) callback: envelope, signature,
+decryption and message parsing, with ``decrypt_message`` followed by
+``parse_message`` compared with the single pass ``decrypt_and_parse``::
+
+    PYTHONPATH=. python benchmarks/bench_callback.py
+"""
+import re
+import timeit
+
+from wechatpy import parse_message
+from wechatpy.crypto import WeChatCrypto
+from wechatpy.work import parse_message as parse_work_message
+from wechatpy.work.crypto import WeChatCrypto as WorkWeChatCrypto
+
+TOKEN = "123456"
+ENCODING_AES_KEY = "kWxPEV2UEDyxWpmPdKC3F4dgPDmOvfKX1HGnEUDS1aR"
+APP_ID = "wx49f0ab532d5d035a"
+NONCE = "461056294"
+TIMESTAMP = "1411525903"
+XML = """<xml>
+<ToUserName><![CDATA[toUser]]></ToUserName>
+<FromUserName><![CDATA[fromUser]]></FromUserName>
+<CreateTime>1348831860</CreateTime>
+<MsgType><![CDATA[text]]></MsgType>
+<Content><![CDATA[this is a test]]></Content>
+<MsgId>1234567890123456</MsgId>
+<AgentID>1</AgentID>
+</xml>"""
+
+
+def run(crypto, parse, number=10000):
+    envelope = crypto.encrypt_message(XML, NONCE, TIMESTAMP)
+    signature = re.search(r"<MsgSignature><!\[CDATA\[(\w+)\]\]>", envelope).group(1)
+    # WeChat posts the envelope with ToUserName first
+    envelope = envelope.replace("<xml>", "<xml>\n<ToUserName><![CDATA[toUser]]></ToUserName>", 1)
+
+    def two_pass():
+        return parse(crypto.decrypt_message(envelope, signature, TIMESTAMP, NONCE))
+
+    def single_pass():
+        return crypto.decrypt_and_parse(envelope, signature, TIMESTAMP, NONCE)
+
+    def single_pass_lazy():
+        return crypto.decrypt_and_parse(envelope, signature, TIMESTAMP, NONCE, lazy=True)
+
+    assert two_pass().content == single_pass().content == single_pass_lazy().content
+    return [timeit.timeit(func, number=number) / number * 1e6 for func in (two_pass, single_pass, single_pass_lazy)]
+
+
+def main():
+    print(f"{'crypto':>16} {'2-pass µs':>10} {'1-pass µs':>10} {'lazy µs':>10}")
+    for name, crypto_class, parse in (
+        ("wechatpy", WeChatCrypto, parse_message),
+        ("wechatpy.work", WorkWeChatCrypto, parse_work_message),
+    ):
+        timings = run(crypto_class(TOKEN, ENCODING_AES_KEY, APP_ID), parse)
+        print(f"{name:>16} " + " ".join(f"{timing:>10.2f}" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+Client construction cost, e.g. ``WeChatComponent.get_client_by_appid`` per request::
+
+    PYTHONPATH=. python benchmarks/bench_client_construction.py
+"""
+import timeit
+
+from wechatpy import WeChatClient, WeChatComponent
+from wechatpy.client import WeChatComponentClient
+from wechatpy.session.memorystorage import MemoryStorage
+from wechatpy.work import WeChatClient as WorkWeChatClient
+
+
+def main(number=20000):
+    session = MemoryStorage()
+    component = WeChatComponent("component_appid", "secret", "token", "a" * 43, session=session)
+    cases = {
+        "WeChatClient": lambda: WeChatClient("appid", "secret", session=session),
+        "WeChatClient + 1 endpoint": lambda: WeChatClient("appid", "secret", session=session).user,
+        "work WeChatClient": lambda: WorkWeChatClient("corp_id", "secret", session=session),
+        "WeChatComponentClient": lambda: WeChatComponentClient("appid", component, session=session),
+    }
+    for name, func in cases.items():
+        seconds = timeit.timeit(func, number=number)
+        print(f"{name:<28} {seconds / number * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Safe mode encrypt_message/decrypt_message throughput for official accounts and
+WeChat Work::
+
+    PYTHONPATH=. python benchmarks/bench_crypto.py
+"""
+import re
+import timeit
+
+from wechatpy.crypto import WeChatCrypto
+from wechatpy.work.crypto import WeChatCrypto as WorkWeChatCrypto
+
+TOKEN = "123456"
+ENCODING_AES_KEY = "kWxPEV2UEDyxWpmPdKC3F4dgPDmOvfKX1HGnEUDS1aR"
+APP_ID = "wx49f0ab532d5d035a"
+NONCE = "461056294"
+TIMESTAMP = "1411525903"
+XML = """<xml>
+<ToUserName><![CDATA[toUser]]></ToUserName>
+<FromUserName><![CDATA[fromUser]]></FromUserName>
+<CreateTime>1348831860</CreateTime>
+<MsgType><![CDATA[text]]></MsgType>
+<Content><![CDATA[{content}]]></Content>
+<MsgId>1234567890123456</MsgId>
+</xml>"""
+
+
+def run(crypto, size, number=10000):
+    xml = XML.format(content="x" * size)
+    encrypted = crypto.encrypt_message(xml, NONCE, TIMESTAMP)
+    signature = re.search(r"<MsgSignature><!\[CDATA\[(\w+)\]\]>", encrypted).group(1)
+    assert crypto.decrypt_message(encrypted, signature, TIMESTAMP, NONCE) == xml
+    encrypt = timeit.timeit(lambda: crypto.encrypt_message(xml, NONCE, TIMESTAMP), number=number)
+    decrypt = timeit.timeit(lambda: crypto.decrypt_message(encrypted, signature, TIMESTAMP, NONCE), number=number)
+    return encrypt / number * 1e6, decrypt / number * 1e6
+
+
+def main():
+    print(f"{'crypto':>16} {'bytes':>6} {'encrypt µs':>11} {'decrypt µs':>11}")
+    for name, crypto_class in (("wechatpy", WeChatCrypto), ("wechatpy.work", WorkWeChatCrypto)):
+        crypto = crypto_class(TOKEN, ENCODING_AES_KEY, APP_ID)
+        for size in (16, 1024, 16384):
+            encrypt, decrypt = run(crypto, size)
+            print(f"{name:>16} {size:>6} {encrypt:>11.2f} {decrypt:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+MessageDispatcher cost against the number of registered EventKeys, compared with
+the if/elif chain over ``startswith`` it replaces::
+
+    PYTHONPATH=. python benchmarks/bench_dispatcher.py
+"""
+import random
+import timeit
+
+from wechatpy import MessageDispatcher, parse_message
+
+XML = """<xml>
+<ToUserName><![CDATA[toUser]]></ToUserName>
+<FromUserName><![CDATA[fromUser]]></FromUserName>
+<CreateTime>123456789</CreateTime>
+<MsgType><![CDATA[event]]></MsgType>
+<Event><![CDATA[CLICK]]></Event>
+<EventKey><![CDATA[{key}]]></EventKey>
+</xml>"""
+
+
+def handler(message):
+    return message
+
+
+def run(size, number=20000):
+    keys = [f"MENU_{i}" for i in range(size)]
+    prefixes = [f"SCENE_{i}|" for i in range(size)]
+    dispatcher = MessageDispatcher()
+    chain = []
+    for key, prefix in zip(keys, prefixes):
+        dispatcher.register("event", "click", key=key)(handler)
+        dispatcher.register("event", "click", prefix=prefix)(handler)
+        chain.append((key, prefix))
+
+    def linear(message):
+        key = message.key
+        for exact, prefix in chain:
+            if key == exact or key.startswith(prefix):
+                return handler(message)
+
+    messages = [
+        parse_message(XML.format(key=random.choice((random.choice(keys), random.choice(prefixes) + "x"))))
+        for _ in range(100)
+    ]
+    results = []
+    for dispatch in (dispatcher.dispatch, linear):
+        elapsed = timeit.timeit(lambda: [dispatch(message) for message in messages], number=number // 100)
+        results.append(elapsed / number * 1e9)
+    return results
+
+
+def main():
+    print(f"{'keys':>8} {'dispatcher ns':>14} {'if/elif ns':>12}")
+    for size in (10, 1000, 10000):
+        dispatcher, linear = run(size)
+        print(f"{size * 2:>8} {dispatcher:>14.0f} {linear:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
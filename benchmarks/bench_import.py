@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+Cold import time of common entry points, each measured in a fresh interpreter::
+
+    PYTHONPATH=. python benchmarks/bench_import.py
+"""
+import statistics
+import subprocess
+import sys
+
+CASES = {
+    "import wechatpy": "import wechatpy",
+    "WeChatCrypto": "from wechatpy.crypto import WeChatCrypto",
+    "parse_message": "from wechatpy import parse_message",
+    "WeChatClient": "from wechatpy import WeChatClient",
+    "work parse_message": "from wechatpy.work import parse_message",
+    "WeChatPay": "from wechatpy import WeChatPay",
+    "wechatpy.events": "import wechatpy.events",
+    "wechatpy.work.events": "import wechatpy.work.events",
+    "wechatpy.replies": "import wechatpy.replies",
+}
+
+
+def measure(code, repeat=7):
+    script = f"import time\nstart = time.perf_counter()\n{code}\nprint(time.perf_counter() - start)"
+    samples = [float(subprocess.check_output([sys.executable, "-c", script])) for _ in range(repeat)]
+    return statistics.median(samples)
+
+
+def main():
+    for name, code in CASES.items():
+        print(f"{name:<20} {measure(code) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
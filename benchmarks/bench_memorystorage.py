@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+MemoryStorage get/set cost against the number of stored entries::
+
+    PYTHONPATH=. python benchmarks/bench_memorystorage.py
+"""
+import timeit
+
+from wechatpy.session.memorystorage import MemoryStorage
+
+
+def run(size, maxsize=None, number=100000):
+    session = MemoryStorage(maxsize=maxsize)
+    for i in range(size):
+        session.set(f"key{i}", i, ttl=7200)
+    keys = [f"key{i % size}" for i in range(number)]
+    it = iter(keys)
+    get = timeit.timeit(lambda: session.get(next(it)), number=number)
+    it = iter(keys)
+    set_ = timeit.timeit(lambda: session.set(next(it), 1, 7200), number=number)
+    return get / number * 1e9, set_ / number * 1e9
+
+
+def main():
+    print(f"{'entries':>10} {'maxsize':>10} {'get ns/op':>12} {'set ns/op':>12}")
+    for size in (100, 10000, 1000000):
+        for maxsize in (None, size):
+            get, set_ = run(size, maxsize)
+            print(f"{size:>10} {str(maxsize):>10} {get:>12.0f} {set_:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Message object memory and field access cost::
+
+    PYTHONPATH=. python benchmarks/bench_messages.py
+"""
+import timeit
+import tracemalloc
+
+from wechatpy import parse_message
+from wechatpy.messages import TextMessage
+from wechatpy.utils import parse_xml
+
+XML = """<xml>
+<ToUserName><![CDATA[toUser]]></ToUserName>
+<FromUserName><![CDATA[fromUser]]></FromUserName>
+<CreateTime>1348831860</CreateTime>
+<MsgType><![CDATA[text]]></MsgType>
+<Content><![CDATA[this is a test]]></Content>
+<MsgId>1234567890123456</MsgId>
+</xml>"""
+
+
+def memory(count=10000, read=False):
+    data = [parse_xml(XML)["xml"] for _ in range(count)]
+    tracemalloc.start()
+    messages = [TextMessage(item) for item in data]
+    if read:
+        for message in messages:
+            message.source, message.create_time, message.content, message.id
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / count
+
+
+def access(name, number=200000):
+    message = parse_message(XML)
+    elapsed = timeit.timeit(f"message.{name}", globals={"message": message}, number=number)
+    return elapsed / number * 1e9
+
+
+def main():
+    print(f"{'bytes/message, fields not read':>36} {memory():>8.0f}")
+    print(f"{'bytes/message, 4 fields read':>36} {memory(read=True):>8.0f}")
+    for name in ("source", "content", "id", "create_time"):
+        print(f"{'ns/access ' + name:>36} {access(name):>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Callback XML parsing throughput, xmltodict against ``wechatpy.utils.parse_xml``
+and lazy ``parse_message``, on the ``<xml>`` messages found in the test suite::
+
+    PYTHONPATH=. python benchmarks/bench_parser.py
+"""
+import ast
+import glob
+import os
+import timeit
+
+import xmltodict
+
+from wechatpy.parser import parse_message
+from wechatpy.utils import _NotFlat, _parse_flat_xml, parse_xml, to_binary
+
+TESTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "tests")
+MODULES = ("test_parser.py", "test_work_parser.py", "test_events.py")
+
+
+def load_messages():
+    messages = []
+    for module in MODULES:
+        with open(os.path.join(TESTS_PATH, module), encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str) and node.value.startswith("<xml>"):
+                messages.append(node.value)
+    return messages
+
+
+def is_flat(xml):
+    try:
+        _parse_flat_xml(to_binary(xml))
+        return True
+    except _NotFlat:
+        return False
+
+
+def run(name, func, messages, number):
+    elapsed = timeit.timeit(lambda: [func(xml) for xml in messages], number=number)
+    total = len(messages) * number
+    print(f"{name:>24} {total / elapsed:>12.0f} msg/s {elapsed / total * 1e6:>8.2f} us/msg")
+
+
+def main(number=200):
+    messages = load_messages()
+    flat = [xml for xml in messages if is_flat(xml)]
+    nested = [xml for xml in messages if not is_flat(xml)]
+    print(f"{len(messages)} messages from {', '.join(MODULES)}, {len(flat)} flat, {len(nested)} nested")
+    for title, group in (("all", messages), ("flat", flat), ("nested", nested)):
+        print(title)
+        run("xmltodict.parse", xmltodict.parse, group, number)
+        run("parse_xml", parse_xml, group, number)
+    print("parse_message")
+    callbacks = [xml for xml in messages if "<MsgType>" in xml]
+    run("eager", lambda xml: dict(parse_message(xml)._data), callbacks, number)
+    run("lazy, routing only", lambda xml: parse_message(xml, lazy=True).type, callbacks, number)
+    run("lazy, all fields", lambda xml: dict(parse_message(xml, lazy=True)._data), callbacks, number)
+
+
+if __name__ == "__main__":
+    main()
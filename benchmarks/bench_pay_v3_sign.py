@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Pay v3 request signing throughput: parsing the PEM key on every request, as
+``calculate_signature_rsa(pem, ...)`` does, against the key loaded once by ``WeChatPay``::
+
+    PYTHONPATH=. python benchmarks/bench_pay_v3_sign.py
+"""
+import os
+import timeit
+
+from cryptography.x509 import load_pem_x509_certificate
+
+from wechatpy.pay.utils import calculate_signature_rsa
+from wechatpy.pay.v3 import WeChatPay
+
+CERTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "tests", "certs")
+PATH = "/v3/pay/transactions/jsapi"
+BODY = '{"appid": "wxd678efh567hg6787", "mchid": "1230000109", "amount": {"total": 100}}'
+
+
+def per_second(func, number):
+    return number / timeit.timeit(func, number=number)
+
+
+def main():
+    client = WeChatPay(
+        appid="wxd678efh567hg6787",
+        apiv3_key="test123",
+        mch_id="1230000109",
+        wechat_cert_dir=CERTS_PATH,
+        apiclient_cert_path=os.path.join(CERTS_PATH, "apiclient_cert.pem"),
+        apiclient_key_path=os.path.join(CERTS_PATH, "apiclient_key.pem"),
+    )
+    pem = client.apiclient_key
+    # stands in for a downloaded platform certificate
+    client.wechat_cert_dict["platform"] = load_pem_x509_certificate(client.apiclient_cert)
+
+    print(
+        f"{'calculate_signature_rsa(pem)':>28} {per_second(lambda: calculate_signature_rsa(pem, 'POST', PATH, BODY), 50):>10.0f} signatures/s"
+    )
+    print(
+        f"{'WeChatPay._authorization':>28} {per_second(lambda: client._authorization('POST', PATH, BODY), 2000):>10.0f} signatures/s"
+    )
+    print(f"{'Wechatpay-Serial':>28} {per_second(client._get_wechat_serial_no, 200000):>10.0f} /s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Pay v3 signing throughput of the signer backends, with signatures requested
+from many threads at once as a busy merchant server would::
+
+    PYTHONPATH=. python benchmarks/bench_pay_v3_signer.py [requests] [client threads]
+
+``ProcessPoolSigner`` only scales on a machine with several CPU cores, one
+worker per core is the useful maximum.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from wechatpy.pay.utils import load_private_key, sign_rsa
+from wechatpy.pay.v3.signer import ProcessPoolSigner, ThreadPoolSigner
+
+CERTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "tests", "certs")
+MESSAGE = 'POST\n/v3/pay/transactions/jsapi\n1554208460\n593BEC0C930BF1AFEB40B4A08C8FB242\n{"amount": {"total": 100}}\n'
+
+
+def per_second(sign, requests, threads):
+    with ThreadPoolExecutor(threads) as clients:
+        start = time.perf_counter()
+        for _ in clients.map(sign, [MESSAGE] * requests):
+            pass
+        return requests / (time.perf_counter() - start)
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    with open(os.path.join(CERTS_PATH, "apiclient_key.pem"), "rb") as f:
+        pem = f.read()
+    key = load_private_key(pem)
+    cores = os.cpu_count() or 1
+    print(f"{cores} CPU cores, {threads} client threads")
+
+    print(f"{'in calling thread':>24} {per_second(lambda m: sign_rsa(key, m), requests, threads):>10.0f} signatures/s")
+    signer = ThreadPoolSigner(key)
+    print(f"{'ThreadPoolSigner':>24} {per_second(signer.sign, requests, threads):>10.0f} signatures/s")
+    signer.close()
+    workers = 1
+    while True:
+        signer = ProcessPoolSigner(pem, workers=workers)
+        # start the workers outside of the measurement
+        signer.sign(MESSAGE)
+        name = f"ProcessPoolSigner({workers})"
+        print(f"{name:>24} {per_second(signer.sign, requests, threads):>10.0f} signatures/s")
+        signer.close()
+        if workers >= cores:
+            break
+        workers = min(workers * 2, cores)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Reply render throughput of every reply class, compared with rendering field by
+field through ``to_xml``, and of frozen replies in plain and encrypted mode::
+
+    PYTHONPATH=. python benchmarks/bench_replies.py
+"""
+import timeit
+
+from wechatpy import replies
+from wechatpy.crypto import WeChatCrypto
+from wechatpy.messages import TextMessage
+from wechatpy.work import replies as work_replies
+
+ARTICLE = {
+    "title": "title",
+    "description": "description",
+    "image": "https://example.com/a.png",
+    "url": "https://qq.com",
+}
+VALUES = {
+    "content": "this is a test",
+    "image": "media_id",
+    "voice": "media_id",
+    "video": {"media_id": "media_id", "title": "title", "description": "description"},
+    "music": {"thumb_media_id": "media_id", "title": "title", "music_url": "https://qq.com/a.mp3"},
+    "articles": [ARTICLE] * 8,
+    "device_type": "type",
+    "device_id": "id",
+    "session_id": "session",
+    "event": "bind",
+    "status": 1,
+    "taskcard": "done",
+    "agent": 1,
+}
+
+
+def render_fields(reply):
+    nodes = [f"<MsgType><![CDATA[{reply.type}]]></MsgType>"]
+    for name, field in reply._fields.items():
+        nodes.append(field.to_xml(getattr(reply, name, field.default)))
+    data = "\n".join(nodes)
+    return f"<xml>\n{data}\n</xml>"
+
+
+def run(reply, number=20000):
+    assert render_fields(reply) == reply.render()
+    fields = timeit.timeit(lambda: render_fields(reply), number=number) / number * 1e6
+    compiled = timeit.timeit(reply.render, number=number) / number * 1e6
+    return fields, compiled
+
+
+def run_frozen(reply, number=20000):
+    crypto = WeChatCrypto("token", "kWxPEV2UEDyxWpmPdKC3F4dgPDmOvfKX1HGnEUDS1aR", "wx49f0ab532d5d035a")
+    message = TextMessage({"ToUserName": "gh_123", "FromUserName": "oUser", "MsgType": "text"})
+    frozen = reply.freeze()
+
+    def render():
+        return replies.create_reply(reply, message).render()
+
+    def render_frozen():
+        return replies.create_reply(frozen, message).render()
+
+    def encrypt():
+        return crypto.encrypt_message(replies.create_reply(reply, message), "nonce", "1411525903")
+
+    def encrypt_frozen():
+        return crypto.encrypt_message(replies.create_reply(frozen, message), "nonce", "1411525903")
+
+    return [
+        timeit.timeit(func, number=number) / number * 1e6 for func in (render, render_frozen, encrypt, encrypt_frozen)
+    ]
+
+
+def main():
+    print(f"{'reply':>40} {'to_xml µs':>10} {'render µs':>10}")
+    for module in (replies, work_replies):
+        for cls in module.REPLY_TYPES.values():
+            if cls is replies.EmptyReply:
+                continue
+            kwargs = {name: value for name, value in VALUES.items() if name in cls._fields}
+            reply = cls(source="fromUser", target="toUser", **kwargs)
+            fields, compiled = run(reply)
+            print(f"{module.__name__ + '.' + cls.__name__:>40} {fields:>10.2f} {compiled:>10.2f}")
+
+    print()
+    print(f"{'frozen':>40} {'render µs':>10} {'frozen µs':>10} {'encrypt µs':>10} {'frozen µs':>10}")
+    text = replies.TextReply(content="欢迎关注，回复数字查看菜单：1. 帮助 2. 联系我们 " * 4)
+    news = replies.ArticlesReply(articles=VALUES["articles"])
+    for name, reply in (("TextReply", text), ("ArticlesReply", news)):
+        timings = run_frozen(reply)
+        print(f"{name:>40} " + " ".join(f"{timing:>10.2f}" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+SQLiteStorage token read/write latency, the store shared by worker processes::
+
+    PYTHONPATH=. python benchmarks/bench_sqlitestorage.py
+"""
+import os
+import tempfile
+import time
+import timeit
+
+from wechatpy.client.base import load_token, store_token
+from wechatpy.session.sqlitestorage import SQLiteStorage
+
+
+def main(number=20000):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        session = SQLiteStorage(os.path.join(tmpdir, "session.db"))
+        for i in range(10000):
+            session.set(f"key{i}", {"token": "x" * 128, "expires_at": time.time() + 7200}, 7200)
+        store_token(session, "appid_access_token", "appid_access_token_expires_at", "x" * 128, 7200)
+
+        read = timeit.timeit(
+            lambda: load_token(session, "appid_access_token", "appid_access_token_expires_at"), number=number
+        )
+        write = timeit.timeit(
+            lambda: store_token(session, "appid_access_token", "appid_access_token_expires_at", "x" * 128, 7200),
+            number=number // 10,
+        )
+        print(f"load_token  {read / number * 1e6:8.1f} us/op")
+        print(f"store_token {write / (number // 10) * 1e6:8.1f} us/op")
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
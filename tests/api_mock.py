@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Mocks answering WeChat API requests from the JSON files in tests/fixtures, shared by the test modules"""
+import json
+import os
+
+import httpx
+from httmock import response, urlmatch
+
+FIXTURE_PATH = os.path.join(os.path.abspath(os.path.dirname(__file__)), "fixtures")
+
+
+def load_fixture(path, fixture_path=FIXTURE_PATH):
+    res_file = os.path.join(fixture_path, f"{path}.json")
+    content = {
+        "errcode": 99999,
+        "errmsg": f"can not find fixture {res_file}",
+    }
+    try:
+        with open(res_file, "rb") as f:
+            content = json.loads(f.read().decode("utf-8"))
+    except (IOError, ValueError) as e:
+        content["errmsg"] = f"Loads fixture {res_file} failed, error: {e}"
+    return content
+
+
+def fixture_name(url_path):
+    path = url_path.replace("/cgi-bin/", "").replace("/", "_")
+    if path.startswith("_"):
+        path = path[1:]
+    return path
+
+
+@urlmatch(netloc=r"(.*\.)?api\.weixin\.qq\.com$")
+def wechat_api_mock(url, request):
+    content = load_fixture(fixture_name(url.path))
+    return response(200, content, {"Content-Type": "application/json"}, request=request)
+
+
+def async_wechat_api_mock(request):
+    path = fixture_name(request.url.path)
+    if request.url.host == "qyapi.weixin.qq.com":
+        return httpx.Response(200, json=load_fixture(path, os.path.join(FIXTURE_PATH, "work")))
+    if path.startswith("component_"):
+        path = path[len("component_") :]
+        return httpx.Response(200, json=load_fixture(path, os.path.join(FIXTURE_PATH, "component")))
+    return httpx.Response(200, json=load_fixture(path))
+
+
+def mock_http_client(handler=async_wechat_api_mock):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
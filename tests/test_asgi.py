@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+import unittest
+from unittest import mock
+from urllib.parse import urlencode
+
+from wechatpy import parse_message
+from wechatpy.asgi import create_app
+from wechatpy.crypto import WeChatCrypto
+from wechatpy.dedup import MessageDeduplicator
+from wechatpy.utils import WeChatSigner, parse_xml
+
+TOKEN = "123456"
+ENCODING_AES_KEY = "kWxPEV2UEDyxWpmPdKC3F4dgPDmOvfKX1HGnEUDS1aR"
+APP_ID = "wx49f0ab532d5d035a"
+TIMESTAMP = "1411443780"
+NONCE = "437374425"
+
+TEXT_XML = """<xml>
+<ToUserName><![CDATA[toUser]]></ToUserName>
+<FromUserName><![CDATA[fromUser]]></FromUserName>
+<CreateTime>1348831860</CreateTime>
+<MsgType><![CDATA[text]]></MsgType>
+<Content><![CDATA[this is a test]]></Content>
+<MsgId>1234567890123456</MsgId>
+<AgentID>1</AgentID>
+</xml>"""
+
+
+def signature(token=TOKEN):
+    signer = WeChatSigner()
+    signer.add_data(token, TIMESTAMP, NONCE)
+    return signer.signature
+
+
+async def request(app, method, query, body=b""):
+    scope = {"type": "http", "method": method, "query_string": urlencode(query).encode()}
+    events = [
+        {"type": "http.request", "body": body[:10], "more_body": True},
+        {"type": "http.request", "body": body[10:]},
+    ]
+    sent = []
+
+    async def receive():
+        return events.pop(0)
+
+    async def send(event):
+        sent.append(event)
+
+    await app(scope, receive, send)
+    return sent[0]["status"], sent[1]["body"].decode("utf-8")
+
+
+async def shutdown(app):
+    events = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return events.pop(0)
+
+    async def send(event):
+        sent.append(event["type"])
+
+    await app({"type": "lifespan"}, receive, send)
+    return sent
+
+
+async def echo(message):
+    return message.content
+
+
+class CallbackAppTestCase(unittest.TestCase):
+    def query(self, **kwargs):
+        return dict(signature=signature(), timestamp=TIMESTAMP, nonce=NONCE, **kwargs)
+
+    def test_verify(self):
+        app = create_app(TOKEN, echo)
+        self.assertEqual((200, "echo"), asyncio.run(request(app, "GET", self.query(echostr="echo"))))
+        query = dict(self.query(echostr="echo"), signature=signature("other"))
+        self.assertEqual(403, asyncio.run(request(app, "GET", query))[0])
+        self.assertEqual(405, asyncio.run(request(app, "PUT", self.query()))[0])
+
+    def test_reply(self):
+        app = create_app(TOKEN, echo)
+        status, body = asyncio.run(request(app, "POST", self.query(), TEXT_XML.encode()))
+        self.assertEqual(200, status)
+        reply = parse_xml(body)["xml"]
+        self.assertEqual("this is a test", reply["Content"])
+        self.assertEqual("fromUser", reply["ToUserName"])
+
+        query = dict(self.query(), signature=signature("other"))
+        self.assertEqual(403, asyncio.run(request(app, "POST", query, TEXT_XML.encode()))[0])
+
+    def test_encrypted_reply(self):
+        crypto = WeChatCrypto(TOKEN, ENCODING_AES_KEY, APP_ID)
+        encrypted = crypto.encrypt_message(TEXT_XML, NONCE, TIMESTAMP)
+        msg_signature = parse_xml(encrypted)["xml"]["MsgSignature"]
+        app = create_app(TOKEN, echo, crypto=crypto)
+
+        status, body = asyncio.run(request(app, "POST", self.query(msg_signature=msg_signature), encrypted.encode()))
+        self.assertEqual(200, status)
+        response = parse_xml(body)["xml"]
+        reply = crypto.decrypt_message(body, response["MsgSignature"], response["TimeStamp"], response["Nonce"])
+        self.assertEqual("this is a test", parse_message(reply).content)
+
+        query = self.query(msg_signature="invalid")
+        self.assertEqual(403, asyncio.run(request(app, "POST", query, encrypted.encode()))[0])
+
+    def test_late_reply(self):
+        async def slow(message):
+            await asyncio.sleep(0.1)
+            return message.content
+
+        async def run(app):
+            response = await request(app, "POST", self.query(), TEXT_XML.encode())
+            client.message.send_text.assert_not_called()
+            return response, await shutdown(app)
+
+        client = mock.MagicMock()
+        app = create_app(TOKEN, slow, client=client, timeout=0.01)
+        response, lifespan = asyncio.run(run(app))
+        self.assertEqual((200, "success"), response)
+        self.assertEqual(["lifespan.startup.complete", "lifespan.shutdown.complete"], lifespan)
+        client.message.send_text.assert_called_once_with("fromUser", "this is a test")
+
+        client = mock.MagicMock()
+        app = create_app(TOKEN, slow, client=client, timeout=0.01, work=True)
+        asyncio.run(run(app))
+        client.message.send_text.assert_called_once_with(1, "fromUser", "this is a test")
+
+    def test_late_reply_with_async_client(self):
+        async def slow(message):
+            await asyncio.sleep(0.05)
+            return [{"title": "title", "description": "description", "url": "url", "image": "image"}]
+
+        client = mock.MagicMock()
+        client.message.send_articles = mock.AsyncMock()
+        app = create_app(TOKEN, slow, client=client, timeout=0.01)
+
+        async def run():
+            await request(app, "POST", self.query(), TEXT_XML.encode())
+            await shutdown(app)
+
+        asyncio.run(run())
+        client.message.send_articles.assert_awaited_once()
+        self.assertEqual("fromUser", client.message.send_articles.call_args[0][0])
+
+    def test_bad_requests(self):
+        async def fail(message):
+            raise ValueError("handler failed")
+
+        app = create_app(TOKEN, fail)
+        with self.assertLogs("wechatpy.asgi", "ERROR"):
+            self.assertEqual((200, "success"), asyncio.run(request(app, "POST", self.query(), TEXT_XML.encode())))
+        with self.assertLogs("wechatpy.asgi", "ERROR"):
+            self.assertEqual(400, asyncio.run(request(app, "POST", self.query(), b"<xml><ToUserName>"))[0])
+
+        crypto = WeChatCrypto(TOKEN, ENCODING_AES_KEY, APP_ID)
+        app = create_app(TOKEN, echo, crypto=crypto)
+        encrypted = crypto.encrypt_message(TEXT_XML, NONCE, TIMESTAMP)
+        self.assertEqual(400, asyncio.run(request(app, "POST", self.query(), encrypted.encode()))[0])
+
+    def test_late_reply_with_asyncio_client(self):
+        threads = []
+
+        async def slow(message):
+            await asyncio.sleep(0.05)
+            return message.content
+
+        async def sent():
+            pass
+
+        def send_text(user_id, content):
+            threads.append(threading.current_thread())
+            return sent()
+
+        class Client:
+            async def _request(self, method, url_or_endpoint, **kwargs):
+                pass
+
+        client = Client()
+        client.message = mock.Mock()
+        # API methods of asyncio clients are plain functions returning a coroutine
+        client.message.send_text = mock.Mock(side_effect=send_text)
+        app = create_app(TOKEN, slow, client=client, timeout=0.01)
+
+        async def run():
+            await request(app, "POST", self.query(), TEXT_XML.encode())
+            await shutdown(app)
+
+        asyncio.run(run())
+        client.message.send_text.assert_called_once_with("fromUser", "this is a test")
+        self.assertEqual([threading.main_thread()], threads)
+
+    def test_dedup(self):
+        handler = mock.AsyncMock(return_value=None)
+        app = create_app(TOKEN, handler, dedup=MessageDeduplicator())
+        for _ in range(3):
+            self.assertEqual((200, "success"), asyncio.run(request(app, "POST", self.query(), TEXT_XML.encode())))
+        handler.assert_awaited_once()
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import unittest
+
+import httpx
+
+from wechatpy.client.aio import AsyncWeChatClient, AsyncWeChatComponent
+from wechatpy.exceptions import WeChatClientException
+from wechatpy.session import AsyncSessionStorage
+from wechatpy.work.client.aio import AsyncWeChatClient as AsyncWorkWeChatClient
+
+from api_mock import async_wechat_api_mock, mock_http_client
+
+
+class DictAsyncStorage(AsyncSessionStorage):
+    def __init__(self):
+        self._data = {}
+
+    async def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    async def set(self, key, value, ttl=None):
+        if value is None:
+            return
+        self._data[key] = value
+
+    async def delete(self, key):
+        self._data.pop(key, None)
+
+
+class AsyncWeChatClientTestCase(unittest.IsolatedAsyncioTestCase):
+    app_id = "123456"
+    secret = "123456"
+
+    def setUp(self):
+        self.client = AsyncWeChatClient(self.app_id, self.secret, http_client=mock_http_client())
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def test_fetch_access_token(self):
+        token = await self.client.fetch_access_token()
+        self.assertEqual("1234567890", token["access_token"])
+        self.assertEqual(7200, token["expires_in"])
+        self.assertEqual("1234567890", await self.client.get_access_token())
+        self.assertEqual("1234567890", self.client.access_token)
+
+    async def test_api_endpoints_are_awaitable(self):
+        self.assertIs(self.client, self.client.user._client)
+        res = await self.client.user.get("123456")
+        self.assertEqual("o6_bmjrPTlm6_2sgVt7hMZOPfL2M", res["openid"])
+        ips = await self.client.misc.get_wechat_ips()
+        self.assertEqual(["127.0.0.1"], ips)
+
+    async def test_result_processor(self):
+        summary = await self.client.datacube.get_user_summary("2014-12-06", "2014-12-07")
+        self.assertEqual(1, len(summary))
+
+        def decrypt_code(request):
+            return httpx.Response(200, json={"errcode": 0, "errmsg": "ok", "code": "018255396048"})
+
+        client = AsyncWeChatClient(
+            self.app_id, self.secret, access_token="1234567890", http_client=mock_http_client(decrypt_code)
+        )
+        async with client:
+            url = await client.card.get_redirect_url("https://example.com/card", "ENCRYPT", "CARD_ID")
+        self.assertTrue(url.startswith("https://example.com/card?encrypt_code=ENCRYPT&card_id=CARD_ID&signature="))
+
+    async def test_post_json_body(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return async_wechat_api_mock(request)
+
+        async with AsyncWeChatClient(self.app_id, self.secret, http_client=mock_http_client(handler)) as client:
+            await client.message.send_text(1, "test")
+        self.assertEqual(
+            {"touser": 1, "msgtype": "text", "text": {"content": "test"}}, json.loads(requests[-1].content)
+        )
+        self.assertEqual("1234567890", requests[-1].url.params["access_token"])
+
+    async def test_auto_retry_on_invalid_token(self):
+        calls = []
+
+        def handler(request):
+            if request.url.path == "/cgi-bin/getcallbackip":
+                calls.append(request.url.params["access_token"])
+                if len(calls) == 1:
+                    return httpx.Response(200, json={"errcode": 40001, "errmsg": "invalid credential"})
+            return async_wechat_api_mock(request)
+
+        client = AsyncWeChatClient(
+            self.app_id, self.secret, access_token="expired", http_client=mock_http_client(handler)
+        )
+        ips = await client.misc.get_wechat_ips()
+        self.assertEqual(["127.0.0.1"], ips)
+        self.assertEqual(["expired", "1234567890"], calls)
+
+    async def test_api_error(self):
+        def handler(request):
+            return httpx.Response(200, json={"errcode": 40013, "errmsg": "invalid appid"})
+
+        client = AsyncWeChatClient(self.app_id, self.secret, access_token="abc", http_client=mock_http_client(handler))
+        with self.assertRaises(WeChatClientException) as ctx:
+            await client.user.get("123456")
+        self.assertEqual(40013, ctx.exception.errcode)
+
+    async def test_jsapi_get_jsapi_ticket(self):
+        ticket = await self.client.jsapi.get_jsapi_ticket()
+        self.assertEqual(
+            "bxLdikRXVbTPdHSM05e5u5sUoXNKd8-41ZO3MhKoyN5OfkWITDGgnr2fwJ0m9E8NYzWKVZvdVtaUgWvsdshFKA",  # NOQA
+            ticket,
+        )
+        self.assertEqual(ticket, self.client.session.get(f"{self.app_id}_jsapi_ticket"))
+
+    async def test_concurrent_refresh_fetches_once(self):
+        calls = []
+
+        def handler(request):
+            if request.url.path == "/cgi-bin/token":
+                calls.append(request)
+            return async_wechat_api_mock(request)
+
+        client = AsyncWeChatClient(self.app_id, self.secret, http_client=mock_http_client(handler))
+        tokens = await asyncio.gather(*[client.get_access_token() for _ in range(10)])
+        self.assertEqual(["1234567890"] * 10, tokens)
+        self.assertEqual(1, len(calls))
+
+    async def test_async_session_storage(self):
+        session = DictAsyncStorage()
+        client = AsyncWeChatClient(
+            self.app_id,
+            self.secret,
+            access_token="abcdef",
+            session=session,
+            http_client=mock_http_client(),
+        )
+        self.assertEqual({}, session._data)
+        self.assertEqual("abcdef", await client.get_access_token())
+        await client.fetch_access_token()
+        self.assertEqual("1234567890", session._data[client.access_token_key])
+        self.assertIn(client.access_token_expires_at_key, session._data)
+        with self.assertRaises(TypeError):
+            client.access_token
+
+
+class AsyncWorkWeChatClientTestCase(unittest.IsolatedAsyncioTestCase):
+    corp_id = "123456"
+    secret = "123456"
+
+    def setUp(self):
+        self.client = AsyncWorkWeChatClient(self.corp_id, self.secret, http_client=mock_http_client())
+
+    async def test_fetch_access_token(self):
+        token = await self.client.fetch_access_token()
+        self.assertEqual("1234567890", token["access_token"])
+        self.assertEqual("1234567890", await self.client.get_access_token())
+
+    async def test_result_processor(self):
+        self.assertEqual(["127.0.0.1"], await self.client.misc.get_wechat_ips())
+        self.assertEqual(2, (await self.client.department.list())[0]["id"])
+        self.assertEqual("apitest3@gzdev.com", (await self.client.email.get_public_email("1@1"))["email"])
+
+
+class AsyncWeChatComponentTestCase(unittest.IsolatedAsyncioTestCase):
+    app_id = "123456"
+    app_secret = "123456"
+    token = "sdfusfsssdc"
+    encoding_aes_key = "yguy3495y79o34vod7843933902h9gb2834hgpB90rg"
+
+    def setUp(self):
+        self.component = AsyncWeChatComponent(
+            self.app_id,
+            self.app_secret,
+            self.token,
+            self.encoding_aes_key,
+            http_client=mock_http_client(),
+        )
+
+    async def test_fetch_access_token(self):
+        token = await self.component.fetch_access_token()
+        self.assertEqual("1234567890", token["component_access_token"])
+        self.assertEqual("1234567890", await self.component.get_access_token())
+
+    async def test_get_client_by_appid(self):
+        self.component.session.set("654321_refresh_token", "123456789")
+        client = await self.component.get_client_by_appid("654321")
+        self.assertEqual("1234567890", await client.get_access_token())
+        self.assertEqual(["127.0.0.1"], await client.misc.get_wechat_ips())
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 import io
 import json
-import os
 import inspect
 import time
 import unittest
@@ -13,27 +12,7 @@ from wechatpy import WeChatClient
 from wechatpy.exceptions import WeChatClientException
 from wechatpy.schemes import JsApiCardExt
 
-_TESTS_PATH = os.path.abspath(os.path.dirname(__file__))
-_FIXTURE_PATH = os.path.join(_TESTS_PATH, "fixtures")
-
-
-@urlmatch(netloc=r"(.*\.)?api\.weixin\.qq\.com$")
-def wechat_api_mock(url, request):
-    path = url.path.replace("/cgi-bin/", "").replace("/", "_")
-    if path.startswith("_"):
-        path = path[1:]
-    res_file = os.path.join(_FIXTURE_PATH, f"{path}.json")
-    content = {
-        "errcode": 99999,
-        "errmsg": f"can not find fixture {res_file}",
-    }
-    headers = {"Content-Type": "application/json"}
-    try:
-        with open(res_file, "rb") as f:
-            content = json.loads(f.read().decode("utf-8"))
-    except (IOError, ValueError) as e:
-        content["errmsg"] = f"Loads fixture {res_file} failed, error: {e}"
-    return response(200, content, headers, request=request)
+from api_mock import wechat_api_mock
 
 
 class WeChatClientTestCase(unittest.TestCase):
@@ -52,6 +31,14 @@ class WeChatClientTestCase(unittest.TestCase):
             self.client.fetch_access_token()
             self.assertNotEqual(self.client.access_token, client2.access_token)
 
+    def test_api_endpoints_are_lazy(self):
+        client = WeChatClient("654321", "654321", "987654321")
+        self.assertNotIn("user", vars(client))
+        user = client.user
+        self.assertIs(user, client.user)
+        self.assertIs(client, user._client)
+        self.assertIsNone(WeChatClient.user._client)
+
     def test_subclass_client_ok(self):
         class TestClient(WeChatClient):
             pass
@@ -40,6 +40,21 @@ class WeChatComponentTestCase(unittest.TestCase):
     def setUp(self):
         self.client = WeChatComponent(self.app_id, self.app_secret, self.token, self.encoding_aes_key)
 
+    def test_parse_component_verify_ticket(self):
+        import re
+
+        xml = """<xml>
+<AppId>123456</AppId>
+<CreateTime>1413192605</CreateTime>
+<InfoType>component_verify_ticket</InfoType>
+<ComponentVerifyTicket>ticket@@@123</ComponentVerifyTicket>
+</xml>"""
+        encrypted = self.client.crypto.encrypt_message(xml, "nonce", "1413192605")
+        signature = re.search(r"<MsgSignature><!\[CDATA\[(\w+)\]\]>", encrypted).group(1)
+        message = self.client.parse_message(encrypted, signature, "1413192605", "nonce")
+        self.assertEqual("component_verify_ticket", message.type)
+        self.assertEqual("ticket@@@123", self.client.session.get("123456_component_verify_ticket"))
+
     def test_fetch_access_token_is_method(self):
         self.assertTrue(inspect.ismethod(self.client.fetch_access_token))
 
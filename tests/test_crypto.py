@@ -3,6 +3,7 @@ import unittest
 
 import xmltodict
 
+from wechatpy.exceptions import InvalidSignatureException
 from wechatpy.work import crypto as _crypto
 from wechatpy.work.crypto import WeChatCrypto
 
@@ -74,6 +75,24 @@ class CryptoTestCase(unittest.TestCase):
 
         self.assertEqual(expected, encrypted)
 
+    def test_encrypt_frozen_reply(self):
+        from wechatpy.work.replies import TextReply
+
+        origin_crypto = _crypto.PrpCrypto
+        _crypto.PrpCrypto = PrpCryptoMock
+        try:
+            reply = TextReply(content="测试", agent=1).freeze()
+            reply.source = "wx49f0ab532d5d035a"
+            reply.target = "messense"
+            reply.time = 1411525903
+            crypto = WeChatCrypto(self.token, self.encoding_aes_key, self.corp_id)
+            expected = crypto.encrypt_message(reply.render(), "461056294", "1411525903")
+            encrypted = crypto.encrypt_message(reply, "461056294", "1411525903")
+        finally:
+            _crypto.PrpCrypto = origin_crypto
+
+        self.assertEqual(expected, encrypted)
+
     def test_decrypt_message(self):
         xml = """<xml><ToUserName><![CDATA[wx49f0ab532d5d035a]]></ToUserName>
 <Encrypt><![CDATA[RgqEoJj5A4EMYlLvWO1F86ioRjZfaex/gePD0gOXTxpsq5Yj4GNglrBb8I2BAJVODGajiFnXBu7mCPatfjsu6IHCrsTyeDXzF6Bv283dGymzxh6ydJRvZsryDyZbLTE7rhnus50qGPMfp2wASFlzEgMW9z1ef/RD8XzaFYgm7iTdaXpXaG4+BiYyolBug/gYNx410cvkKR2/nPwBiT+P4hIiOAQqGp/TywZBtDh1yCF2KOd0gpiMZ5jSw3e29mTvmUHzkVQiMS6td7vXUaWOMZnYZlF3So2SjHnwh4jYFxdgpkHHqIrH/54SNdshoQgWYEvccTKe7FS709/5t6NMxuGhcUGAPOQipvWTT4dShyqio7mlsl5noTrb++x6En749zCpQVhDpbV6GDnTbcX2e8K9QaNWHp91eBdCRxthuL0=]]></Encrypt>
@@ -90,6 +109,124 @@ class CryptoTestCase(unittest.TestCase):
         self.assertEqual("test", msg_dict["Content"])
         self.assertEqual("messense", msg_dict["FromUserName"])
 
+    def test_cipher_reused_across_messages(self):
+        import re
+
+        crypto = WeChatCrypto(self.token, self.encoding_aes_key, self.corp_id)
+        for content in ("test", "测试" * 100):
+            xml = f"<xml><Content><![CDATA[{content}]]></Content></xml>"
+            encrypted = crypto.encrypt_message(xml, "461056294", "1411525903")
+            signature = re.search(r"<MsgSignature><!\[CDATA\[(\w+)\]\]>", encrypted).group(1)
+            self.assertEqual(xml, crypto.decrypt_message(encrypted, signature, "1411525903", "461056294"))
+        self.assertEqual([_crypto.PrpCrypto], list(crypto._cryptos))
+
+    def test_decrypt_and_parse(self):
+        xml = """<xml><ToUserName><![CDATA[wx49f0ab532d5d035a]]></ToUserName>
+<Encrypt><![CDATA[RgqEoJj5A4EMYlLvWO1F86ioRjZfaex/gePD0gOXTxpsq5Yj4GNglrBb8I2BAJVODGajiFnXBu7mCPatfjsu6IHCrsTyeDXzF6Bv283dGymzxh6ydJRvZsryDyZbLTE7rhnus50qGPMfp2wASFlzEgMW9z1ef/RD8XzaFYgm7iTdaXpXaG4+BiYyolBug/gYNx410cvkKR2/nPwBiT+P4hIiOAQqGp/TywZBtDh1yCF2KOd0gpiMZ5jSw3e29mTvmUHzkVQiMS6td7vXUaWOMZnYZlF3So2SjHnwh4jYFxdgpkHHqIrH/54SNdshoQgWYEvccTKe7FS709/5t6NMxuGhcUGAPOQipvWTT4dShyqio7mlsl5noTrb++x6En749zCpQVhDpbV6GDnTbcX2e8K9QaNWHp91eBdCRxthuL0=]]></Encrypt>
+<AgentID><![CDATA[1]]></AgentID>
+</xml>"""
+        signature = "74d92dfeb87ba7c714f89d98870ae5eb62dff26d"
+
+        crypto = WeChatCrypto(self.token, self.encoding_aes_key, self.corp_id)
+        for lazy in (False, True):
+            msg = crypto.decrypt_and_parse(xml, signature, "1411525903", "461056294", lazy=lazy)
+            self.assertEqual("text", msg.type)
+            self.assertEqual("test", msg.content)
+            self.assertEqual("messense", msg.source)
+        self.assertRaises(InvalidSignatureException, crypto.decrypt_and_parse, xml, "0" * 40, "1411525903", "461056294")
+
+    def test_crypto_registry(self):
+        import re
+
+        from wechatpy.crypto import CryptoRegistry
+        from wechatpy.exceptions import InvalidAppIdException
+
+        loaded = []
+
+        def loader(key):
+            loaded.append(key)
+            if key.startswith("wx_loaded"):
+                return self.token, self.encoding_aes_key, key
+
+        registry = CryptoRegistry(loader=loader, maxsize=2, crypto_class=WeChatCrypto)
+        crypto = registry.register(self.corp_id, self.token, self.encoding_aes_key, aliases=["gh_123"])
+        self.assertIs(crypto, registry["gh_123"])
+
+        xml = "<xml><MsgType><![CDATA[text]]></MsgType><Content><![CDATA[test]]></Content></xml>"
+        encrypted = crypto.encrypt_message(xml, "461056294", "1411525903")
+        signature = re.search(r"<MsgSignature><!\[CDATA\[(\w+)\]\]>", encrypted).group(1)
+        encrypted = encrypted.replace("<xml>", "<xml><ToUserName><![CDATA[gh_123]]></ToUserName>")
+        msg = registry.decrypt_and_parse(encrypted, signature, "1411525903", "461056294")
+        self.assertEqual("test", msg.content)
+        self.assertEqual(xml, registry.decrypt_message(encrypted, signature, "1411525903", "461056294", self.corp_id))
+
+        first = registry["wx_loaded1"]
+        self.assertIs(first, registry["wx_loaded1"])
+        registry["wx_loaded2"]
+        registry["wx_loaded3"]
+        self.assertIsNot(first, registry["wx_loaded1"])
+        self.assertEqual(["wx_loaded1", "wx_loaded2", "wx_loaded3", "wx_loaded1"], loaded)
+
+        self.assertIsNone(registry.get("wx_unknown"))
+        self.assertRaises(KeyError, registry.__getitem__, "wx_unknown")
+        self.assertRaises(
+            InvalidAppIdException,
+            registry.decrypt_message,
+            encrypted.replace("gh_123", "gh_456"),
+            signature,
+            "1411525903",
+            "461056294",
+        )
+
+    def test_crypto_registry_misses(self):
+        from unittest import mock
+
+        from wechatpy.crypto import CryptoRegistry
+
+        loaded = []
+
+        def loader(key):
+            loaded.append(key)
+
+        registry = CryptoRegistry(loader=loader, maxsize=2, crypto_class=WeChatCrypto, miss_ttl=60)
+        with mock.patch("wechatpy.crypto.time.monotonic", return_value=1000):
+            self.assertIsNone(registry.get("gh_unknown"))
+            self.assertIsNone(registry.get("gh_unknown"))
+        self.assertEqual(["gh_unknown"], loaded)
+        with mock.patch("wechatpy.crypto.time.monotonic", return_value=1061):
+            self.assertIsNone(registry.get("gh_unknown"))
+        self.assertEqual(["gh_unknown", "gh_unknown"], loaded)
+
+        crypto = registry.register(self.corp_id, self.token, self.encoding_aes_key, aliases=["gh_unknown"])
+        self.assertIs(crypto, registry.get("gh_unknown"))
+        self.assertEqual({}, dict(registry._missing))
+        for i in range(10):
+            registry.get(f"gh_{i}")
+        self.assertEqual(["gh_8", "gh_9"], list(registry._missing))
+
+    def test_decrypt_and_parse_many(self):
+        import re
+
+        crypto = WeChatCrypto(self.token, self.encoding_aes_key, self.corp_id)
+        callbacks = []
+        for i in range(40):
+            xml = f"<xml><MsgType><![CDATA[text]]></MsgType><Content><![CDATA[{i}]]></Content></xml>"
+            encrypted = crypto.encrypt_message(xml, "461056294", "1411525903")
+            signature = re.search(r"<MsgSignature><!\[CDATA\[(\w+)\]\]>", encrypted).group(1)
+            callbacks.append((encrypted, signature, "1411525903", "461056294"))
+        expected = [str(i) for i in range(40)]
+
+        messages = crypto.decrypt_and_parse_many(iter(callbacks), workers=2, chunksize=3)
+        self.assertEqual(expected, [msg.content for msg in messages])
+        messages = crypto.decrypt_and_parse_many(callbacks, workers=2, chunksize=3, ordered=False, lazy=True)
+        self.assertEqual(sorted(expected), sorted(msg.content for msg in messages))
+
+        callbacks[5] = (callbacks[5][0], "0" * 40, "1411525903", "461056294")
+        results = list(crypto.decrypt_and_parse_many(callbacks, workers=2, chunksize=3, return_exceptions=True))
+        self.assertIsInstance(results[5], InvalidSignatureException)
+        with self.assertRaises(InvalidSignatureException):
+            list(crypto.decrypt_and_parse_many(callbacks, workers=2, chunksize=3))
+
     def test_decrypt_binary_message(self):
         xml = b"""<xml><ToUserName><![CDATA[wx49f0ab532d5d035a]]></ToUserName>
 <Encrypt><![CDATA[RgqEoJj5A4EMYlLvWO1F86ioRjZfaex/gePD0gOXTxpsq5Yj4GNglrBb8I2BAJVODGajiFnXBu7mCPatfjsu6IHCrsTyeDXzF6Bv283dGymzxh6ydJRvZsryDyZbLTE7rhnus50qGPMfp2wASFlzEgMW9z1ef/RD8XzaFYgm7iTdaXpXaG4+BiYyolBug/gYNx410cvkKR2/nPwBiT+P4hIiOAQqGp/TywZBtDh1yCF2KOd0gpiMZ5jSw3e29mTvmUHzkVQiMS6td7vXUaWOMZnYZlF3So2SjHnwh4jYFxdgpkHHqIrH/54SNdshoQgWYEvccTKe7FS709/5t6NMxuGhcUGAPOQipvWTT4dShyqio7mlsl5noTrb++x6En749zCpQVhDpbV6GDnTbcX2e8K9QaNWHp91eBdCRxthuL0=]]></Encrypt>
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest import mock
+
+from wechatpy import parse_message
+from wechatpy.dedup import MessageDeduplicator, message_key
+from wechatpy.session.memorystorage import MemoryStorage
+from wechatpy.work import parse_message as parse_work_message
+
+TEXT_XML = """<xml>
+<ToUserName><![CDATA[toUser]]></ToUserName>
+<FromUserName><![CDATA[fromUser]]></FromUserName>
+<CreateTime>1348831860</CreateTime>
+<MsgType><![CDATA[text]]></MsgType>
+<Content><![CDATA[this is a test]]></Content>
+<MsgId>{msg_id}</MsgId>
+</xml>"""
+
+EVENT_XML = """<xml>
+<ToUserName><![CDATA[toUser]]></ToUserName>
+<FromUserName><![CDATA[{user}]]></FromUserName>
+<CreateTime>123456789</CreateTime>
+<MsgType><![CDATA[event]]></MsgType>
+<Event><![CDATA[CLICK]]></Event>
+<EventKey><![CDATA[KEY]]></EventKey>
+</xml>"""
+
+WORK_EVENT_XML = """<xml>
+<ToUserName><![CDATA[toUser]]></ToUserName>
+<FromUserName><![CDATA[fromUser]]></FromUserName>
+<CreateTime>123456789</CreateTime>
+<MsgType><![CDATA[event]]></MsgType>
+<Event><![CDATA[LOCATION]]></Event>
+<Latitude>23.104</Latitude>
+<Longitude>113.320</Longitude>
+<Precision>65.000</Precision>
+<AgentID>{agent_id}</AgentID>
+<AppType><![CDATA[wxwork]]></AppType>
+</xml>"""
+
+
+class MessageDeduplicatorTestCase(unittest.TestCase):
+    def test_message_key(self):
+        self.assertEqual("toUser:1", message_key(parse_message(TEXT_XML.format(msg_id=1))))
+        self.assertEqual(
+            "toUser:fromUser:123456789:CLICK",
+            message_key(parse_message(EVENT_XML.format(user="fromUser"), lazy=True)),
+        )
+        self.assertIsNone(message_key({"MsgType": "event"}))
+
+    def test_is_duplicate(self):
+        dedup = MessageDeduplicator()
+        for xml in (TEXT_XML.format(msg_id=1), EVENT_XML.format(user="fromUser")):
+            self.assertFalse(dedup.is_duplicate(parse_message(xml)))
+            self.assertTrue(dedup.is_duplicate(parse_message(xml)))
+        self.assertFalse(dedup.is_duplicate(parse_message(TEXT_XML.format(msg_id=2))))
+        self.assertFalse(dedup.is_duplicate(parse_message(EVENT_XML.format(user="otherUser"))))
+        self.assertFalse(dedup.is_duplicate({"MsgType": "event"}))
+        self.assertFalse(dedup.is_duplicate({"MsgType": "event"}))
+
+    def test_window(self):
+        dedup = MessageDeduplicator(window=15, buckets=4)
+        message = parse_message(TEXT_XML.format(msg_id=1))
+        with mock.patch("wechatpy.dedup.time.monotonic", return_value=1000):
+            self.assertFalse(dedup.is_duplicate(message))
+        with mock.patch("wechatpy.dedup.time.monotonic", return_value=1014):
+            self.assertTrue(dedup.is_duplicate(message))
+        # seen again at 1014, forgotten at least 15 seconds after that
+        with mock.patch("wechatpy.dedup.time.monotonic", return_value=1035):
+            self.assertFalse(dedup.is_duplicate(message))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            MessageDeduplicator(buckets=1)
+        with self.assertRaises(ValueError):
+            MessageDeduplicator(window=0)
+
+    def test_memory_is_bounded(self):
+        dedup = MessageDeduplicator(capacity=1000)
+        size = sum(len(bits) for bits in dedup._filters)
+        for i in range(1000):
+            self.assertFalse(dedup.is_duplicate({"MsgType": "text", "MsgId": str(i)}))
+        self.assertEqual(size, sum(len(bits) for bits in dedup._filters))
+
+    def test_session(self):
+        session = MemoryStorage()
+        dedups = [MessageDeduplicator(session=session), MessageDeduplicator(session=session)]
+        xml = TEXT_XML.format(msg_id=1)
+        self.assertFalse(dedups[0].is_duplicate(parse_message(xml)))
+        self.assertTrue(dedups[1].is_duplicate(parse_message(xml)))
+        self.assertEqual(1, session.get("wechatpy:dedup:toUser:1"))
+
+    def test_agents(self):
+        dedup = MessageDeduplicator()
+        for lazy in (True, False):
+            message = parse_work_message(WORK_EVENT_XML.format(agent_id=1), lazy=lazy)
+            self.assertEqual("toUser:fromUser:123456789:LOCATION:1", message_key(message))
+        self.assertIsNotNone(parse_work_message(WORK_EVENT_XML.format(agent_id=1), dedup=dedup))
+        self.assertIsNotNone(parse_work_message(WORK_EVENT_XML.format(agent_id=2), lazy=True, dedup=dedup))
+        self.assertIsNone(parse_work_message(WORK_EVENT_XML.format(agent_id=2), dedup=dedup))
+
+    def test_duplicate_is_not_parsed(self):
+        dedup = MessageDeduplicator()
+        xml = TEXT_XML.format(msg_id=1)
+        self.assertEqual("this is a test", parse_message(xml, dedup=dedup).content)
+        with mock.patch("wechatpy.parser.parse_xml") as parse, mock.patch("wechatpy.utils.parse_xml") as lazy_parse:
+            self.assertIsNone(parse_message(xml, dedup=dedup))
+            self.assertIsNone(parse_message(xml, lazy=True, dedup=dedup))
+        parse.assert_not_called()
+        lazy_parse.assert_not_called()
+
+    def test_parse_message(self):
+        dedup = MessageDeduplicator()
+        xml = EVENT_XML.format(user="fromUser")
+        self.assertIsNotNone(parse_message(xml, lazy=True, dedup=dedup))
+        self.assertIsNone(parse_message(xml, lazy=True, dedup=dedup))
+        self.assertIsNone(parse_message(xml, dedup=dedup))
+        xml = TEXT_XML.format(msg_id=1)
+        self.assertIsNotNone(parse_work_message(xml, dedup=dedup))
+        self.assertIsNone(parse_work_message(xml, lazy=True, dedup=dedup))
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from wechatpy import MessageDispatcher, parse_message
+from wechatpy.events import ClickEvent, SubscribeScanEvent
+from wechatpy.work import parse_message as parse_work_message
+
+EVENT_XML = """<xml>
+<ToUserName><![CDATA[toUser]]></ToUserName>
+<FromUserName><![CDATA[fromUser]]></FromUserName>
+<CreateTime>123456789</CreateTime>
+<MsgType><![CDATA[event]]></MsgType>
+<Event><![CDATA[{event}]]></Event>
+<EventKey><![CDATA[{key}]]></EventKey>
+<AgentID>1</AgentID>
+</xml>"""
+
+TEXT_XML = """<xml>
+<ToUserName><![CDATA[toUser]]></ToUserName>
+<FromUserName><![CDATA[fromUser]]></FromUserName>
+<CreateTime>1348831860</CreateTime>
+<MsgType><![CDATA[text]]></MsgType>
+<Content><![CDATA[this is a test]]></Content>
+<MsgId>1234567890123456</MsgId>
+</xml>"""
+
+
+def click(key):
+    return parse_message(EVENT_XML.format(event="CLICK", key=key))
+
+
+class MessageDispatcherTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dispatcher = MessageDispatcher(default=lambda message: "default")
+
+    def register(self, *args, **kwargs):
+        def handler(message, *args):
+            return (result, *args)
+
+        result = kwargs.pop("result")
+        return self.dispatcher.register(*args, **kwargs)(handler)
+
+    def test_dispatch_by_type(self):
+        self.register("text", result="text")
+        self.register("event", result="event")
+        self.register(ClickEvent, result="click")
+
+        self.assertEqual(("text", 1), self.dispatcher.dispatch(parse_message(TEXT_XML), 1))
+        self.assertEqual(("click",), self.dispatcher.dispatch(click("KEY")))
+        self.assertEqual(("event",), self.dispatcher.dispatch(parse_message(EVENT_XML.format(event="VIEW", key="url"))))
+        self.assertEqual("default", self.dispatcher.dispatch(parse_message(TEXT_XML.replace("text", "image"))))
+
+    def test_dispatch_by_event_key(self):
+        self.register("event", "CLICK", key="MENU", result="exact")
+        self.register("event", "click", prefix="MENU_", result="menu")
+        self.register("event", "click", prefix="MENU_HELP", result="help")
+        self.register("event", "click", result="click")
+
+        self.assertEqual(("exact",), self.dispatcher.dispatch(click("MENU")))
+        self.assertEqual(("menu",), self.dispatcher.dispatch(click("MENU_ABOUT")))
+        self.assertEqual(("help",), self.dispatcher.dispatch(click("MENU_HELP_1")))
+        self.assertEqual(("click",), self.dispatcher.dispatch(click("MEN")))
+        self.assertEqual(("click",), self.dispatcher.dispatch(click("")))
+
+    def test_dispatch_scene(self):
+        self.register(SubscribeScanEvent, prefix="invite_", result="invite")
+
+        message = parse_message(EVENT_XML.format(event="subscribe", key="qrscene_invite_1"))
+        self.assertEqual(("invite",), self.dispatcher.dispatch(message))
+        message = parse_message(EVENT_XML.format(event="subscribe", key="qrscene_other"))
+        self.assertEqual("default", self.dispatcher.dispatch(message))
+
+    def test_dispatch_work_message(self):
+        self.register("event", "enter_agent", result="enter")
+        self.register("text", result="text")
+
+        message = parse_work_message(EVENT_XML.format(event="enter_agent", key=""))
+        self.assertEqual(("enter",), self.dispatcher.dispatch(message))
+        self.assertEqual(("text",), self.dispatcher.dispatch(parse_work_message(TEXT_XML)))
+
+    def test_register_invalid(self):
+        with self.assertRaises(ValueError):
+            self.dispatcher.register("event", "no_such_event")
+        with self.assertRaises(ValueError):
+            self.dispatcher.register("text", key="KEY")
+        self.assertIsNone(MessageDispatcher().dispatch(parse_message(TEXT_XML)))
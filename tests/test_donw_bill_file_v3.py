@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import json
 import os
+import tempfile
 import unittest
 from httmock import urlmatch, response, HTTMock
 
@@ -54,6 +55,8 @@ class DownBillFileTestCase(unittest.TestCase):
             apiclient_key_path=os.path.join(_CERTS_PATH, "apiclient_key.pem"),
             skip_check_signature=True,  # 测试无法校验证书
         )
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp_dir.cleanup)
 
     def test_trade_bill(self):
         with HTTMock(wechat_api_mock):
@@ -91,7 +94,7 @@ class DownBillFileTestCase(unittest.TestCase):
     def test_download_bill(self):
         with HTTMock(wechat_api_down_file_mock):
             response = self.client.ecommerce.download_bill("https://api.mch.weixin.qq.com/v3/billdownload/file")
-            target_file_path = os.path.join(_FIXTURE_PATH, "downloadBill.xlsx")
+            target_file_path = os.path.join(self._tmp_dir.name, "downloadBill.xlsx")
             try:
                 with open(target_file_path, "wb") as target_file:
                     target_file.write(response.content)
@@ -99,7 +102,7 @@ class DownBillFileTestCase(unittest.TestCase):
                 print(e)
 
     def test_download_bill_streamable(self):
-        target_file_path = os.path.join(_FIXTURE_PATH, "downloadBill.xlsx")
+        target_file_path = os.path.join(self._tmp_dir.name, "downloadBill.xlsx")
         with HTTMock(wechat_api_down_file_mock):
             response = self.client.ecommerce.download_bill(
                 "https://api.mch.weixin.qq.com/v3/billdownload/file", stream=True
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+import unittest
+
+
+def loaded_modules(code):
+    output = subprocess.check_output(
+        [sys.executable, "-c", f"import sys\n{code}\nprint(' '.join(sorted(sys.modules)))"],
+        text=True,
+    )
+    return set(output.split())
+
+
+class LazyImportTestCase(unittest.TestCase):
+    def test_import_crypto_only(self):
+        modules = loaded_modules("from wechatpy.crypto import WeChatCrypto")
+        for name in ("wechatpy.client", "wechatpy.pay", "wechatpy.parser", "requests"):
+            self.assertNotIn(name, modules)
+
+    def test_import_parse_message(self):
+        modules = loaded_modules("from wechatpy import parse_message")
+        self.assertIn("wechatpy.parser", modules)
+        self.assertNotIn("wechatpy.client", modules)
+        self.assertNotIn("wechatpy.pay", modules)
+
+    def test_submodule_attributes(self):
+        code = (
+            "import wechatpy\n"
+            "assert wechatpy.replies.TextReply\n"
+            "assert wechatpy.client.WeChatClient\n"
+            "assert wechatpy.work.crypto.WeChatCrypto\n"
+            "assert 'parse_message' in dir(wechatpy) and 'WeChatCrypto' in dir(wechatpy.work)"
+        )
+        modules = loaded_modules(code)
+        self.assertIn("wechatpy.replies", modules)
+
+    def test_exports(self):
+        import wechatpy
+        import wechatpy.work
+        from wechatpy.client import api
+        from wechatpy.client.api.user import WeChatUser
+        from wechatpy.work.client.api import WeChatOAuth
+
+        for name in wechatpy.__all__:
+            self.assertTrue(getattr(wechatpy, name))
+        for name in wechatpy.work.__all__:
+            self.assertTrue(getattr(wechatpy.work, name))
+        self.assertIs(WeChatUser, api.WeChatUser)
+        self.assertEqual("wechatpy.work.client.api.oauth", WeChatOAuth.__module__)
+        with self.assertRaises(AttributeError):
+            wechatpy.missing
+        with self.assertRaises(ImportError):
+            from wechatpy.client.api import Missing  # NOQA
@@ -128,3 +128,47 @@ class MessagesTestCase(unittest.TestCase):
         self.assertEqual("path", msg.page_path)
         self.assertEqual("thumburl", msg.thumb_url)
         self.assertEqual("thumbmediaid", msg.thumb_media_id)
+
+    def test_message_fields_are_cached(self):
+        import pickle
+
+        from wechatpy.events import LocationEvent
+        from wechatpy.work.messages import TextMessage
+
+        msg = TextMessage({"MsgType": "text", "CreateTime": "1348831860", "AgentID": "1"})
+        self.assertFalse(hasattr(msg, "__dict__"))
+        self.assertFalse(hasattr(LocationEvent({}), "__dict__"))
+        self.assertIs(msg.create_time, msg.create_time)
+        self.assertEqual(1, msg.agent)
+
+        class HandledTextMessage(TextMessage):
+            pass
+
+        custom = HandledTextMessage({"MsgType": "text", "Content": "test"})
+        custom.handled = True
+        self.assertTrue(custom.handled)
+        self.assertEqual("test", custom.content)
+
+        msg.time = 1482048670
+        self.assertEqual(1482048670, msg.time)
+        self.assertEqual(1482048670, msg.create_time.timestamp())
+
+        copied = pickle.loads(pickle.dumps(msg))
+        self.assertEqual(msg._data, copied._data)
+        self.assertEqual(msg.create_time, copied.create_time)
+
+    def test_inherited_fields_are_shared(self):
+        from wechatpy import messages
+        from wechatpy.fields import StringField
+        from wechatpy.work.messages import LinkMessage
+
+        self.assertIs(messages.BaseMessage._fields["source"], LinkMessage._fields["source"])
+        self.assertIs(messages.LinkMessage._fields["title"], LinkMessage._fields["title"])
+        self.assertEqual(["agent", "pic_url", "title"], list(LinkMessage._fields)[:3])
+
+        class CustomLinkMessage(LinkMessage):
+            title = StringField("CustomTitle")
+
+        msg = CustomLinkMessage({"Title": "title", "CustomTitle": "custom"})
+        self.assertEqual("custom", msg.title)
+        self.assertEqual("title", LinkMessage({"Title": "title"}).title)
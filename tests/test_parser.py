@@ -379,3 +379,58 @@ class ParseMessageTestCase(unittest.TestCase):
         self.assertEqual("123", msg.content)
         self.assertEqual("123", msg.device_type)
         self.assertEqual("123", msg.device_id)
+
+    def test_parse_message_lazily(self):
+        from wechatpy.events import LocationEvent
+
+        xml = """<xml>
+        <ToUserName><![CDATA[toUser]]></ToUserName>
+        <FromUserName><![CDATA[fromUser]]></FromUserName>
+        <CreateTime>123456789</CreateTime>
+        <MsgType><![CDATA[event]]></MsgType>
+        <Event><![CDATA[LOCATION]]></Event>
+        <Latitude>23.137466</Latitude>
+        <Longitude>113.352425</Longitude>
+        <Precision>119.385040</Precision>
+        </xml>"""
+
+        msg = parse_message(xml, lazy=True)
+
+        self.assertIsInstance(msg, LocationEvent)
+        self.assertEqual("fromUser", msg.source)
+        self.assertFalse(dict.__contains__(msg._data, "Latitude"))
+        self.assertEqual(23.137466, msg.latitude)
+        self.assertEqual(parse_message(xml)._data, msg._data)
+
+    def test_parse_subscribe_scan_event_lazily(self):
+        xml = """<xml>
+        <ToUserName><![CDATA[toUser]]></ToUserName>
+        <FromUserName><![CDATA[FromUser]]></FromUserName>
+        <CreateTime>123456789</CreateTime>
+        <MsgType><![CDATA[event]]></MsgType>
+        <Event><![CDATA[subscribe]]></Event>
+        <EventKey><![CDATA[qrscene_123123]]></EventKey>
+        <Ticket><![CDATA[TICKET]]></Ticket>
+        </xml>"""
+
+        msg = parse_message(xml, lazy=True)
+
+        self.assertEqual("subscribe_scan", msg.event)
+        self.assertEqual("TICKET", msg.ticket)
+        self.assertEqual("123123", msg.scene_id)
+
+    def test_parse_message_lazily_ignores_elements_in_cdata(self):
+        xml = """<xml>
+        <ToUserName><![CDATA[toUser]]></ToUserName>
+        <FromUserName><![CDATA[fromUser]]></FromUserName>
+        <CreateTime>1348831860</CreateTime>
+        <MsgType><![CDATA[text]]></MsgType>
+        <Content><![CDATA[<Event><![CDATA[subscribe]]></Content>
+        <MsgId>1234567890123456</MsgId>
+        </xml>"""
+
+        msg = parse_message(xml, lazy=True)
+
+        self.assertEqual("text", msg.type)
+        self.assertEqual("<Event><![CDATA[subscribe", msg.content)
+        self.assertNotIn("Event", msg._data)
@@ -60,6 +60,67 @@ class WeChatPayTestCase(unittest.TestCase):
         )
         self.assertEqual(expected, sign)
 
+    def test_private_key_loaded_once(self):
+        import base64
+        import re
+
+        from cryptography.hazmat.primitives.asymmetric import padding
+        from cryptography.hazmat.primitives.hashes import SHA256
+
+        self.assertIs(self.client.private_key, self.client.private_key)
+        authorization = self.client._authorization("POST", "/v3/pay/transactions/jsapi", '{"a": 1}')
+        fields = dict(re.findall(r'(\w+)="([^"]*)"', authorization))
+        self.assertEqual(self.client.serial_no, fields["serial_no"])
+        message = f'POST\n/v3/pay/transactions/jsapi\n{fields["timestamp"]}\n{fields["nonce_str"]}\n{{"a": 1}}\n'
+        public_key = self.client.private_key.public_key()
+        public_key.verify(base64.b64decode(fields["signature"]), message.encode(), padding.PKCS1v15(), SHA256())
+
+    def test_signers(self):
+        import asyncio
+
+        from wechatpy.pay.utils import sign_rsa
+        from wechatpy.pay.v3.signer import ProcessPoolSigner, ThreadPoolSigner
+
+        messages = [f"POST\n/v3/pay/transactions/jsapi\n1554208460\nNONCE{i}\n{{}}\n" for i in range(20)]
+        expected = [sign_rsa(self.client.private_key, message) for message in messages]
+        for signer in (ThreadPoolSigner(self.client.private_key), ProcessPoolSigner(self.client.apiclient_key, 2)):
+            try:
+                self.assertEqual(expected[0], signer.sign(messages[0]))
+                futures = [signer.submit(message) for message in messages]
+                self.assertEqual(expected, [future.result() for future in futures])
+
+                self.client.signer = signer
+                authorization = asyncio.run(self.client.authorization_async("GET", "/v3/certificates"))
+                self.assertTrue(authorization.startswith('WECHATPAY2-SHA256-RSA2048 mchid="1192221"'))
+                self.assertIn("signature=", self.client._authorization("GET", "/v3/certificates", ""))
+            finally:
+                self.client.signer = None
+                signer.close()
+
+    def test_process_pool_signer_recovers(self):
+        import signal
+
+        from concurrent.futures.process import BrokenProcessPool
+
+        from wechatpy.pay.utils import sign_rsa
+        from wechatpy.pay.v3.signer import ProcessPoolSigner
+
+        message = "GET\n/v3/certificates\n1554208460\nNONCE\n\n"
+        expected = sign_rsa(self.client.private_key, message)
+        signer = ProcessPoolSigner(self.client.apiclient_key, 1)
+        try:
+            self.assertEqual(expected, signer.sign(message))
+            for process in list(signer._executor._processes.values()):
+                os.kill(process.pid, signal.SIGKILL)
+                process.join()
+            with self.assertRaises(BrokenProcessPool):
+                signer.sign(message)
+            self.assertEqual(expected, signer.sign(message))
+        finally:
+            signer.close()
+        with self.assertRaises(RuntimeError):
+            signer.submit(message)
+
     def test_media(self):
         with HTTMock(wechat_api_mock):
             data = b""
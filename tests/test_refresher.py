@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+import time
+import unittest
+
+from httmock import HTTMock
+
+from wechatpy import WeChatClient
+from wechatpy.client.aio import AsyncWeChatClient
+from wechatpy.client.refresher import AsyncTokenRefresher, Credential, TokenRefresher
+
+from api_mock import async_wechat_api_mock, mock_http_client, wechat_api_mock
+
+
+class TokenRefresherTestCase(unittest.TestCase):
+    def test_refresh_client_credentials(self):
+        client = WeChatClient("123456", "123456")
+        refresher = TokenRefresher(refresh_ahead=600, jitter=0)
+        refresher.add(client, jsapi_ticket=True)
+        with HTTMock(wechat_api_mock), refresher:
+            deadline = time.time() + 5
+            while time.time() < deadline:
+                if client.session.get("123456_jsapi_ticket"):
+                    break
+                time.sleep(0.01)
+        self.assertEqual("1234567890", client.session.get(client.access_token_key))
+        self.assertTrue(client.session.get("123456_jsapi_ticket"))
+        self.assertTrue(client.expires_at > time.time() + 7000)
+
+    def test_fresh_credential_is_not_fetched(self):
+        client = WeChatClient("123456", "123456")
+        client.session.set(client.access_token_key, "fresh")
+        client.expires_at = int(time.time()) + 7200
+        with TokenRefresher() as refresher:
+            refresher.add(client)
+            time.sleep(0.1)
+        self.assertEqual("fresh", client.session.get(client.access_token_key))
+
+    def test_schedule_with_jitter(self):
+        refresher = TokenRefresher(refresh_ahead=600, jitter=120)
+        now = time.time()
+        for _ in range(20):
+            due = refresher._next_due(now + 7200)
+            self.assertTrue(now + 7200 - 720 <= due <= now + 7200 - 600)
+        self.assertTrue(refresher._next_due(now + 10) >= now + refresher.retry_interval)
+
+    def test_failed_refresh_is_retried(self):
+        attempts = []
+        done = threading.Event()
+
+        def refresh(min_ttl):
+            attempts.append(min_ttl)
+            if len(attempts) == 1:
+                raise RuntimeError("boom")
+            done.set()
+
+        refresher = TokenRefresher(refresh_ahead=10, jitter=5, retry_interval=0.05)
+        refresher.add_credential(Credential("test", lambda: time.time() + 3600, refresh))
+        with refresher:
+            self.assertTrue(done.wait(2))
+        self.assertEqual([15, 15], attempts)
+        self.assertIn("test", refresher._scheduled)
+
+    def test_bounded_concurrency(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def refresh(min_ttl):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+
+        refresher = TokenRefresher(max_workers=2)
+        for i in range(8):
+            refresher.add_credential(Credential(f"test{i}", lambda: time.time() + 3600, refresh))
+        with refresher:
+            deadline = time.time() + 2
+            while len(peak) < 8 and time.time() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(8, len(peak))
+        self.assertEqual(2, max(peak))
+
+    def test_remove_client(self):
+        from wechatpy.component import WeChatComponent
+
+        client = WeChatClient("123456", "123456")
+        component = WeChatComponent("123456", "123456", "token", "kWxPEV2UEDyxWpmPdKC3F4dgPDmOvfKX1HGnEUDS1aR")
+        refresher = TokenRefresher()
+        refresher.add(client, jsapi_ticket=True)
+        refresher.add(component)
+        refresher.remove(component)
+        self.assertEqual({client.access_token_key, "123456_jsapi_ticket"}, set(refresher._credentials))
+        refresher.remove(client)
+        self.assertEqual({}, refresher._credentials)
+
+    def test_shared_credentials(self):
+        # two agents of one corp share the jsapi ticket
+        client_a = WeChatClient("123456", "123456")
+        client_b = WeChatClient("123456", "123456")
+        refresher = TokenRefresher()
+        refresher.add(client_a, jsapi_ticket=True)
+        refresher.add(client_b, jsapi_ticket=True)
+        refresher.remove(client_b)
+        self.assertEqual({client_a.access_token_key, "123456_jsapi_ticket"}, set(refresher._credentials))
+        self.assertIs(
+            refresher._clients[client_a]["123456_jsapi_ticket"], refresher._credentials["123456_jsapi_ticket"]
+        )
+        refresher.remove(client_a)
+        self.assertEqual({}, refresher._credentials)
+        self.assertEqual({}, refresher._holders)
+        self.assertEqual(0, len(refresher._clients))
+
+    def test_removed_credential_is_not_rescheduled(self):
+        refresher = TokenRefresher()
+        refresher.add_credential(Credential("test", lambda: None, lambda min_ttl: None))
+        refresher.remove_credential("test")
+        self.assertEqual((None, None), refresher._pop_due())
+
+
+class AsyncTokenRefresherTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_refresh_client_credentials(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            return async_wechat_api_mock(request)
+
+        client = AsyncWeChatClient("123456", "123456", http_client=mock_http_client(handler))
+        async with AsyncTokenRefresher(max_concurrency=2) as refresher:
+            refresher.add(client, jsapi_ticket=True)
+            for _ in range(100):
+                if client.session.get("123456_jsapi_ticket"):
+                    break
+                await asyncio.sleep(0.01)
+        await client.close()
+        self.assertEqual("1234567890", client.session.get(client.access_token_key))
+        self.assertTrue(client.session.get("123456_jsapi_ticket"))
+        self.assertEqual(1, calls.count("/cgi-bin/token"))
+        self.assertIsNone(refresher._task)
@@ -107,3 +107,48 @@ class ReplyTestCase(unittest.TestCase):
 
         reply = EmptyReply()
         self.assertEqual("", reply.render())
+
+    def test_render_matches_field_to_xml(self):
+        from wechatpy.replies import REPLY_TYPES
+
+        reply = REPLY_TYPES["news"](source="user1", target="user2", time=1, articles=[{"title": "{0}"}])
+        nodes = [f"<MsgType><![CDATA[{reply.type}]]></MsgType>"]
+        nodes.extend(field.to_xml(getattr(reply, name)) for name, field in reply._fields.items())
+        self.assertEqual("<xml>\n{}\n</xml>".format("\n".join(nodes)), reply.render())
+
+    def test_render_custom_field_to_xml(self):
+        from wechatpy.fields import StringField
+        from wechatpy.replies import BaseReply
+
+        class UpperField(StringField):
+            def to_xml(self, value):
+                return f"<{self.name}>{value.upper()}</{self.name}>"
+
+        class UpperReply(BaseReply):
+            type = "upper"
+            content = UpperField("Content")
+
+        reply = UpperReply(source="user1", target="user2", content="test")
+        self.assertIn("<Content>TEST</Content>", reply.render())
+
+    def test_frozen_reply(self):
+        from wechatpy.messages import TextMessage
+        from wechatpy.replies import ArticlesReply, create_reply
+
+        articles = [{"title": "欢迎 {0}", "url": "http://www.qq.com"}]
+        frozen = ArticlesReply(articles=articles).freeze()
+        message = TextMessage({"ToUserName": "gh_1", "FromUserName": "user1", "MsgType": "text"})
+        reply = create_reply(frozen, message)
+        reply.time = 123
+        expected = ArticlesReply(message=message, articles=articles, time=123).render()
+
+        self.assertEqual("news", reply.type)
+        self.assertEqual(articles, reply.articles)
+        self.assertEqual(expected, reply.render())
+        self.assertEqual(expected.encode("utf-8"), reply.render_binary())
+        self.assertIsNone(frozen.target)
+
+    def test_freeze_empty_reply(self):
+        from wechatpy.replies import EmptyReply
+
+        self.assertEqual("", EmptyReply().freeze().render())
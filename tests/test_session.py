@@ -1,35 +1,21 @@
 # -*- coding: utf-8 -*-
 import os
-import json
 import platform
+import sqlite3
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 
-from httmock import urlmatch, HTTMock, response
+from httmock import urlmatch, HTTMock
 
 from wechatpy import WeChatClient
+from wechatpy.session.memorystorage import MemoryStorage
+from wechatpy.session.sqlitestorage import SQLiteStorage
+from wechatpy.session.tieredstorage import TieredStorage
 
-
-_TESTS_PATH = os.path.abspath(os.path.dirname(__file__))
-_FIXTURE_PATH = os.path.join(_TESTS_PATH, "fixtures")
-
-
-@urlmatch(netloc=r"(.*\.)?api\.weixin\.qq\.com$")
-def wechat_api_mock(url, request):
-    path = url.path.replace("/cgi-bin/", "").replace("/", "_")
-    if path.startswith("_"):
-        path = path[1:]
-    res_file = os.path.join(_FIXTURE_PATH, f"{path}.json")
-    content = {
-        "errcode": 99999,
-        "errmsg": f"can not find fixture {res_file}",
-    }
-    headers = {"Content-Type": "application/json"}
-    try:
-        with open(res_file, "rb") as f:
-            content = json.loads(f.read().decode("utf-8"))
-    except (IOError, ValueError) as e:
-        print(e)
-    return response(200, content, headers, request=request)
+from api_mock import wechat_api_mock
 
 
 class WeChatSessionTestCase(unittest.TestCase):
@@ -102,3 +88,394 @@ class WeChatSessionTestCase(unittest.TestCase):
             self.assertEqual("1234567890", token["access_token"])
             self.assertEqual(7200, token["expires_in"])
             self.assertEqual("1234567890", client.access_token)
+
+    def test_memory_storage_many(self):
+        session = MemoryStorage()
+        session.set_many({"a": 1, "b": {"c": 2}, "d": None})
+        self.assertEqual({"a": 1, "b": {"c": 2}}, session.get_many(["a", "b", "d"]))
+        session.delete_many(["a", "d"])
+        self.assertEqual({"b": {"c": 2}}, session.get_many(["a", "b"]))
+
+    def test_redis_storage_many(self):
+        from wechatpy.session.redisstorage import RedisStorage
+
+        redis = mock.MagicMock()
+        redis.mget.return_value = [b"1", None, b'{"c": 2}']
+        session = RedisStorage(redis)
+        self.assertEqual({"a": 1, "b": {"c": 2}}, session.get_many(["a", "d", "b"]))
+        redis.mget.assert_called_once_with(["wechatpy:a", "wechatpy:d", "wechatpy:b"])
+
+        session.set_many({"a": 1, "b": None}, 60)
+        redis.pipeline.assert_called_once_with(transaction=False)
+        pipe = redis.pipeline.return_value
+        pipe.set.assert_called_once_with("wechatpy:a", "1", ex=60)
+        pipe.execute.assert_called_once_with()
+
+        session.delete_many(["a", "b"])
+        redis.delete.assert_called_once_with("wechatpy:a", "wechatpy:b")
+
+    def test_memcached_storage_many(self):
+        from wechatpy.session.memcachedstorage import MemcachedStorage
+
+        mc = mock.MagicMock()
+        mc.get_multi.return_value = {"wechatpy:a": b"1"}
+        session = MemcachedStorage(mc)
+        self.assertEqual({"a": 1}, session.get_many(["a", "b"]))
+        mc.get_multi.assert_called_once_with(["wechatpy:a", "wechatpy:b"])
+
+        session.set_many({"a": 1, "b": "x"})
+        mc.set_multi.assert_called_once_with({"wechatpy:a": "1", "wechatpy:b": '"x"'}, 0)
+
+        session.delete_many(["a"])
+        mc.delete_multi.assert_called_once_with(["wechatpy:a"])
+
+
+class MemoryStorageTestCase(unittest.TestCase):
+    def test_ttl(self):
+        session = MemoryStorage()
+        session.set("a", 1, ttl=0.01)
+        session.set("b", 2)
+        self.assertEqual(1, session.get("a"))
+        time.sleep(0.02)
+        self.assertIsNone(session.get("a"))
+        self.assertEqual("x", session.get("a", "x"))
+        self.assertEqual({"b": 2}, session.get_many(["a", "b"]))
+        self.assertTrue(session.add("a", 3))
+        self.assertFalse(session.add("a", 4))
+
+    def test_sweep(self):
+        session = MemoryStorage(sweep_interval=0)
+        session.set_many({"a": 1, "b": 2}, ttl=0.01)
+        time.sleep(0.02)
+        session.set("c", 3)
+        self.assertEqual(["c"], list(session._data))
+
+    def test_maxsize(self):
+        session = MemoryStorage(maxsize=2)
+        session.set("a", 1)
+        session.set("b", 2)
+        session.get("a")
+        session.set("c", 3)
+        self.assertEqual({"a": 1, "c": 3}, session.get_many(["a", "b", "c"]))
+
+    def test_threads(self):
+        session = MemoryStorage(maxsize=100)
+
+        def worker(n):
+            for i in range(1000):
+                session.set(f"{n}-{i % 150}", i, ttl=60)
+                session.get(f"{n}-{i % 120}")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(100, len(session._data))
+
+
+class SQLiteStorageTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "session.db")
+        self.session = SQLiteStorage(self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_get_set_delete(self):
+        self.session.set("a", {"token": "t", "expires_at": 1})
+        self.assertEqual({"token": "t", "expires_at": 1}, self.session.get("a"))
+        self.session.set("a", 2)
+        self.assertEqual(2, self.session.get("a"))
+        self.session.delete("a")
+        self.assertEqual("x", self.session.get("a", "x"))
+
+    def test_ttl(self):
+        self.session.set("a", 1, ttl=0.01)
+        self.session.set("b", 2)
+        time.sleep(0.02)
+        self.assertIsNone(self.session.get("a"))
+        self.assertEqual({"b": 2}, self.session.get_many(["a", "b"]))
+
+    def test_add(self):
+        self.assertTrue(self.session.add("lock", 1, ttl=0.01))
+        self.assertFalse(self.session.add("lock", 2))
+        time.sleep(0.02)
+        self.assertTrue(self.session.add("lock", 3))
+        self.assertEqual(3, self.session.get("lock"))
+
+    def test_many(self):
+        self.session.set_many({"a": 1, "b": 2, "c": None})
+        self.assertEqual({"a": 1, "b": 2}, self.session.get_many(["a", "b", "c"]))
+        self.session.delete_many(["a", "b"])
+        self.assertEqual({}, self.session.get_many(["a", "b"]))
+
+    def test_many_keys(self):
+        if hasattr(sqlite3.Connection, "setlimit"):
+            # the default of SQLite before 3.32
+            self.session._connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        mapping = {f"key{i}": i for i in range(1200)}
+        self.session.set_many(mapping)
+        self.assertEqual(mapping, self.session.get_many(iter(mapping)))
+        self.session.delete_many(list(mapping)[:1100])
+        self.assertEqual({"key1100": 1100, "key1199": 1199}, self.session.get_many(["key0", "key1100", "key1199"]))
+
+    def test_shared_between_processes(self):
+        client = WeChatClient("123456", "123456", session=self.session)
+        with HTTMock(wechat_api_mock):
+            client.fetch_access_token()
+
+        other = WeChatClient("123456", "123456", session=SQLiteStorage(self.path))
+        self.assertEqual("1234567890", other.access_token)
+        self.assertEqual(client.expires_at, other.expires_at)
+
+    def test_threads(self):
+        def worker():
+            for i in range(50):
+                self.session.set("counter", i)
+                self.session.get("counter")
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(49, self.session.get("counter"))
+
+
+class SingleFlightRefreshTestCase(unittest.TestCase):
+    app_id = "123456"
+    secret = "123456"
+
+    def _make_client(self, session=None, delay=0.05):
+        fetches = []
+
+        class CountingClient(WeChatClient):
+            def fetch_access_token(self):
+                fetches.append(threading.get_ident())
+                time.sleep(delay)
+                self.session.set(self.access_token_key, f"token{len(fetches)}", 7200)
+                self.expires_at = int(time.time()) + 7200
+                return {"access_token": f"token{len(fetches)}", "expires_in": 7200}
+
+        return CountingClient(self.app_id, self.secret, session=session), fetches
+
+    def test_concurrent_threads_fetch_once(self):
+        client, fetches = self._make_client()
+        tokens = []
+        threads = [threading.Thread(target=lambda: tokens.append(client.access_token)) for _ in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(1, len(fetches))
+        self.assertEqual(["token1"] * 16, tokens)
+
+    def test_clients_sharing_session_fetch_once(self):
+        from wechatpy.session.memorystorage import MemoryStorage
+
+        session = MemoryStorage()
+        clients = [self._make_client(session) for _ in range(4)]
+        threads = [threading.Thread(target=lambda c=c: c.access_token) for c, _ in clients]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(1, sum(len(fetches) for _, fetches in clients))
+
+    def test_wait_for_other_process_lease(self):
+        client, fetches = self._make_client()
+        # another process holds the refresh lease and stores the token later
+        client.session.add(f"{client.access_token_key}_refresh_lock", 1, 10)
+
+        def other_process():
+            time.sleep(0.1)
+            client.session.set(client.access_token_key, "shared", 7200)
+            client.expires_at = int(time.time()) + 7200
+
+        t = threading.Thread(target=other_process)
+        t.start()
+        self.assertEqual("shared", client.access_token)
+        t.join()
+        self.assertEqual([], fetches)
+
+    def test_invalid_token_is_refreshed(self):
+        client, fetches = self._make_client(delay=0)
+        client.session.set(client.access_token_key, "revoked", 7200)
+        client.expires_at = int(time.time()) + 7200
+        self.assertEqual("token1", client._refresh_access_token(invalid_token="revoked"))
+        # token has already been replaced by another caller, reuse it
+        self.assertEqual("token1", client._refresh_access_token(invalid_token="revoked"))
+        self.assertEqual(1, len(fetches))
+        self.assertIsNone(client.session.get(f"{client.access_token_key}_refresh_lock"))
+
+
+class CountingStorage(MemoryStorage):
+    def __init__(self):
+        super().__init__()
+        self.gets = []
+
+    def get(self, key, default=None):
+        self.gets.append(key)
+        return super().get(key, default)
+
+    def get_many(self, keys):
+        self.gets.extend(keys)
+        return super().get_many(keys)
+
+
+class TokenRecordTestCase(unittest.TestCase):
+    def setUp(self):
+        self.session = CountingStorage()
+        self.client = WeChatClient("123456", "123456", session=self.session)
+
+    def test_access_token_single_round_trip(self):
+        with HTTMock(wechat_api_mock):
+            self.client.fetch_access_token()
+        self.session.gets.clear()
+        self.assertEqual("1234567890", self.client.access_token)
+        self.assertEqual(["123456_access_token_record"], self.session.gets)
+
+    def test_legacy_keys_are_written(self):
+        with HTTMock(wechat_api_mock):
+            self.client.fetch_access_token()
+        self.assertEqual("1234567890", self.session.get("123456_access_token"))
+        self.assertEqual(self.client.expires_at, self.session.get("123456_access_token_expires_at"))
+        self.assertTrue(self.client.expires_at > time.time() + 7000)
+
+    def test_read_legacy_keys(self):
+        self.session.set("123456_access_token", "legacy", 7200)
+        self.session.set("123456_access_token_expires_at", int(time.time()) + 7200)
+        self.assertEqual("legacy", self.client.access_token)
+
+        self.session.set("123456_access_token_expires_at", int(time.time()) + 10)
+        with HTTMock(wechat_api_mock):
+            self.assertEqual("1234567890", self.client.access_token)
+
+    def test_user_provided_access_token(self):
+        with HTTMock(wechat_api_mock):
+            self.client.fetch_access_token()
+        client = WeChatClient("123456", "123456", access_token="provided", session=self.session)
+        self.assertEqual("provided", client.access_token)
+        self.assertIsNone(client.expires_at)
+
+    def test_set_expires_at(self):
+        with HTTMock(wechat_api_mock):
+            self.client.fetch_access_token()
+        expires_at = int(time.time()) + 100
+        self.client.expires_at = expires_at
+        self.assertEqual(expires_at, self.client.expires_at)
+
+
+class FakeInvalidation:
+    def __init__(self):
+        self.published = []
+        self.callbacks = []
+
+    def publish(self, key):
+        self.published.append(key)
+
+    def subscribe(self, callback):
+        self.callbacks.append(callback)
+
+
+class TieredStorageTestCase(unittest.TestCase):
+    def setUp(self):
+        self.backend = CountingStorage()
+        self.session = TieredStorage(self.backend, max_staleness=60, maxsize=3)
+
+    def test_steady_state_reads_skip_backend(self):
+        client = WeChatClient("123456", "123456", session=self.session)
+        with HTTMock(wechat_api_mock):
+            client.fetch_access_token()
+        self.backend.gets.clear()
+        for _ in range(10):
+            self.assertEqual("1234567890", client.access_token)
+        self.assertEqual([], self.backend.gets)
+
+    def test_refresh_is_single_flight_across_tiers(self):
+        # two processes, each with its own in-process tier over one shared backend
+        client_a = WeChatClient("123456", "123456", session=TieredStorage(self.backend))
+        client_b = WeChatClient("123456", "123456", session=TieredStorage(self.backend))
+        client_a._store_access_token("old", expires_in=30)
+        self.assertIsNone(client_b._get_cached_access_token())
+        fetches = []
+
+        @urlmatch(netloc=r"(.*\.)?api\.weixin\.qq\.com$", path=r".*/token$")
+        def count_fetches(url, request):
+            fetches.append(url.path)
+
+        with HTTMock(count_fetches, wechat_api_mock):
+            self.assertEqual("1234567890", client_a.access_token)
+            # the tier of b still caches the old record, the lease re-check reads the backend
+            self.assertEqual("1234567890", client_b.access_token)
+        self.assertEqual(1, len(fetches))
+
+    def test_read_through(self):
+        self.backend.set("a", 1)
+        self.assertEqual(1, self.session.get("a"))
+        self.assertEqual(1, self.session.get("a"))
+        self.assertEqual(["a"], self.backend.gets)
+        self.assertIsNone(self.session.get("missing"))
+        self.assertIsNone(self.session.get("missing"))
+        self.assertEqual(["a", "missing", "missing"], self.backend.gets)
+
+    def test_write_through(self):
+        self.session.set("a", 1, 10)
+        self.assertEqual(1, self.backend.get("a"))
+        self.session.delete("a")
+        self.assertIsNone(self.backend.get("a"))
+        self.assertIsNone(self.session.get("a"))
+
+    def test_cache_bounded_by_expiry(self):
+        self.session.set("ttl", 1, ttl=0.01)
+        self.session.set("record", {"token": "t", "expires_at": time.time() + 0.01})
+        time.sleep(0.02)
+        self.backend.gets.clear()
+        self.session.get("ttl")
+        self.session.get("record")
+        self.assertEqual(["ttl", "record"], self.backend.gets)
+
+    def test_max_staleness(self):
+        session = TieredStorage(self.backend, max_staleness=0.01)
+        session.set("a", 1)
+        self.backend.set("a", 2)
+        self.assertEqual(1, session.get("a"))
+        time.sleep(0.02)
+        self.assertEqual(2, session.get("a"))
+
+    def test_maxsize(self):
+        for key in "abcd":
+            self.session.set(key, key)
+        self.assertEqual(["b", "c", "d"], list(self.session._cache))
+
+    def test_get_many(self):
+        self.session.set("a", 1)
+        self.backend.set("b", 2)
+        self.assertEqual({"a": 1, "b": 2}, self.session.get_many(["a", "b", "c"]))
+        self.assertEqual(["b", "c"], self.backend.gets)
+
+    def test_invalidation(self):
+        invalidation = FakeInvalidation()
+        session = TieredStorage(self.backend, invalidation=invalidation)
+        session.set("a", 1)
+        self.assertEqual(["a"], invalidation.published)
+        self.backend.set("a", 2)
+        self.assertEqual(1, session.get("a"))
+        invalidation.callbacks[0]("a")
+        self.assertEqual(2, session.get("a"))
+
+    def test_redis_invalidation(self):
+        from wechatpy.session.redisstorage import RedisInvalidation
+
+        redis = mock.MagicMock()
+        invalidation = RedisInvalidation(redis)
+        received = []
+        invalidation.subscribe(received.append)
+        handler = redis.pubsub.return_value.subscribe.call_args[1]["wechatpy:invalidate"]
+        handler({"data": b"other a"})
+        handler({"data": f"{invalidation.sender} b".encode()})
+        self.assertEqual(["a"], received)
+        invalidation.publish("c")
+        redis.publish.assert_called_once_with("wechatpy:invalidate", f"{invalidation.sender} c")
@@ -5,7 +5,9 @@ import os
 
 import pytest
 
-from wechatpy.utils import ObjectDict, check_signature, check_wxa_signature
+import xmltodict
+
+from wechatpy.utils import ObjectDict, check_signature, check_wxa_signature, parse_xml
 
 _TESTS_PATH = os.path.abspath(os.path.dirname(__file__))
 _CERTS_PATH = os.path.join(_TESTS_PATH, "certs")
@@ -98,3 +100,74 @@ class UtilityTestCase(unittest.TestCase):
                 rsa_decrypt(encrypted_string, private_fp.read()),
                 target_string.encode("utf-8"),
             )
+
+    def test_parse_xml(self):
+        cases = [
+            # flat messages are parsed with expat
+            """<xml>
+            <ToUserName><![CDATA[toUser]]></ToUserName>
+            <CreateTime>1348831860</CreateTime>
+            <Content><![CDATA[ this is a <test> ]]></Content>
+            <Empty><![CDATA[]]></Empty>
+            <Blank />
+            </xml>""",
+            '<?xml version="1.0" encoding="utf-8"?><xml><Content>中文</Content></xml>',
+            "<xml></xml>",
+            # everything else falls back to xmltodict
+            """<xml>
+            <MsgType><![CDATA[event]]></MsgType>
+            <ScanCodeInfo><ScanType><![CDATA[qrcode]]></ScanType><ScanResult><![CDATA[1]]></ScanResult></ScanCodeInfo>
+            </xml>""",
+            "<xml><Item>1</Item><Item>2</Item></xml>",
+            '<xml><Item id="1">1</Item></xml>',
+            "<xml>text<Item>1</Item></xml>",
+        ]
+        for xml in cases:
+            self.assertEqual(xmltodict.parse(xml), parse_xml(xml))
+            self.assertEqual(xmltodict.parse(xml), parse_xml(xml.encode("utf-8")))
+
+        # both paths decode as UTF-8 whatever the declaration says
+        for xml in (
+            '<?xml version="1.0" encoding="ISO-8859-1"?><xml><Content>中文</Content></xml>',
+            '<?xml version="1.0" encoding="ISO-8859-1"?><xml><Info><Content>中文</Content></Info></xml>',
+        ):
+            expected = xmltodict.parse(xml.encode("utf-8"), encoding="utf-8")
+            self.assertEqual(expected, parse_xml(xml))
+            self.assertEqual(expected, parse_xml(xml.encode("utf-8")))
+
+    def test_parse_xml_lazily(self):
+        from wechatpy.utils import LazyXMLDict, parse_xml_lazily
+
+        header = {"MsgType", "Event"}
+        xml = "<xml><MsgType><![CDATA[event]]></MsgType><Event>CLICK</Event><EventKey>KEY</EventKey></xml>"
+        data = parse_xml_lazily(xml, header)
+        self.assertIsInstance(data, LazyXMLDict)
+        self.assertEqual({"MsgType": "event", "Event": "CLICK"}, dict(dict.items(data)))
+        data["Event"] = "click"
+        self.assertEqual("KEY", data["EventKey"])
+        self.assertEqual({"MsgType": "event", "Event": "click", "EventKey": "KEY"}, data)
+
+        xml = "<xml><MsgType>event</MsgType><ScanCodeInfo><ScanType>qrcode</ScanType></ScanCodeInfo></xml>"
+        data = parse_xml_lazily(xml, header)
+        self.assertEqual(parse_xml(xml)["xml"], data)
+        self.assertEqual(parse_xml(xml)["xml"], dict(data))
+
+        xml = '<xml><MsgType id="1">event</MsgType></xml>'
+        self.assertEqual(parse_xml(xml)["xml"], parse_xml_lazily(xml, header))
+
+    def test_parse_xml_lazily_trailer(self):
+        from wechatpy.utils import parse_xml_lazily
+
+        xml = "<xml><MsgType>text</MsgType><Content><![CDATA[<MsgId>1</MsgId>]]></Content><MsgId>2</MsgId>\n</xml>"
+        data = parse_xml_lazily(xml, {"MsgType"}, ("MsgId",))
+        self.assertEqual({"MsgType": "text", "MsgId": "2"}, dict(dict.items(data)))
+        self.assertEqual(parse_xml(xml)["xml"], data)
+
+        # neither text inside CDATA nor a nested element is taken for the trailer
+        for xml in (
+            "<xml><MsgType>text</MsgType><Content><![CDATA[<MsgId>1</MsgId>]]></Content></xml>",
+            "<xml><MsgType>text</MsgType><Info><MsgId>1</MsgId></Info></xml>",
+        ):
+            data = parse_xml_lazily(xml, {"MsgType"}, ("MsgId",))
+            self.assertEqual({"MsgType": "text"}, dict(dict.items(data)))
+            self.assertEqual(parse_xml(xml)["xml"], data)
@@ -1,21 +1,47 @@
 # -*- coding: utf-8 -*-
 import logging
+from typing import TYPE_CHECKING
 
-from wechatpy.client import WeChatClient  # NOQA
-from wechatpy.component import ComponentOAuth, WeChatComponent  # NOQA
 from wechatpy.exceptions import (
     WeChatClientException,
     WeChatException,
     WeChatOAuthException,
     WeChatPayException,
 )  # NOQA
-from wechatpy.oauth import WeChatOAuth  # NOQA
-from wechatpy.parser import parse_message  # NOQA
-from wechatpy.pay import WeChatPay  # NOQA
-from wechatpy.replies import create_reply  # NOQA
+from wechatpy.utils import lazy_exports
+
+if TYPE_CHECKING:
+    from wechatpy.client import WeChatClient  # NOQA
+    from wechatpy.component import ComponentOAuth, WeChatComponent  # NOQA
+    from wechatpy.dispatcher import MessageDispatcher  # NOQA
+    from wechatpy.oauth import WeChatOAuth  # NOQA
+    from wechatpy.parser import parse_message  # NOQA
+    from wechatpy.pay import WeChatPay  # NOQA
+    from wechatpy.replies import create_reply  # NOQA
 
 __version__ = "2.0.0.alpha26"
 __author__ = "messense"
 
+# clients, pay and the message classes are imported on first access, so that
+# ``import wechatpy.crypto`` does not pay for all of them
+_exports = {
+    "WeChatClient": "wechatpy.client",
+    "ComponentOAuth": "wechatpy.component",
+    "WeChatComponent": "wechatpy.component",
+    "MessageDispatcher": "wechatpy.dispatcher",
+    "WeChatOAuth": "wechatpy.oauth",
+    "parse_message": "wechatpy.parser",
+    "WeChatPay": "wechatpy.pay",
+    "create_reply": "wechatpy.replies",
+}
+__all__ = [
+    "WeChatClientException",
+    "WeChatException",
+    "WeChatOAuthException",
+    "WeChatPayException",
+    *_exports,
+]
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
+
 # Set default logging handler to avoid "No handler found" warnings.
 logging.getLogger(__name__).addHandler(logging.NullHandler())
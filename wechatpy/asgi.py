@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+    wechatpy.asgi
+    ~~~~~~~~~~~~~~~~
+    This module provides an ASGI application for WeChat callbacks
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+import asyncio
+import functools
+import inspect
+import logging
+from urllib.parse import parse_qsl
+
+from wechatpy.exceptions import InvalidAppIdException, InvalidSignatureException
+from wechatpy.utils import check_signature, to_binary
+
+logger = logging.getLogger(__name__)
+
+
+async def _maybe_await(value):
+    if inspect.isawaitable(value):
+        value = await value
+    return value
+
+
+class CallbackApp:
+    """
+    处理微信服务器回调的 ASGI 应用，请使用 ``create_app`` 创建
+    """
+
+    def __init__(self, token, handler, crypto=None, client=None, timeout=4.5, dedup=None, work=False):
+        self.token = token
+        self.handler = handler
+        self.crypto = crypto
+        self.client = client
+        self.timeout = timeout
+        self.dedup = dedup
+        self.work = work
+        if work:
+            from wechatpy.work import create_reply, parse_message
+        else:
+            from wechatpy import create_reply, parse_message
+        self.parse_message = parse_message
+        self.create_reply = create_reply
+        # API methods of asyncio clients are plain functions returning a coroutine
+        self._async_client = inspect.iscoroutinefunction(getattr(client, "_request", None))
+        self._tasks = set()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        query = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+        if scope["method"] == "GET":
+            status, body = self._verify(query)
+        elif scope["method"] == "POST":
+            status, body = await self._handle(query, await self._read_body(receive))
+        else:
+            status, body = 405, ""
+        content_type = b"application/xml" if body.startswith("<") else b"text/plain"
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", content_type + b"; charset=utf-8")],
+            }
+        )
+        await send({"type": "http.response.body", "body": to_binary(body)})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            event = await receive()
+            if event["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif event["type"] == "lifespan.shutdown":
+                # let late replies already being prepared reach the user
+                if self._tasks:
+                    await asyncio.gather(*self._tasks, return_exceptions=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _read_body(receive):
+        chunks = []
+        while True:
+            event = await receive()
+            chunks.append(event.get("body", b""))
+            if not event.get("more_body"):
+                return b"".join(chunks)
+
+    def _verify(self, query):
+        timestamp = query.get("timestamp", "")
+        nonce = query.get("nonce", "")
+        try:
+            if self.work:
+                echo_str = self.crypto.check_signature(
+                    query.get("msg_signature", ""), timestamp, nonce, query.get("echostr", "")
+                )
+            else:
+                check_signature(self.token, query.get("signature", ""), timestamp, nonce)
+                echo_str = query.get("echostr", "")
+        except (InvalidSignatureException, InvalidAppIdException):
+            return 403, ""
+        return 200, echo_str
+
+    async def _handle(self, query, body):
+        timestamp = query.get("timestamp", "")
+        nonce = query.get("nonce", "")
+        encrypted = self.crypto is not None
+        try:
+            if encrypted:
+                if "msg_signature" not in query:
+                    return 400, ""
+                message = self.crypto.decrypt_and_parse(
+                    body, query["msg_signature"], timestamp, nonce, parser=self.parse_message, dedup=self.dedup
+                )
+            else:
+                check_signature(self.token, query.get("signature", ""), timestamp, nonce)
+                message = self.parse_message(body, dedup=self.dedup)
+        except (InvalidSignatureException, InvalidAppIdException):
+            return 403, ""
+        except Exception:
+            logger.exception("Failed to parse callback body")
+            return 400, ""
+
+        if message is None:
+            return 200, "success"
+        task = asyncio.ensure_future(_maybe_await(self.handler(message)))
+        done, _ = await asyncio.wait({task}, timeout=self.timeout)
+        if not done:
+            logger.info("Handler for %s timed out after %ss, replying later", message, self.timeout)
+            self._spawn(self._reply_later(task, message))
+            return 200, "success"
+
+        # an error response makes WeChat retry the push, reply success instead
+        try:
+            reply = self.create_reply(task.result(), message)
+            xml = reply.render() if reply else ""
+            if xml and encrypted:
+                xml = self.crypto.encrypt_message(xml, nonce, timestamp)
+        except Exception:
+            logger.exception("Failed to reply to %s", message)
+            return 200, "success"
+        if not xml:
+            return 200, "success"
+        return 200, xml
+
+    def _spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _reply_later(self, task, message):
+        try:
+            reply = self.create_reply(await task, message)
+            if reply:
+                await self.send_reply(message, reply)
+        except Exception:
+            logger.exception("Failed to reply to %s", message)
+
+    async def _call_api(self, func, *args):
+        if self._async_client or inspect.iscoroutinefunction(func):
+            return await _maybe_await(func(*args))
+        # sync clients block, run them in the default executor
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args))
+
+    async def send_reply(self, message, reply):
+        """
+        通过客服消息接口（企业微信为应用消息接口）发送被动回复无法及时返回的回复
+
+        :param message: 收到的消息
+        :param reply: ``create_reply`` 创建的回复
+        """
+        if self.client is None:
+            logger.warning("No client to send late %s to %s", reply.type, message.source)
+            return
+        api = self.client.message
+        receiver = (message.agent, message.source) if self.work else (message.source,)
+        if reply.type == "text":
+            await self._call_api(api.send_text, *receiver, reply.content)
+        elif reply.type in ("image", "voice"):
+            await self._call_api(getattr(api, f"send_{reply.type}"), *receiver, reply.media_id)
+        elif reply.type == "video":
+            await self._call_api(api.send_video, *receiver, reply.media_id, reply.title, reply.description)
+        elif reply.type == "music" and not self.work:
+            await self._call_api(
+                api.send_music,
+                *receiver,
+                reply.music_url,
+                reply.hq_music_url,
+                reply.thumb_media_id,
+                reply.title,
+                reply.description,
+            )
+        elif reply.type == "news":
+            await self._call_api(api.send_articles, *receiver, reply.articles)
+        elif reply.type != "unknown":
+            logger.warning("Late %s reply to %s can not be sent", reply.type, message.source)
+
+
+def create_app(token, handler, crypto=None, client=None, timeout=4.5, dedup=None, work=False):
+    """
+    创建处理微信服务器回调的 ASGI 应用，可以使用 uvicorn 等 ASGI 服务器运行::
+
+        from wechatpy.asgi import create_app
+        from wechatpy.client.aio import AsyncWeChatClient
+
+        async def handler(message):
+            if message.type == "text":
+                return await slow_answer(message.content)
+
+        client = AsyncWeChatClient(app_id, secret)
+        app = create_app(token, handler, crypto=WeChatCrypto(token, encoding_aes_key, app_id), client=client)
+
+    收到回调后依次校验签名、解密、``parse_message``，调用 ``handler``，再用 ``create_reply`` 和
+    ``encrypt_message`` 生成被动回复。微信服务器只等待 5 秒，``handler`` 超过 ``timeout`` 秒未返回时，
+    立即回复 ``success``，``handler`` 返回后再通过 ``client.message.send_*`` 发送回复。
+    ``handler`` 抛出异常时记录日志并回复 ``success``，避免微信服务器重复推送；无法解析的请求返回 400。
+
+    :param token: 公众号或企业微信应用的 token
+    :param handler: 处理消息的函数，参数为消息对象，返回值与 ``create_reply`` 的 ``reply`` 参数相同，
+                    应当是协程函数，同步函数会阻塞事件循环。``MessageDispatcher.dispatch`` 也可以直接使用
+    :param crypto: 安全模式或企业微信使用的 ``WeChatCrypto``，传入后只接受带 ``msg_signature`` 的加密消息
+    :param client: 超时后发送回复的客户端，可以是同步或 asyncio 客户端，不传则丢弃超时的回复
+    :param timeout: 被动回复的时限（秒）
+    :param dedup: 可选的 ``wechatpy.dedup.MessageDeduplicator``，重复推送的消息直接回复 ``success``
+    :param work: 是否为企业微信应用
+    :return: ASGI 应用
+    """
+    return CallbackApp(token, handler, crypto=crypto, client=client, timeout=timeout, dedup=dedup, work=work)
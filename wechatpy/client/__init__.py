@@ -95,10 +95,8 @@ class WeChatComponentClient(WeChatClient):
         # 如果公众号是刚授权，外部还没有缓存access_token和refresh_token
         # 可以传入这两个值，session 会缓存起来。
         # 如果外部已经缓存，这里只需要传入 appid，component和session即可
-        cache_access_token = self.session.get(self.access_token_key)
-
-        if access_token and (not cache_access_token or cache_access_token != access_token):
-            self.session.set(self.access_token_key, access_token, 7200)
+        if access_token and access_token != self._load_access_token()[0]:
+            self._store_access_token(access_token, 7200)
         if refresh_token:
             self.session.set(self.refresh_token_key, refresh_token)
 
@@ -110,12 +108,11 @@ class WeChatComponentClient(WeChatClient):
     def refresh_token_key(self):
         return f"{self.appid}_refresh_token"
 
-    @property
-    def access_token(self):
-        access_token = self.session.get(self.access_token_key)
-        if not access_token:
-            self.fetch_access_token()
-            access_token = self.session.get(self.access_token_key)
+    def _get_cached_access_token(self, min_ttl=60):
+        access_token, expires_at = self._load_access_token()
+        if access_token and expires_at and expires_at - time.time() <= min_ttl:
+            return None
+        # without a known expiry we rely on the session ttl
         return access_token
 
     @property
@@ -137,6 +134,5 @@ class WeChatComponentClient(WeChatClient):
         result = self.component.refresh_authorizer_token(self.appid, self.refresh_token)
         if "expires_in" in result:
             expires_in = result["expires_in"]
-        self.session.set(self.access_token_key, result["authorizer_access_token"], expires_in)
-        self.expires_at = int(time.time()) + expires_in
+        self._store_access_token(result["authorizer_access_token"], expires_in)
         return result
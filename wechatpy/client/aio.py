@@ -0,0 +1,646 @@
+# -*- coding: utf-8 -*-
+"""
+    wechatpy.client.aio
+    ~~~~~~~~~~~~~~~~~~~
+
+    asyncio 版本的微信公众平台客户端。
+
+    异步客户端直接复用同步客户端上的 API 类（``client.user``、``client.message``、
+    ``client.tag`` 等），这些 API 方法返回 awaitable 对象，HTTP 请求通过
+    `httpx <https://www.python-httpx.org/>`_ 的 ``AsyncClient`` 发送::
+
+        client = AsyncWeChatClient("appid", "secret")
+        user = await client.user.get("openid")
+
+    ``iter_followers`` 之类由多个接口组合而成的辅助方法仍然只支持同步客户端。
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+import asyncio
+import inspect
+import json
+import logging
+import time
+import weakref
+from typing import Dict
+
+from wechatpy.client import WeChatClient, WeChatComponentClient
+from wechatpy.client.api import WeChatJSAPI
+from wechatpy.client import base
+from wechatpy.client.base import REFRESH_LEASE_TTL, REFRESH_POLL_INTERVAL, token_record_key, token_values
+from wechatpy.component import WeChatComponent
+from wechatpy.exceptions import WeChatClientException, WeChatOAuthException
+from wechatpy.oauth import WeChatOAuth
+from wechatpy.session import AsyncSessionStorage
+
+logger = logging.getLogger(__name__)
+
+# event loop -> {token key: asyncio.Lock}
+_refresh_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def maybe_await(value):
+    if inspect.isawaitable(value):
+        value = await value
+    return value
+
+
+async def single_flight_refresh(session, token_key, get_token, fetch, lease_ttl=REFRESH_LEASE_TTL, min_ttl=60):
+    """asyncio version of ``wechatpy.client.base.single_flight_refresh``
+
+    ``get_token`` and ``fetch`` are coroutine functions, ``session`` may be either
+    a ``SessionStorage`` or an ``AsyncSessionStorage``.
+    """
+    locks = _refresh_locks.setdefault(asyncio.get_running_loop(), {})
+    lock = locks.get(token_key)
+    if lock is None:
+        lock = locks[token_key] = asyncio.Lock()
+
+    async with lock:
+        token = await get_token(min_ttl)
+        if token:
+            return token
+
+        lease_key = f"{token_key}_refresh_lock"
+        deadline = time.time() + lease_ttl
+        while time.time() < deadline:
+            if await maybe_await(session.add(lease_key, int(time.time()), lease_ttl)):
+                try:
+                    # the previous lease holder may have refreshed it after the check above
+                    token = await get_token(min_ttl)
+                    if token:
+                        return token
+                    await fetch()
+                finally:
+                    await maybe_await(session.delete(lease_key))
+                return await maybe_await(session.get(token_key))
+            # another process is refreshing, an unexpired token is still usable meanwhile
+            token = await get_token(0)
+            if token:
+                return token
+            await asyncio.sleep(REFRESH_POLL_INTERVAL)
+
+        logger.warning("Wait for %s refresh lease timed out, refresh it anyway", token_key)
+        await fetch()
+        return await maybe_await(session.get(token_key))
+
+
+async def store_token(session, token_key, expires_at_key, token, expires_in=None):
+    """asyncio version of ``wechatpy.client.base.store_token``"""
+    await maybe_await(session.set_many(token_values(token_key, expires_at_key, token, expires_in), expires_in))
+
+
+async def load_token(session, token_key, expires_at_key):
+    """asyncio version of ``wechatpy.client.base.load_token``"""
+    record = await maybe_await(session.get(token_record_key(token_key)))
+    if record:
+        return record["token"], record["expires_at"]
+    values = await maybe_await(session.get_many([token_key, expires_at_key]))
+    if not values.get(token_key):
+        return None, None
+    return values[token_key], values.get(expires_at_key)
+
+
+def create_http_client():
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError("asyncio clients require httpx, install it with `pip install wechatpy[async]`")
+    return httpx.AsyncClient()
+
+
+class AsyncClientMixin:
+    """asyncio 客户端公共实现
+
+    ``session`` 既可以是同步的 ``SessionStorage``，也可以是 ``AsyncSessionStorage``。
+    """
+
+    def _init_async(self, http_client=None):
+        self._http = http_client or create_http_client()
+        self._pending_session_data = []
+
+    def _preset_session(self, mapping, ttl=None):
+        """Store values passed to the constructor, deferred for async storages"""
+        if isinstance(self.session, AsyncSessionStorage):
+            self._pending_session_data.append((mapping, ttl))
+        else:
+            self.session.set_many(mapping, ttl)
+
+    async def _flush_session(self):
+        while self._pending_session_data:
+            mapping, ttl = self._pending_session_data.pop(0)
+            await self.session.set_many(mapping, ttl)
+
+    async def _session_get(self, key, default=None):
+        return await maybe_await(self.session.get(key, default))
+
+    async def _session_set(self, key, value, ttl=None):
+        return await maybe_await(self.session.set(key, value, ttl))
+
+    async def _session_delete(self, key):
+        return await maybe_await(self.session.delete(key))
+
+    async def _session_get_many(self, keys):
+        return await maybe_await(self.session.get_many(keys))
+
+    async def _session_set_many(self, mapping, ttl=None):
+        return await maybe_await(self.session.set_many(mapping, ttl))
+
+    async def _refresh_access_token(self, invalid_token=None, min_ttl=60):
+        """Fetch a new access token unless another task or process already did"""
+
+        async def get_token(min_ttl):
+            access_token = await self._get_cached_access_token(min_ttl)
+            if access_token != invalid_token:
+                return access_token
+            return None
+
+        return await single_flight_refresh(
+            self.session,
+            self.access_token_key,
+            get_token,
+            self.fetch_access_token,
+            min_ttl=min_ttl,
+        )
+
+    async def _get_expires_at(self):
+        return self.expires_at
+
+    async def get_access_token(self):
+        """获取 access token，即将过期时会自动刷新"""
+        await self._flush_session()
+        return await self._get_cached_access_token() or await self._refresh_access_token()
+
+    def _send(self, method, url, **kwargs):
+        # requests style ``data=b"..."`` is ``content=b"..."`` in httpx
+        if isinstance(kwargs.get("data"), (bytes, str)):
+            kwargs["content"] = kwargs.pop("data")
+        return self._http.request(method, url, **kwargs)
+
+    def _check_response(self, res, exception_class=WeChatClientException):
+        if res.is_error:
+            raise exception_class(
+                errcode=None,
+                errmsg=None,
+                client=self,
+                request=res.request,
+                response=res,
+            )
+
+    async def close(self):
+        """关闭底层的 HTTP 连接池"""
+        await self._http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+class AsyncBaseWeChatClient(AsyncClientMixin):
+    """``BaseWeChatClient`` 子类的 asyncio 实现"""
+
+    async def _request(self, method, url_or_endpoint, **kwargs):
+        if not url_or_endpoint.startswith(("http://", "https://")):
+            api_base_url = kwargs.pop("api_base_url", self.API_BASE_URL)
+            url = f"{api_base_url}{url_or_endpoint}"
+        else:
+            url = url_or_endpoint
+
+        if "params" not in kwargs:
+            kwargs["params"] = {}
+        if isinstance(kwargs["params"], dict) and "access_token" not in kwargs["params"]:
+            kwargs["params"]["access_token"] = await self.get_access_token()
+        if isinstance(kwargs.get("data", ""), dict):
+            body = json.dumps(kwargs["data"], ensure_ascii=False)
+            body = body.encode("utf-8")
+            kwargs["data"] = body
+
+        kwargs["timeout"] = kwargs.get("timeout", self.timeout)
+        result_processor = kwargs.pop("result_processor", None)
+        res = await self._send(method, url, **kwargs)
+        self._check_response(res)
+        return await maybe_await(self._handle_result(res, method, url, result_processor, **kwargs))
+
+    async def _retry_request(self, method, url, result_processor=None, **kwargs):
+        kwargs["params"]["access_token"] = await self._refresh_access_token(
+            invalid_token=kwargs["params"].get("access_token")
+        )
+        return await self._request(method=method, url_or_endpoint=url, result_processor=result_processor, **kwargs)
+
+    async def _fetch_access_token(self, url, params):
+        """The real fetch access token"""
+        logger.info("Fetching access token")
+        res = await self._http.get(url, params=params)
+        self._check_response(res)
+        result = res.json()
+        if "errcode" in result and result["errcode"] != 0:
+            raise WeChatClientException(
+                result["errcode"],
+                result["errmsg"],
+                client=self,
+                request=res.request,
+                response=res,
+            )
+
+        expires_in = 7200
+        if "expires_in" in result:
+            expires_in = result["expires_in"]
+        await self._store_access_token(result["access_token"], expires_in)
+        return result
+
+    async def _load_access_token(self):
+        return await load_token(self.session, self.access_token_key, self.access_token_expires_at_key)
+
+    async def _store_access_token(self, access_token, expires_in=None):
+        await store_token(
+            self.session, self.access_token_key, self.access_token_expires_at_key, access_token, expires_in
+        )
+
+    def _preset_access_token(self, access_token, expires_in=None):
+        self._preset_session(
+            token_values(self.access_token_key, self.access_token_expires_at_key, access_token, expires_in),
+            expires_in,
+        )
+
+    @property
+    def expires_at(self):
+        """当前 access token 的过期时间戳"""
+        if isinstance(self.session, AsyncSessionStorage):
+            raise TypeError("Use `await client._get_expires_at()` with an AsyncSessionStorage")
+        return base.load_token(self.session, self.access_token_key, self.access_token_expires_at_key)[1]
+
+    async def _get_expires_at(self):
+        return (await self._load_access_token())[1]
+
+    async def _get_cached_access_token(self, min_ttl=60):
+        access_token, expires_at = await self._load_access_token()
+        if access_token:
+            if not expires_at:
+                # user provided access_token, just return it
+                return access_token
+
+            timestamp = time.time()
+            if expires_at - timestamp > min_ttl:
+                return access_token
+        return None
+
+    @property
+    def access_token(self):
+        """当前缓存的 access token，不会触发刷新，请优先使用 ``await client.get_access_token()``"""
+        if isinstance(self.session, AsyncSessionStorage):
+            raise TypeError("Use `await client.get_access_token()` with an AsyncSessionStorage")
+        return base.load_token(self.session, self.access_token_key, self.access_token_expires_at_key)[0]
+
+
+class AsyncWeChatJSAPI(WeChatJSAPI):
+    async def _fetch_ticket(self, type, ticket_key):
+        ticket_response = await self.get_ticket(type)
+        ticket = ticket_response["ticket"]
+        expires_at = int(time.time()) + int(ticket_response["expires_in"])
+        await self._client._session_set_many({ticket_key: ticket, f"{ticket_key}_expires_at": expires_at})
+        return ticket
+
+    async def _get_cached_ticket(self, type, ticket_key):
+        values = await self._client._session_get_many([ticket_key, f"{ticket_key}_expires_at"])
+        ticket = values.get(ticket_key)
+        expires_at = values.get(f"{ticket_key}_expires_at", 0)
+        if not ticket or int(expires_at) < int(time.time()):
+            ticket = await self._fetch_ticket(type, ticket_key)
+        return ticket
+
+    async def fetch_jsapi_ticket(self):
+        return await self._fetch_ticket("jsapi", f"{self.appid}_jsapi_ticket")
+
+    async def get_jsapi_ticket(self):
+        return await self._get_cached_ticket("jsapi", f"{self.appid}_jsapi_ticket")
+
+    async def fetch_jsapi_card_ticket(self):
+        return await self._fetch_ticket("wx_card", f"{self.appid}_jsapi_card_ticket")
+
+    async def get_jsapi_card_ticket(self):
+        return await self._get_cached_ticket("wx_card", f"{self.appid}_jsapi_card_ticket")
+
+    async def get_jsapi_add_card_params(self, card_id, *args, card_ticket="", **kwargs):
+        card_ticket = card_ticket or await self.get_jsapi_card_ticket()
+        return super().get_jsapi_add_card_params(card_id, *args, card_ticket=card_ticket, **kwargs)
+
+
+class AsyncWeChatClient(AsyncBaseWeChatClient, WeChatClient):
+    """
+    asyncio 版本的微信 API 操作类，API 方法均需 ``await`` 调用
+    """
+
+    jsapi = AsyncWeChatJSAPI()
+
+    def __init__(
+        self,
+        appid,
+        secret,
+        access_token=None,
+        session=None,
+        timeout=None,
+        auto_retry=True,
+        http_client=None,
+    ):
+        super().__init__(appid, secret, None, session, timeout, auto_retry)
+        self._init_async(http_client)
+        if access_token:
+            self._preset_access_token(access_token)
+
+
+class AsyncWeChatComponentClient(AsyncBaseWeChatClient, WeChatComponentClient):
+    """
+    asyncio 版本的开放平台代公众号调用客户端，``component`` 需为 ``AsyncWeChatComponent``
+    """
+
+    jsapi = AsyncWeChatJSAPI()
+
+    def __init__(
+        self,
+        appid,
+        component,
+        access_token=None,
+        refresh_token=None,
+        session=None,
+        timeout=None,
+        http_client=None,
+    ):
+        super().__init__(appid, component, timeout=timeout)
+        self.session = session or self.session
+        self._init_async(http_client)
+        if access_token:
+            self._preset_access_token(access_token, 7200)
+        if refresh_token:
+            self._preset_session({self.refresh_token_key: refresh_token})
+
+    async def _get_cached_access_token(self, min_ttl=60):
+        access_token, expires_at = await self._load_access_token()
+        if access_token and expires_at and expires_at - time.time() <= min_ttl:
+            return None
+        # without a known expiry we rely on the session ttl
+        return access_token
+
+    async def fetch_access_token(self):
+        expires_in = 7200
+        refresh_token = await self._session_get(self.refresh_token_key)
+        result = await self.component.refresh_authorizer_token(self.appid, refresh_token)
+        if "expires_in" in result:
+            expires_in = result["expires_in"]
+        await self._store_access_token(result["authorizer_access_token"], expires_in)
+        return result
+
+
+class AsyncWeChatComponent(AsyncClientMixin, WeChatComponent):
+    """
+    asyncio 版本的微信开放平台第三方平台客户端
+    """
+
+    def __init__(
+        self,
+        component_appid,
+        component_appsecret,
+        component_token,
+        encoding_aes_key,
+        session=None,
+        auto_retry=True,
+        http_client=None,
+    ):
+        super().__init__(component_appid, component_appsecret, component_token, encoding_aes_key, session, auto_retry)
+        self._init_async(http_client)
+
+    async def _request(self, method, url_or_endpoint, **kwargs):
+        if not url_or_endpoint.startswith(("http://", "https://")):
+            api_base_url = kwargs.pop("api_base_url", self.API_BASE_URL)
+            url = f"{api_base_url}{url_or_endpoint}"
+        else:
+            url = url_or_endpoint
+
+        if "params" not in kwargs:
+            kwargs["params"] = {}
+        if isinstance(kwargs["params"], dict) and "component_access_token" not in kwargs["params"]:
+            kwargs["params"]["component_access_token"] = await self.get_access_token()
+        if isinstance(kwargs.get("data"), dict):
+            kwargs["data"] = json.dumps(kwargs["data"])
+
+        res = await self._send(method, url, **kwargs)
+        self._check_response(res)
+        return await maybe_await(self._handle_result(res, method, url, **kwargs))
+
+    async def _retry_request(self, method, url, **kwargs):
+        kwargs["params"]["component_access_token"] = await self._refresh_access_token(
+            invalid_token=kwargs["params"].get("component_access_token")
+        )
+        return await self._request(method=method, url_or_endpoint=url, **kwargs)
+
+    async def fetch_access_token(self):
+        url = f"{self.API_BASE_URL}{'/component/api_component_token'}"
+        verify_ticket = await self._session_get(f"{self.component_appid}_component_verify_ticket")
+        return await self._fetch_access_token(
+            url=url,
+            data=json.dumps(
+                {
+                    "component_appid": self.component_appid,
+                    "component_appsecret": self.component_appsecret,
+                    "component_verify_ticket": verify_ticket,
+                }
+            ),
+        )
+
+    async def _fetch_access_token(self, url, data):
+        """The real fetch access token"""
+        logger.info("Fetching component access token")
+        res = await self._send("post", url, data=data)
+        self._check_response(res)
+        result = res.json()
+        if "errcode" in result and result["errcode"] != 0:
+            raise WeChatClientException(
+                result["errcode"],
+                result["errmsg"],
+                client=self,
+                request=res.request,
+                response=res,
+            )
+
+        expires_in = 7200
+        if "expires_in" in result:
+            expires_in = result["expires_in"]
+        await self._session_set(self.access_token_key, result["component_access_token"], expires_in)
+        self.expires_at = int(time.time()) + expires_in
+        return result
+
+    async def _get_cached_access_token(self, min_ttl=60):
+        access_token = await self._session_get(self.access_token_key)
+        if access_token:
+            if not self.expires_at:
+                # user provided access_token, just return it
+                return access_token
+
+            timestamp = time.time()
+            if self.expires_at - timestamp > min_ttl:
+                return access_token
+        return None
+
+    @property
+    def access_token(self):
+        """当前缓存的 component_access_token，不会触发刷新"""
+        if isinstance(self.session, AsyncSessionStorage):
+            raise TypeError("Use `await component.get_access_token()` with an AsyncSessionStorage")
+        return self.session.get(self.access_token_key)
+
+    async def get_pre_auth_url(self, redirect_uri):
+        pre_auth_code = (await self.create_preauthcode())["pre_auth_code"]
+        return self._build_pre_auth_url(redirect_uri, pre_auth_code)
+
+    async def get_pre_auth_url_m(self, redirect_uri):
+        pre_auth_code = (await self.create_preauthcode())["pre_auth_code"]
+        return self._build_pre_auth_url_m(redirect_uri, pre_auth_code)
+
+    async def query_auth(self, authorization_code):
+        """
+        使用授权码换取公众号的授权信息,同时储存token信息
+
+        :params authorization_code: 授权code,会在授权成功时返回给第三方平台，详见第三方平台授权流程说明
+        """
+        result = await self._query_auth(authorization_code)
+
+        assert (
+            result is not None and "authorization_info" in result and "authorizer_appid" in result["authorization_info"]
+        )
+
+        authorization_info = result["authorization_info"]
+        authorizer_appid = authorization_info["authorizer_appid"]
+        if authorization_info.get("authorizer_access_token"):
+            expires_in = authorization_info.get("expires_in", 7200)
+            access_token_key = f"{authorizer_appid}_access_token"
+            await store_token(
+                self.session,
+                access_token_key,
+                f"{access_token_key}_expires_at",
+                authorization_info["authorizer_access_token"],
+                expires_in,
+            )
+        if authorization_info.get("authorizer_refresh_token"):
+            await self._session_set(f"{authorizer_appid}_refresh_token", authorization_info["authorizer_refresh_token"])
+        return result
+
+    async def get_client_by_appid(self, authorizer_appid):
+        """
+        通过 authorizer_appid 获取 AsyncWeChatComponentClient 对象
+
+        :params authorizer_appid: 授权公众号appid
+        """
+        access_token_key = f"{authorizer_appid}_access_token"
+        access_token, _ = await load_token(self.session, access_token_key, f"{access_token_key}_expires_at")
+        refresh_token = await self._session_get(f"{authorizer_appid}_refresh_token")
+        assert refresh_token
+
+        if not access_token:
+            ret = await self.refresh_authorizer_token(authorizer_appid, refresh_token)
+            expires_in = ret.get("expires_in", 7200)
+            await store_token(
+                self.session,
+                access_token_key,
+                f"{access_token_key}_expires_at",
+                ret["authorizer_access_token"],
+                expires_in,
+            )
+
+        return AsyncWeChatComponentClient(authorizer_appid, self, session=self.session, http_client=self._http)
+
+    async def parse_message(self, msg, msg_signature, timestamp, nonce):
+        """
+        处理 wechat server 推送消息
+
+        :params msg: 加密内容
+        :params msg_signature: 消息签名
+        :params timestamp: 时间戳
+        :params nonce: 随机数
+        """
+        msg = self._decrypt_component_message(msg, msg_signature, timestamp, nonce)
+        if msg.type == "component_verify_ticket":
+            await self._session_set(f"{self.component_appid}_{msg.type}", msg.verify_ticket)
+        elif msg.type in ("authorized", "updateauthorized"):
+            msg.query_auth_result = await self.query_auth(msg.authorization_code)
+        return msg
+
+
+class AsyncWeChatOAuth(AsyncClientMixin, WeChatOAuth):
+    """asyncio 版本的微信公众平台 OAuth 网页授权"""
+
+    def __init__(self, app_id, secret, redirect_uri, scope="snsapi_base", state="", http_client=None):
+        super().__init__(app_id, secret, redirect_uri, scope, state)
+        self._init_async(http_client)
+
+    async def _request(self, method, url_or_endpoint, **kwargs):
+        if not url_or_endpoint.startswith(("http://", "https://")):
+            url = f"{self.API_BASE_URL}{url_or_endpoint}"
+        else:
+            url = url_or_endpoint
+
+        if isinstance(kwargs.get("data", ""), dict):
+            body = json.dumps(kwargs["data"], ensure_ascii=False)
+            body = body.encode("utf-8")
+            kwargs["data"] = body
+
+        res = await self._send(method, url, **kwargs)
+        self._check_response(res, WeChatOAuthException)
+        result = json.loads(res.content.decode("utf-8", "ignore"), strict=False)
+
+        if "errcode" in result and result["errcode"] != 0:
+            errcode = result["errcode"]
+            errmsg = result["errmsg"]
+            raise WeChatOAuthException(errcode, errmsg, client=self, request=res.request, response=res)
+
+        return result
+
+    async def fetch_access_token(self, code):
+        """获取 access_token
+
+        :param code: 授权完成跳转回来后 URL 中的 code 参数
+        :return: JSON 数据包
+        """
+        res = await self._get(
+            "sns/oauth2/access_token",
+            params={
+                "appid": self.app_id,
+                "secret": self.secret,
+                "code": code,
+                "grant_type": "authorization_code",
+            },
+        )
+        self._update_token(res)
+        return res
+
+    async def refresh_access_token(self, refresh_token):
+        """刷新 access token
+
+        :param refresh_token: OAuth2 refresh token
+        :return: JSON 数据包
+        """
+        res = await self._get(
+            "sns/oauth2/refresh_token",
+            params={
+                "appid": self.app_id,
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token,
+            },
+        )
+        self._update_token(res)
+        return res
+
+    async def check_access_token(self, openid=None, access_token=None):
+        """检查 access_token 有效性
+
+        :param openid: 可选，微信 openid，默认获取当前授权用户信息
+        :param access_token: 可选，access_token，默认使用当前授权用户的 access_token
+        :return: 有效返回 True，否则 False
+        """
+        openid = openid or self.open_id
+        access_token = access_token or self.access_token
+        res = await self._get("sns/auth", params={"access_token": access_token, "openid": openid})
+        return res["errcode"] == 0
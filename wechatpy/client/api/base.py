@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
+from wechatpy.utils import LazyAPIMixin
 
 
-class BaseWeChatAPI:
+class BaseWeChatAPI(LazyAPIMixin):
     """WeChat API base class"""
 
     def __init__(self, client=None):
@@ -536,15 +536,19 @@ class WeChatCard(BaseWeChatAPI):
         """
         from wechatpy.utils import WeChatSigner
 
-        code = self.decrypt_code(encrypt_code)
+        def build_url(result):
+            signer = WeChatSigner()
+            signer.add_data(self.secret)
+            signer.add_data(result["code"])
+            signer.add_data(card_id)
+            signature = signer.signature
+            return f"{url}?encrypt_code={encrypt_code}&card_id={card_id}&signature={signature}"
 
-        signer = WeChatSigner()
-        signer.add_data(self.secret)
-        signer.add_data(code)
-        signer.add_data(card_id)
-        signature = signer.signature
-
-        return f"{url}?encrypt_code={encrypt_code}&card_id={card_id}&signature={signature}"
+        return self._post(
+            "card/code/decrypt",
+            data={"encrypt_code": encrypt_code},
+            result_processor=build_url,
+        )
 
     def deposit_code(self, card_id, codes):
         """
@@ -35,8 +35,9 @@ class WeChatDataCube(BaseWeChatAPI):
                 "begin_date": self._to_date_str(begin_date),
                 "end_date": self._to_date_str(end_date),
             },
+            result_processor=itemgetter("list"),
         )
-        return res["list"]
+        return res
 
     def get_user_cumulate(self, begin_date, end_date):
         """
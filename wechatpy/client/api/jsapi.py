@@ -28,6 +28,19 @@ class WeChatJSAPI(BaseWeChatAPI):
         """
         return self._get("ticket/getticket", params={"type": type})
 
+    def fetch_jsapi_ticket(self):
+        """
+        获取微信 JS-SDK ticket 并存入 session
+
+        :return: ticket
+        """
+        jsapi_ticket_response = self.get_ticket("jsapi")
+        ticket = jsapi_ticket_response["ticket"]
+        expires_at = int(time.time()) + int(jsapi_ticket_response["expires_in"])
+        ticket_key = f"{self.appid}_jsapi_ticket"
+        self.session.set_many({ticket_key: ticket, f"{ticket_key}_expires_at": expires_at})
+        return ticket
+
     def get_jsapi_ticket(self):
         """
         获取微信 JS-SDK ticket
@@ -37,15 +50,11 @@ class WeChatJSAPI(BaseWeChatAPI):
         :return: ticket
         """
         ticket_key = f"{self.appid}_jsapi_ticket"
-        expires_at_key = f"{self.appid}_jsapi_ticket_expires_at"
-        ticket = self.session.get(ticket_key)
-        expires_at = self.session.get(expires_at_key) or 0
+        values = self.session.get_many([ticket_key, f"{ticket_key}_expires_at"])
+        ticket = values.get(ticket_key)
+        expires_at = values.get(f"{ticket_key}_expires_at", 0)
         if not ticket or expires_at < int(time.time()):
-            jsapi_ticket_response = self.get_ticket("jsapi")
-            ticket = jsapi_ticket_response["ticket"]
-            expires_at = int(time.time()) + int(jsapi_ticket_response["expires_in"])
-            self.session.set(ticket_key, ticket)
-            self.session.set(expires_at_key, expires_at)
+            ticket = self.fetch_jsapi_ticket()
         return ticket
 
     def get_jsapi_signature(self, noncestr, ticket, timestamp, url):
@@ -76,17 +85,25 @@ class WeChatJSAPI(BaseWeChatAPI):
 
         :return: ticket
         """
-        jsapi_card_ticket_key = f"{self.appid}_jsapi_card_ticket"
-        jsapi_card_ticket_expire_at_key = f"{self.appid}_jsapi_card_ticket_expires_at"
-
-        ticket = self.session.get(jsapi_card_ticket_key)
-        expires_at = self.session.get(jsapi_card_ticket_expire_at_key, 0)
+        ticket_key = f"{self.appid}_jsapi_card_ticket"
+        values = self.session.get_many([ticket_key, f"{ticket_key}_expires_at"])
+        ticket = values.get(ticket_key)
+        expires_at = values.get(f"{ticket_key}_expires_at", 0)
         if not ticket or int(expires_at) < int(time.time()):
-            ticket_response = self.get_ticket("wx_card")
-            ticket = ticket_response["ticket"]
-            expires_at = int(time.time()) + int(ticket_response["expires_in"])
-            self.session.set(jsapi_card_ticket_key, ticket)
-            self.session.set(jsapi_card_ticket_expire_at_key, expires_at)
+            ticket = self.fetch_jsapi_card_ticket()
+        return ticket
+
+    def fetch_jsapi_card_ticket(self):
+        """
+        获取卡券 api_ticket 并存入 session
+
+        :return: ticket
+        """
+        ticket_response = self.get_ticket("wx_card")
+        ticket = ticket_response["ticket"]
+        expires_at = int(time.time()) + int(ticket_response["expires_in"])
+        ticket_key = f"{self.appid}_jsapi_card_ticket"
+        self.session.set_many({ticket_key: ticket, f"{ticket_key}_expires_at": expires_at})
         return ticket
 
     def get_jsapi_add_card_params(
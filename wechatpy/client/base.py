@@ -1,36 +1,118 @@
 # -*- coding: utf-8 -*-
 import json
 import time
-import inspect
 import logging
+import threading
+from typing import Dict
 
 import requests
 
 from wechatpy.constants import WeChatErrorCode
 from wechatpy.session.memorystorage import MemoryStorage
 from wechatpy.exceptions import WeChatClientException, APILimitedException
-from wechatpy.client.api.base import BaseWeChatAPI
 
 
 logger = logging.getLogger(__name__)
 
 
-def _is_api_endpoint(obj):
-    return isinstance(obj, BaseWeChatAPI)
+REFRESH_LEASE_TTL = 10
+REFRESH_POLL_INTERVAL = 0.05
+
+_refresh_locks: Dict[str, threading.Lock] = {}
+_refresh_locks_lock = threading.Lock()
+
+
+def _get_refresh_lock(key):
+    with _refresh_locks_lock:
+        lock = _refresh_locks.get(key)
+        if lock is None:
+            lock = _refresh_locks[key] = threading.Lock()
+        return lock
+
+
+def single_flight_refresh(session, token_key, get_token, fetch, lease_ttl=REFRESH_LEASE_TTL, min_ttl=60):
+    """Refresh a credential at most once across threads and processes
+
+    Threads of one process serialize on a lock per ``token_key``, processes elect a
+    refresher by storing ``<token_key>_refresh_lock`` with ``session.add``. Everybody
+    else polls ``get_token`` until the new credential shows up in ``session``.
+
+    :param session: ``SessionStorage`` shared by all the processes
+    :param token_key: session key of the credential
+    :param get_token: callable ``get_token(min_ttl)`` returning the cached credential
+                      if it is valid for at least ``min_ttl`` seconds, otherwise ``None``
+    :param fetch: callable doing the real refresh and storing the result in ``session``
+    :param lease_ttl: seconds after which the lease of a crashed refresher expires
+    :param min_ttl: a cached credential valid for longer than this is not refreshed
+    """
+    with _get_refresh_lock(token_key):
+        token = get_token(min_ttl)
+        if token:
+            return token
+
+        lease_key = f"{token_key}_refresh_lock"
+        deadline = time.time() + lease_ttl
+        while time.time() < deadline:
+            if session.add(lease_key, int(time.time()), lease_ttl):
+                try:
+                    # the previous lease holder may have refreshed it after the check above
+                    token = get_token(min_ttl)
+                    if token:
+                        return token
+                    fetch()
+                finally:
+                    session.delete(lease_key)
+                return session.get(token_key)
+            # another process is refreshing, an unexpired token is still usable meanwhile
+            token = get_token(0)
+            if token:
+                return token
+            time.sleep(REFRESH_POLL_INTERVAL)
+
+        logger.warning("Wait for %s refresh lease timed out, refresh it anyway", token_key)
+        fetch()
+        return session.get(token_key)
+
+
+def token_record_key(token_key):
+    return f"{token_key}_record"
+
+
+def token_values(token_key, expires_at_key, token, expires_in=None):
+    """Session values which store a token, all of them expire in ``expires_in`` seconds
+
+    The token and its expiry are kept in one record so that reading them costs
+    a single storage round trip, the separate keys are still written for older
+    releases sharing the same session.
+    """
+    expires_at = int(time.time()) + expires_in if expires_in else None
+    values = {
+        token_record_key(token_key): {"token": token, "expires_at": expires_at},
+        token_key: token,
+    }
+    if expires_at:
+        values[expires_at_key] = expires_at
+    return values
+
+
+def store_token(session, token_key, expires_at_key, token, expires_in=None):
+    session.set_many(token_values(token_key, expires_at_key, token, expires_in), expires_in)
+
+
+def load_token(session, token_key, expires_at_key):
+    """Return ``(token, expires_at)`` stored by ``store_token`` or by older releases"""
+    record = session.get(token_record_key(token_key))
+    if record:
+        return record["token"], record["expires_at"]
+    values = session.get_many([token_key, expires_at_key])
+    if not values.get(token_key):
+        return None, None
+    return values[token_key], values.get(expires_at_key)
 
 
 class BaseWeChatClient:
     API_BASE_URL = ""
 
-    def __new__(cls, *args, **kwargs):
-        self = super().__new__(cls)
-        api_endpoints = inspect.getmembers(self, _is_api_endpoint)
-        for name, api in api_endpoints:
-            api_cls = type(api)
-            api = api_cls(self)
-            setattr(self, name, api)
-        return self
-
     def __init__(self, appid, access_token=None, session=None, timeout=None, auto_retry=True):
         self._http = requests.Session()
         self.appid = appid
@@ -39,7 +121,7 @@ class BaseWeChatClient:
         self.auto_retry = auto_retry
 
         if access_token:
-            self.session.set(self.access_token_key, access_token)
+            self._store_access_token(access_token)
 
     @property
     def access_token_key(self):
@@ -51,11 +133,19 @@ class BaseWeChatClient:
 
     @property
     def expires_at(self):
-        return self.session.get(self.access_token_expires_at_key, None)
+        return self._load_access_token()[1]
 
     @expires_at.setter
     def expires_at(self, value):
         self.session.set(self.access_token_expires_at_key, value)
+        # fall back to the separate keys until the next token is stored
+        self.session.delete(token_record_key(self.access_token_key))
+
+    def _load_access_token(self):
+        return load_token(self.session, self.access_token_key, self.access_token_expires_at_key)
+
+    def _store_access_token(self, access_token, expires_in=None):
+        store_token(self.session, self.access_token_key, self.access_token_expires_at_key, access_token, expires_in)
 
     def _request(self, method, url_or_endpoint, **kwargs):
         if not url_or_endpoint.startswith(("http://", "https://")):
@@ -123,10 +213,7 @@ class BaseWeChatClient:
                 WeChatErrorCode.EXPIRED_ACCESS_TOKEN.value,
             ):
                 logger.info("Access token expired, fetch a new one and retry request")
-                self.fetch_access_token()
-                access_token = self.session.get(self.access_token_key)
-                kwargs["params"]["access_token"] = access_token
-                return self._request(method=method, url_or_endpoint=url, result_processor=result_processor, **kwargs)
+                return self._retry_request(method, url, result_processor, **kwargs)
             elif errcode == WeChatErrorCode.OUT_OF_API_FREQ_LIMIT.value:
                 # api freq out of limit
                 raise APILimitedException(errcode, errmsg, client=self, request=res.request, response=res)
@@ -135,6 +222,11 @@ class BaseWeChatClient:
 
         return result if not result_processor else result_processor(result)
 
+    def _retry_request(self, method, url, result_processor=None, **kwargs):
+        access_token = self._refresh_access_token(invalid_token=kwargs["params"].get("access_token"))
+        kwargs["params"]["access_token"] = access_token
+        return self._request(method=method, url_or_endpoint=url, result_processor=result_processor, **kwargs)
+
     def get(self, url, **kwargs):
         return self._request(method="get", url_or_endpoint=url, **kwargs)
 
@@ -168,25 +260,42 @@ class BaseWeChatClient:
         expires_in = 7200
         if "expires_in" in result:
             expires_in = result["expires_in"]
-        self.session.set(self.access_token_key, result["access_token"], expires_in)
-        self.expires_at = int(time.time()) + expires_in
+        self._store_access_token(result["access_token"], expires_in)
         return result
 
     def fetch_access_token(self):
         raise NotImplementedError()
 
-    @property
-    def access_token(self):
-        """WeChat access token"""
-        access_token = self.session.get(self.access_token_key)
+    def _get_cached_access_token(self, min_ttl=60):
+        access_token, expires_at = self._load_access_token()
         if access_token:
-            if not self.expires_at:
+            if not expires_at:
                 # user provided access_token, just return it
                 return access_token
 
             timestamp = time.time()
-            if self.expires_at - timestamp > 60:
+            if expires_at - timestamp > min_ttl:
                 return access_token
+        return None
 
-        self.fetch_access_token()
-        return self.session.get(self.access_token_key)
+    def _refresh_access_token(self, invalid_token=None, min_ttl=60):
+        """Fetch a new access token unless another thread or process already did"""
+
+        def get_token(min_ttl):
+            access_token = self._get_cached_access_token(min_ttl)
+            if access_token != invalid_token:
+                return access_token
+            return None
+
+        return single_flight_refresh(
+            self.session,
+            self.access_token_key,
+            get_token,
+            self.fetch_access_token,
+            min_ttl=min_ttl,
+        )
+
+    @property
+    def access_token(self):
+        """WeChat access token"""
+        return self._get_cached_access_token() or self._refresh_access_token()
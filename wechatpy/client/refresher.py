@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+"""
+    wechatpy.client.refresher
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    在后台提前刷新 access token、jsapi ticket 等凭证，避免业务请求同步等待凭证刷新::
+
+        refresher = TokenRefresher(refresh_ahead=600, jitter=120, max_workers=8)
+        for client in clients:
+            refresher.add(client, jsapi_ticket=True)
+        refresher.start()
+
+    多个进程同时运行刷新器时，借助 ``single_flight_refresh`` 的 session 租约，
+    每个凭证仍然只会被刷新一次。
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from wechatpy.client import aio
+from wechatpy.client.base import single_flight_refresh
+
+logger = logging.getLogger(__name__)
+
+
+class Credential:
+    """需要定期刷新的凭证
+
+    :param name: 凭证名称，通常为凭证在 session 中的 key
+    :param get_expires_at: 返回凭证过期时间戳的函数，未知时返回 ``None``
+    :param refresh: ``refresh(min_ttl)``，凭证剩余有效期不足 ``min_ttl`` 秒时刷新凭证
+    """
+
+    def __init__(self, name, get_expires_at, refresh):
+        self.name = name
+        self.get_expires_at = get_expires_at
+        self.refresh = refresh
+
+    def __repr__(self):
+        return f"Credential({self.name})"
+
+
+def access_token_credential(client):
+    """``BaseWeChatClient``/``WeChatComponent`` 的 access token"""
+    return Credential(
+        client.access_token_key,
+        lambda: client.expires_at,
+        lambda min_ttl: client._refresh_access_token(min_ttl=min_ttl),
+    )
+
+
+def async_access_token_credential(client):
+    """asyncio 客户端的 access token"""
+    return Credential(
+        client.access_token_key,
+        client._get_expires_at,
+        lambda min_ttl: client._refresh_access_token(min_ttl=min_ttl),
+    )
+
+
+def jsapi_ticket_credential(client):
+    """公众号或企业微信客户端的 JS-SDK ticket"""
+    ticket_key = f"{client.appid}_jsapi_ticket"
+    expires_at_key = f"{ticket_key}_expires_at"
+    session = client.session
+
+    def get_ticket(min_ttl):
+        values = session.get_many([ticket_key, expires_at_key])
+        ticket = values.get(ticket_key)
+        expires_at = values.get(expires_at_key)
+        if ticket and expires_at and expires_at - time.time() > min_ttl:
+            return ticket
+        return None
+
+    def refresh(min_ttl):
+        return single_flight_refresh(session, ticket_key, get_ticket, client.jsapi.fetch_jsapi_ticket, min_ttl=min_ttl)
+
+    return Credential(ticket_key, lambda: session.get(expires_at_key), refresh)
+
+
+def async_jsapi_ticket_credential(client):
+    """asyncio 客户端的 JS-SDK ticket"""
+    ticket_key = f"{client.appid}_jsapi_ticket"
+    expires_at_key = f"{ticket_key}_expires_at"
+
+    async def get_ticket(min_ttl):
+        values = await client._session_get_many([ticket_key, expires_at_key])
+        ticket = values.get(ticket_key)
+        expires_at = values.get(expires_at_key)
+        if ticket and expires_at and expires_at - time.time() > min_ttl:
+            return ticket
+        return None
+
+    async def refresh(min_ttl):
+        return await aio.single_flight_refresh(
+            client.session,
+            ticket_key,
+            get_ticket,
+            client.jsapi.fetch_jsapi_ticket,
+            min_ttl=min_ttl,
+        )
+
+    return Credential(ticket_key, lambda: client._session_get(expires_at_key), refresh)
+
+
+class BaseTokenRefresher:
+    """凭证刷新调度
+
+    :param refresh_ahead: 在凭证过期前多少秒开始刷新
+    :param jitter: 在 ``refresh_ahead`` 基础上随机提前的最大秒数，避免大量凭证同时刷新
+    :param retry_interval: 刷新失败后的重试间隔（秒）
+    """
+
+    def __init__(self, refresh_ahead=600, jitter=120, retry_interval=30):
+        self.refresh_ahead = refresh_ahead
+        self.jitter = jitter
+        self.retry_interval = retry_interval
+        self._credentials = {}
+        # client -> {name: credential} registered for it by ``add``
+        self._clients = weakref.WeakKeyDictionary()
+        # name -> credentials of every client sharing that name, the last one is the one refreshed
+        self._holders = {}
+        # heap of (due, seq, name), entries whose seq differs from _scheduled[name] are stale
+        self._queue = []
+        self._scheduled = {}
+        self._counter = itertools.count()
+
+    @property
+    def min_ttl(self):
+        return self.refresh_ahead + self.jitter
+
+    def _schedule(self, name, due):
+        seq = next(self._counter)
+        self._scheduled[name] = seq
+        heapq.heappush(self._queue, (due, seq, name))
+
+    def _next_due(self, expires_at):
+        now = time.time()
+        if not expires_at:
+            return now + self.refresh_ahead
+        due = expires_at - self.refresh_ahead - random.uniform(0, self.jitter)
+        return max(due, now + self.retry_interval)
+
+    def _pop_due(self):
+        """Return ``(credential, None)`` when one is due, otherwise ``(None, seconds to wait)``"""
+        while self._queue:
+            due, seq, name = self._queue[0]
+            if self._scheduled.get(name) != seq:
+                heapq.heappop(self._queue)
+                continue
+            wait = due - time.time()
+            if wait > 0:
+                return None, wait
+            heapq.heappop(self._queue)
+            del self._scheduled[name]
+            return self._credentials[name], None
+        return None, None
+
+    def _add_credential(self, credential):
+        self._credentials[credential.name] = credential
+        # the first refresh is a cheap no-op for credentials which are still fresh
+        self._schedule(credential.name, time.time())
+
+    def _remove_credential(self, name):
+        self._credentials.pop(name, None)
+        self._scheduled.pop(name, None)
+
+    def _add_client(self, client, credentials):
+        registered = self._clients.setdefault(client, {})
+        for credential in credentials:
+            holders = self._holders.setdefault(credential.name, [])
+            previous = registered.get(credential.name)
+            if previous is not None:
+                holders.remove(previous)
+            registered[credential.name] = credential
+            holders.append(credential)
+            self.add_credential(credential)
+
+    def _remove_client(self, client):
+        for name, credential in self._clients.pop(client, {}).items():
+            holders = self._holders[name]
+            active = holders[-1] is credential
+            holders.remove(credential)
+            if not holders:
+                # no other client shares it, e.g. the jsapi ticket of another agent of the same corp
+                del self._holders[name]
+                self.remove_credential(name)
+            elif active and name in self._credentials:
+                self._credentials[name] = holders[-1]
+
+    def _reschedule(self, credential, expires_at=None, failed=False):
+        if credential.name not in self._credentials:
+            return
+        if failed:
+            due = time.time() + self.retry_interval
+        else:
+            due = self._next_due(expires_at)
+        self._schedule(credential.name, due)
+
+
+class TokenRefresher(BaseTokenRefresher):
+    """在后台线程中提前刷新凭证
+
+    :param max_workers: 同时进行刷新的最大线程数
+    """
+
+    def __init__(self, refresh_ahead=600, jitter=120, retry_interval=30, max_workers=4):
+        super().__init__(refresh_ahead, jitter, retry_interval)
+        self.max_workers = max_workers
+        self._cond = threading.Condition()
+        self._thread = None
+        self._executor = None
+        self._stopped = False
+
+    def add(self, client, jsapi_ticket=False):
+        """添加需要刷新凭证的客户端
+
+        :param client: ``WeChatClient``、企业微信 ``WeChatClient``、``WeChatComponentClient`` 或 ``WeChatComponent``
+        :param jsapi_ticket: 是否同时刷新 JS-SDK ticket
+        """
+        credentials = [access_token_credential(client)]
+        if jsapi_ticket:
+            credentials.append(jsapi_ticket_credential(client))
+        with self._cond:
+            self._add_client(client, credentials)
+
+    def remove(self, client):
+        """停止刷新 ``add`` 添加的客户端凭证，其他客户端共用的凭证继续刷新"""
+        with self._cond:
+            self._remove_client(client)
+
+    def add_credential(self, credential):
+        with self._cond:
+            self._add_credential(credential)
+            self._cond.notify()
+
+    def remove_credential(self, name):
+        with self._cond:
+            self._remove_credential(name)
+
+    def start(self):
+        """启动后台刷新线程"""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="wechatpy-refresher")
+            self._thread = threading.Thread(target=self._run, name="wechatpy-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait=True):
+        """停止后台刷新线程"""
+        with self._cond:
+            if self._thread is None:
+                return
+            self._stopped = True
+            self._cond.notify()
+            thread, self._thread = self._thread, None
+        if wait:
+            thread.join()
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    credential, wait = self._pop_due()
+                    if credential is not None:
+                        break
+                    self._cond.wait(wait)
+                if self._stopped:
+                    return
+            self._executor.submit(self._refresh, credential)
+
+    def _refresh(self, credential):
+        try:
+            credential.refresh(self.min_ttl)
+            expires_at = credential.get_expires_at()
+        except Exception:
+            logger.exception("Failed to refresh %s", credential.name)
+            with self._cond:
+                self._reschedule(credential, failed=True)
+                self._cond.notify()
+            return
+        with self._cond:
+            self._reschedule(credential, expires_at)
+            self._cond.notify()
+
+
+class AsyncTokenRefresher(BaseTokenRefresher):
+    """以 asyncio task 方式提前刷新 asyncio 客户端的凭证
+
+    :param max_concurrency: 同时进行刷新的最大任务数
+    """
+
+    def __init__(self, refresh_ahead=600, jitter=120, retry_interval=30, max_concurrency=4):
+        super().__init__(refresh_ahead, jitter, retry_interval)
+        self.max_concurrency = max_concurrency
+        self._task = None
+        self._wakeup = None
+        self._refreshing = set()
+
+    def add(self, client, jsapi_ticket=False):
+        """添加需要刷新凭证的 asyncio 客户端
+
+        :param client: ``wechatpy.client.aio`` 或 ``wechatpy.work.client.aio`` 中的客户端
+        :param jsapi_ticket: 是否同时刷新 JS-SDK ticket
+        """
+        credentials = [async_access_token_credential(client)]
+        if jsapi_ticket:
+            credentials.append(async_jsapi_ticket_credential(client))
+        self._add_client(client, credentials)
+
+    def add_credential(self, credential):
+        self._add_credential(credential)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def remove(self, client):
+        """停止刷新 ``add`` 添加的客户端凭证，其他客户端共用的凭证继续刷新"""
+        self._remove_client(client)
+
+    def remove_credential(self, name):
+        self._remove_credential(name)
+
+    def start(self):
+        """在当前事件循环中启动刷新任务"""
+        if self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """停止刷新任务"""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        tasks = [task, *self._refreshing]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def _run(self):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        while True:
+            credential, wait = self._pop_due()
+            if credential is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await semaphore.acquire()
+            task = asyncio.ensure_future(self._refresh(credential))
+            self._refreshing.add(task)
+            task.add_done_callback(self._refreshing.discard)
+            task.add_done_callback(lambda _: semaphore.release())
+
+    async def _refresh(self, credential):
+        try:
+            await credential.refresh(self.min_ttl)
+            expires_at = await aio.maybe_await(credential.get_expires_at())
+        except Exception:
+            logger.exception("Failed to refresh %s", credential.name)
+            self._reschedule(credential, failed=True)
+        else:
+            self._reschedule(credential, expires_at)
+        self._wakeup.set()
@@ -14,9 +14,9 @@ import time
 from urllib.parse import quote
 
 import requests
-import xmltodict
 
 from wechatpy.client import WeChatComponentClient
+from wechatpy.client.base import load_token, single_flight_refresh, store_token
 from wechatpy.constants import WeChatErrorCode
 from wechatpy.crypto import WeChatCrypto
 from wechatpy.exceptions import (
@@ -27,7 +27,7 @@ from wechatpy.exceptions import (
 )
 from wechatpy.messages import COMPONENT_MESSAGE_TYPES, ComponentUnknownMessage
 from wechatpy.session.memorystorage import MemoryStorage
-from wechatpy.utils import to_text
+from wechatpy.utils import parse_xml
 
 logger = logging.getLogger(__name__)
 
@@ -104,11 +104,7 @@ class BaseWeChatComponent:
                 WeChatErrorCode.EXPIRED_ACCESS_TOKEN.value,
             ):
                 logger.info("Component access token expired, fetch a new one and retry request")
-                self.fetch_access_token()
-                kwargs["params"]["component_access_token"] = self.session.get(
-                    f"{self.component_appid}_component_access_token"
-                )
-                return self._request(method=method, url_or_endpoint=url, **kwargs)
+                return self._retry_request(method, url, **kwargs)
             elif errcode == WeChatErrorCode.OUT_OF_API_FREQ_LIMIT.value:
                 # api freq out of limit
                 raise APILimitedException(errcode, errmsg, client=self, request=res.request, response=res)
@@ -116,6 +112,12 @@ class BaseWeChatComponent:
                 raise WeChatClientException(errcode, errmsg, client=self, request=res.request, response=res)
         return result
 
+    def _retry_request(self, method, url, **kwargs):
+        kwargs["params"]["component_access_token"] = self._refresh_access_token(
+            invalid_token=kwargs["params"].get("component_access_token")
+        )
+        return self._request(method=method, url_or_endpoint=url, **kwargs)
+
     def fetch_access_token(self):
         """
         获取 component_access_token
@@ -163,25 +165,47 @@ class BaseWeChatComponent:
         expires_in = 7200
         if "expires_in" in result:
             expires_in = result["expires_in"]
-        self.session.set(f"{self.component_appid}_component_access_token", result["component_access_token"], expires_in)
+        self.session.set(self.access_token_key, result["component_access_token"], expires_in)
         self.expires_at = int(time.time()) + expires_in
         return result
 
     @property
-    def access_token(self):
-        """WeChat component access token"""
-        access_token = self.session.get(f"{self.component_appid}_component_access_token")
+    def access_token_key(self):
+        return f"{self.component_appid}_component_access_token"
+
+    def _get_cached_access_token(self, min_ttl=60):
+        access_token = self.session.get(self.access_token_key)
         if access_token:
             if not self.expires_at:
                 # user provided access_token, just return it
                 return access_token
 
             timestamp = time.time()
-            if self.expires_at - timestamp > 60:
+            if self.expires_at - timestamp > min_ttl:
                 return access_token
+        return None
 
-        self.fetch_access_token()
-        return self.session.get(f"{self.component_appid}_component_access_token")
+    def _refresh_access_token(self, invalid_token=None, min_ttl=60):
+        """Fetch a new component access token unless another thread or process already did"""
+
+        def get_token(min_ttl):
+            access_token = self._get_cached_access_token(min_ttl)
+            if access_token != invalid_token:
+                return access_token
+            return None
+
+        return single_flight_refresh(
+            self.session,
+            self.access_token_key,
+            get_token,
+            self.fetch_access_token,
+            min_ttl=min_ttl,
+        )
+
+    @property
+    def access_token(self):
+        """WeChat component access token"""
+        return self._get_cached_access_token() or self._refresh_access_token()
 
     def get(self, url, **kwargs):
         return self._request(method="get", url_or_endpoint=url, **kwargs)
@@ -190,20 +214,34 @@ class BaseWeChatComponent:
         return self._request(method="post", url_or_endpoint=url, **kwargs)
 
 
+def _parse_component_message(xml):
+    message = parse_xml(xml)["xml"]
+    message_type = message["InfoType"].lower()
+    message_class = COMPONENT_MESSAGE_TYPES.get(message_type, ComponentUnknownMessage)
+    return message_class(message)
+
+
 class WeChatComponent(BaseWeChatComponent):
     PRE_AUTH_URL = "https://mp.weixin.qq.com/cgi-bin/componentloginpage"
 
-    def get_pre_auth_url(self, redirect_uri):
+    PRE_AUTH_URL_M = "https://mp.weixin.qq.com/safe/bindcomponent?action=bindcomponent&auth_type=3&no_scan=1&"
+
+    def _build_pre_auth_url(self, redirect_uri, pre_auth_code):
         redirect_uri = quote(redirect_uri, safe=b"")
-        return f"{self.PRE_AUTH_URL}?component_appid={self.component_appid}&pre_auth_code={self.create_preauthcode()['pre_auth_code']}&redirect_uri={redirect_uri}"
+        return f"{self.PRE_AUTH_URL}?component_appid={self.component_appid}&pre_auth_code={pre_auth_code}&redirect_uri={redirect_uri}"
+
+    def _build_pre_auth_url_m(self, redirect_uri, pre_auth_code):
+        redirect_uri = quote(redirect_uri, safe="")
+        return f"{self.PRE_AUTH_URL_M}component_appid={self.component_appid}&pre_auth_code={pre_auth_code}&redirect_uri={redirect_uri}"
+
+    def get_pre_auth_url(self, redirect_uri):
+        return self._build_pre_auth_url(redirect_uri, self.create_preauthcode()["pre_auth_code"])
 
     def get_pre_auth_url_m(self, redirect_uri):
         """
         快速获取pre auth url，可以直接微信中发送该链接，直接授权
         """
-        url = "https://mp.weixin.qq.com/safe/bindcomponent?action=bindcomponent&auth_type=3&no_scan=1&"
-        redirect_uri = quote(redirect_uri, safe="")
-        return f"{url}component_appid={self.component_appid}&pre_auth_code={self.create_preauthcode()['pre_auth_code']}&redirect_uri={redirect_uri}"
+        return self._build_pre_auth_url_m(redirect_uri, self.create_preauthcode()["pre_auth_code"])
 
     def create_preauthcode(self):
         """
@@ -250,7 +288,7 @@ class WeChatComponent(BaseWeChatComponent):
             expires_in = 7200
             if "expires_in" in result["authorization_info"]:
                 expires_in = result["authorization_info"]["expires_in"]
-            self.session.set(access_token_key, access_token, expires_in)
+            store_token(self.session, access_token_key, f"{access_token_key}_expires_at", access_token, expires_in)
         if (
             "authorizer_refresh_token" in result["authorization_info"]
             and result["authorization_info"]["authorizer_refresh_token"]
@@ -349,7 +387,7 @@ class WeChatComponent(BaseWeChatComponent):
         """
         access_token_key = f"{authorizer_appid}_access_token"
         refresh_token_key = f"{authorizer_appid}_refresh_token"
-        access_token = self.session.get(access_token_key)
+        access_token, _ = load_token(self.session, access_token_key, f"{access_token_key}_expires_at")
         refresh_token = self.session.get(refresh_token_key)
         assert refresh_token
 
@@ -360,10 +398,13 @@ class WeChatComponent(BaseWeChatComponent):
             expires_in = 7200
             if "expires_in" in ret:
                 expires_in = ret["expires_in"]
-            self.session.set(access_token_key, access_token, expires_in)
+            store_token(self.session, access_token_key, f"{access_token_key}_expires_at", access_token, expires_in)
 
         return WeChatComponentClient(authorizer_appid, self, session=self.session)
 
+    def _decrypt_component_message(self, msg, msg_signature, timestamp, nonce):
+        return self.crypto.decrypt_and_parse(msg, msg_signature, timestamp, nonce, parser=_parse_component_message)
+
     def parse_message(self, msg, msg_signature, timestamp, nonce):
         """
         处理 wechat server 推送消息
@@ -373,11 +414,7 @@ class WeChatComponent(BaseWeChatComponent):
         :params timestamp: 时间戳
         :params nonce: 随机数
         """
-        content = self.crypto.decrypt_message(msg, msg_signature, timestamp, nonce)
-        message = xmltodict.parse(to_text(content))["xml"]
-        message_type = message["InfoType"].lower()
-        message_class = COMPONENT_MESSAGE_TYPES.get(message_type, ComponentUnknownMessage)
-        msg = message_class(message)
+        msg = self._decrypt_component_message(msg, msg_signature, timestamp, nonce)
         if msg.type == "component_verify_ticket":
             self.session.set(f"{self.component_appid}_{msg.type}", msg.verify_ticket)
         elif msg.type in ("authorized", "updateauthorized"):
@@ -542,8 +579,9 @@ class ComponentOAuth:
                 WeChatErrorCode.EXPIRED_ACCESS_TOKEN.value,
             ):
                 logger.info("Component access token expired, fetch a new one and retry request")
-                self.component.fetch_access_token()
-                kwargs["params"]["component_access_token"] = self.component.access_token
+                kwargs["params"]["component_access_token"] = self.component._refresh_access_token(
+                    invalid_token=kwargs["params"].get("component_access_token")
+                )
                 return self._request(method=method, url_or_endpoint=url, **kwargs)
             elif errcode == WeChatErrorCode.OUT_OF_API_FREQ_LIMIT.value:
                 # api freq out of limit
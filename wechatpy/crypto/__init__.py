@@ -9,12 +9,17 @@
     :license: MIT, see LICENSE for more details.
 """
 
+import itertools
 import json
+import os
+import re
+import threading
 import time
 import base64
 import hashlib
+from collections import OrderedDict, deque
 
-from wechatpy.utils import to_text, to_binary, WeChatSigner
+from wechatpy.utils import to_text, to_binary, parse_xml, WeChatSigner, create_process_pool
 from wechatpy.exceptions import (
     InvalidAppIdException,
     InvalidMchIdException,
@@ -24,6 +29,45 @@ from wechatpy.crypto.base import BasePrpCrypto, WeChatCipher, BaseRefundCrypto
 from wechatpy.crypto.pkcs7 import PKCS7Encoder
 
 
+# the envelope WeChat posts in safe mode, Encrypt is base64 so it never needs unescaping
+_ENCRYPT = re.compile(r"<Encrypt>(?:<!\[CDATA\[([A-Za-z0-9+/=\s]*)\]\]>|([A-Za-z0-9+/=\s]*))</Encrypt>")
+_TO_USER_NAME = re.compile(r"<ToUserName>(?:<!\[CDATA\[([^\]]*)\]\]>|([^<]*))</ToUserName>")
+
+
+def _get_encrypt(msg):
+    if isinstance(msg, dict):
+        return msg["Encrypt"]
+    match = _ENCRYPT.search(to_text(msg))
+    if match is not None:
+        return (match.group(1) or match.group(2) or "").strip()
+    return parse_xml(msg)["xml"]["Encrypt"]
+
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    return iter(lambda: list(itertools.islice(iterator, size)), [])
+
+
+# set in each worker process of decrypt_and_parse_many
+_bulk_worker = None
+
+
+def _init_bulk_worker(crypto, parser, kwargs):
+    global _bulk_worker
+    _bulk_worker = (crypto, parser, kwargs)
+
+
+def _decrypt_chunk(chunk):
+    crypto, parser, kwargs = _bulk_worker
+    results = []
+    for msg, signature, timestamp, nonce in chunk:
+        try:
+            results.append(crypto.decrypt_and_parse(msg, signature, timestamp, nonce, parser=parser, **kwargs))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
 def _get_signature(token, timestamp, nonce, encrypt):
     signer = WeChatSigner()
     signer.add_data(token, timestamp, nonce, encrypt)
@@ -37,6 +81,9 @@ class PrpCrypto(BasePrpCrypto):
     def decrypt(self, text, app_id):
         return self._decrypt(text, app_id, InvalidAppIdException)
 
+    def decrypt_binary(self, text, app_id):
+        return self._decrypt_binary(text, app_id, InvalidAppIdException)
+
 
 class BaseWeChatCrypto:
     def __init__(self, token, encoding_aes_key, _id):
@@ -45,16 +92,79 @@ class BaseWeChatCrypto:
         assert len(self.key) == 32
         self.token = token
         self._id = _id
+        self._cryptos = {}
+
+    def _get_crypto(self, crypto_class):
+        # building the cipher is the costly part, reuse it for every message
+        crypto = self._cryptos.get(crypto_class)
+        if crypto is None:
+            crypto = self._cryptos[crypto_class] = crypto_class(self.key)
+        return crypto
+
+    def __getstate__(self):
+        # ciphers can not be pickled, each process builds its own
+        state = self.__dict__.copy()
+        state["_cryptos"] = {}
+        return state
+
+    def decrypt_and_parse_many(
+        self, callbacks, parser=None, workers=None, chunksize=256, ordered=True, return_exceptions=False, **kwargs
+    ):
+        """
+        使用多个进程批量解密并解析存档的回调，适合重新处理大量历史消息::
+
+            callbacks = ((row.body, row.msg_signature, row.timestamp, row.nonce) for row in archive)
+            for msg in crypto.decrypt_and_parse_many(callbacks, workers=8, ordered=False):
+                ...
+
+        ``callbacks`` 按 ``chunksize`` 分块分发给进程池，同时处理的块数有上限，输入可以是很大的生成器。
+        每个进程只构造一次 crypto，之后的消息复用其中的加解密对象。进程以 spawn 方式启动，
+        ``parser`` 和 ``kwargs`` 需要能被 pickle，调用方的主模块需要有 ``if __name__ == "__main__"`` 保护。
+
+        :param callbacks: 可迭代对象，每一项为 ``(xml, msg_signature, timestamp, nonce)``
+        :param parser: 解析 XML 的函数，同 ``decrypt_and_parse``，需要能被 pickle，例如模块级函数
+        :param workers: 进程数，默认为 CPU 核数
+        :param chunksize: 每次分发给一个进程的回调数
+        :param ordered: 是否按输入顺序输出，为 ``False`` 时按完成顺序输出
+        :param return_exceptions: 为 ``True`` 时解密或解析失败的回调输出异常对象，否则抛出异常
+        :param kwargs: 传给 ``parser`` 的参数，如 ``lazy``
+        :return: 解析结果的迭代器
+        """
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        workers = workers or os.cpu_count() or 1
+        chunks = _chunked(callbacks, chunksize)
+        executor = create_process_pool(workers, _init_bulk_worker, (self, parser, kwargs))
+        try:
+            # bound the chunks in flight so huge inputs are streamed, not queued all at once
+            pending = deque(executor.submit(_decrypt_chunk, chunk) for chunk in itertools.islice(chunks, 2 * workers))
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.remove(future)
+                for future in done:
+                    for result in future.result():
+                        if isinstance(result, Exception) and not return_exceptions:
+                            raise result
+                        yield result
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        pending.append(executor.submit(_decrypt_chunk, chunk))
+        finally:
+            executor.shutdown(cancel_futures=True)
 
     def _check_signature(self, signature, timestamp, nonce, echo_str, crypto_class=None):
         _signature = _get_signature(self.token, timestamp, nonce, echo_str)
         if _signature != signature:
             raise InvalidSignatureException()
-        pc = crypto_class(self.key)
+        pc = self._get_crypto(crypto_class)
         return pc.decrypt(echo_str, self._id)
 
     def _encrypt_message(self, msg, nonce, timestamp=None, crypto_class=None):
-        from wechatpy.replies import BaseReply
+        from wechatpy.replies import BaseReply, FrozenReply
 
         xml = """<xml>
 <Encrypt><![CDATA[{encrypt}]]></Encrypt>
@@ -64,25 +174,32 @@ class BaseWeChatCrypto:
 </xml>"""
         if isinstance(msg, BaseReply):
             msg = msg.render()
+        elif isinstance(msg, FrozenReply):
+            msg = msg.render_binary()
         timestamp = timestamp or to_text(int(time.time()))
-        pc = crypto_class(self.key)
+        pc = self._get_crypto(crypto_class)
         encrypt = to_text(pc.encrypt(msg, self._id))
         signature = _get_signature(self.token, timestamp, nonce, encrypt)
         return to_text(xml.format(encrypt=encrypt, signature=signature, timestamp=timestamp, nonce=nonce))
 
-    def _decrypt_message(self, msg, signature, timestamp, nonce, crypto_class=None):
-        if not isinstance(msg, dict):
-            import xmltodict
-
-            msg = xmltodict.parse(to_text(msg))["xml"]
-
-        encrypt = msg["Encrypt"]
+    def _verify_encrypt(self, msg, signature, timestamp, nonce):
+        encrypt = _get_encrypt(msg)
         _signature = _get_signature(self.token, timestamp, nonce, encrypt)
         if _signature != signature:
             raise InvalidSignatureException()
-        pc = crypto_class(self.key)
+        return encrypt
+
+    def _decrypt_message(self, msg, signature, timestamp, nonce, crypto_class=None):
+        encrypt = self._verify_encrypt(msg, signature, timestamp, nonce)
+        pc = self._get_crypto(crypto_class)
         return pc.decrypt(encrypt, self._id)
 
+    def _decrypt_and_parse(self, msg, signature, timestamp, nonce, parser, crypto_class=None, **kwargs):
+        encrypt = self._verify_encrypt(msg, signature, timestamp, nonce)
+        pc = self._get_crypto(crypto_class)
+        # UTF-8 bytes go straight to expat, never decoded into a str first
+        return parser(pc.decrypt_binary(encrypt, self._id), **kwargs)
+
 
 class WeChatCrypto(BaseWeChatCrypto):
     def __init__(self, token, encoding_aes_key, app_id):
@@ -95,6 +212,162 @@ class WeChatCrypto(BaseWeChatCrypto):
     def decrypt_message(self, msg, signature, timestamp, nonce):
         return self._decrypt_message(msg, signature, timestamp, nonce, PrpCrypto)
 
+    def decrypt_and_parse(self, msg, signature, timestamp, nonce, parser=None, **kwargs):
+        """
+        解密安全模式推送的消息并解析，与 ``parse_message(crypto.decrypt_message(...))`` 结果相同，
+        但不会再用 xmltodict 解析外层 XML，解密得到的 XML 也不经过字符串转换
+
+        :param parser: 解析 XML 的函数，默认为 ``wechatpy.parse_message``
+        :param kwargs: 传给 ``parser`` 的参数，如 ``lazy``、``dedup``
+        :return: ``parser`` 的返回值
+        """
+        if parser is None:
+            from wechatpy.parser import parse_message as parser
+        return self._decrypt_and_parse(msg, signature, timestamp, nonce, parser, PrpCrypto, **kwargs)
+
+
+class CryptoRegistry:
+    """
+    多个公众号、企业微信应用共用一个回调服务时，按 appid、corp_id 或 suite_id 查找对应的 ``WeChatCrypto``::
+
+        registry = CryptoRegistry(loader=load_account)
+        registry.register("wx123", token, encoding_aes_key, aliases=["gh_123"])
+
+        # 回调地址中带有 appid，例如 /callback/<appid>
+        msg = registry[appid].decrypt_and_parse(xml, msg_signature, timestamp, nonce)
+        # 按外层 XML 的 ToUserName 查找
+        msg = registry.decrypt_and_parse(xml, msg_signature, timestamp, nonce)
+
+    每个 crypto 只构造一次，之后的消息复用解码好的 AES 密钥和加解密对象。``register`` 注册的 crypto 一直保留，
+    ``loader`` 加载的 crypto 最多缓存 ``maxsize`` 个，超出时淘汰最久未使用的。
+    ``loader`` 找不到的 key 在 ``miss_ttl`` 秒内不再查询，伪造 ToUserName 的请求不会每次都触发 ``loader``。
+
+    :param loader: 可选函数，参数为找不到的 appid 或 ToUserName，返回 ``(token, encoding_aes_key, appid)``，
+                   找不到时返回 ``None``
+    :param maxsize: ``loader`` 加载的 crypto 的最大缓存数量，也是记录的找不到的 key 的最大数量
+    :param crypto_class: crypto 类，企业微信使用 ``wechatpy.work.crypto.WeChatCrypto``
+    :param miss_ttl: ``loader`` 找不到的 key 的缓存秒数，为 0 时不缓存
+    """
+
+    def __init__(self, loader=None, maxsize=1024, crypto_class=WeChatCrypto, miss_ttl=60):
+        self.loader = loader
+        self.maxsize = maxsize
+        self.crypto_class = crypto_class
+        self.miss_ttl = miss_ttl
+        self._registered = {}
+        self._loaded = OrderedDict()
+        # key -> monotonic time until which the loader is not asked for it again
+        self._missing = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, app_id, token, encoding_aes_key, aliases=()):
+        """
+        注册 crypto，已注册的 appid 会被替换
+
+        :param app_id: 公众号 appid、企业微信 corp_id 或 suite_id
+        :param token: 回调 token
+        :param encoding_aes_key: 回调 EncodingAESKey
+        :param aliases: 也用于查找的其他名称，如公众号原始 ID（回调的 ToUserName）
+        :return: 注册的 crypto
+        """
+        crypto = self.crypto_class(token, encoding_aes_key, app_id)
+        with self._lock:
+            for key in (app_id, *aliases):
+                self._registered[key] = crypto
+                self._missing.pop(key, None)
+        return crypto
+
+    def unregister(self, key):
+        """移除 ``key`` 对应的 crypto，``loader`` 之后会重新加载"""
+        self._registered.pop(key, None)
+        with self._lock:
+            self._loaded.pop(key, None)
+            self._missing.pop(key, None)
+
+    def get(self, key):
+        """
+        查找 crypto，依次查找注册的、已缓存的，最后调用 ``loader``
+
+        :param key: appid、corp_id、suite_id 或别名
+        :return: crypto，找不到时返回 ``None``
+        """
+        crypto = self._registered.get(key)
+        if crypto is not None:
+            return crypto
+        with self._lock:
+            crypto = self._loaded.get(key)
+            if crypto is not None:
+                self._loaded.move_to_end(key)
+                return crypto
+            if key in self._missing:
+                if self._missing[key] > time.monotonic():
+                    return None
+                del self._missing[key]
+        if self.loader is None:
+            return None
+        # the loader usually queries a database, keep it outside the lock
+        config = self.loader(key)
+        if config is None:
+            if self.miss_ttl:
+                with self._lock:
+                    self._missing[key] = time.monotonic() + self.miss_ttl
+                    # every entry has the same ttl, the first one expires first
+                    while len(self._missing) > self.maxsize:
+                        self._missing.popitem(last=False)
+            return None
+        crypto = self.crypto_class(*config)
+        with self._lock:
+            crypto = self._loaded.setdefault(key, crypto)
+            self._loaded.move_to_end(key)
+            while len(self._loaded) > self.maxsize:
+                self._loaded.popitem(last=False)
+        return crypto
+
+    def __getitem__(self, key):
+        crypto = self.get(key)
+        if crypto is None:
+            raise KeyError(key)
+        return crypto
+
+    def for_message(self, msg):
+        """
+        按外层 XML 的 ToUserName 查找 crypto
+
+        :param msg: 回调的 XML 或解析后的字典
+        :return: crypto，找不到时返回 ``None``
+        """
+        if isinstance(msg, dict):
+            to_user = msg.get("ToUserName")
+        else:
+            match = _TO_USER_NAME.search(to_text(msg))
+            if match is not None:
+                to_user = (match.group(1) or match.group(2) or "").strip()
+            else:
+                to_user = parse_xml(msg)["xml"].get("ToUserName")
+        return self.get(to_user) if to_user else None
+
+    def _find(self, msg, app_id):
+        crypto = self.get(app_id) if app_id else self.for_message(msg)
+        if crypto is None:
+            raise InvalidAppIdException()
+        return crypto
+
+    def decrypt_message(self, msg, signature, timestamp, nonce, app_id=None):
+        """
+        解密回调，``app_id`` 为空时按 ToUserName 查找 crypto
+
+        :raises InvalidAppIdException: 找不到对应的 crypto
+        """
+        return self._find(msg, app_id).decrypt_message(msg, signature, timestamp, nonce)
+
+    def decrypt_and_parse(self, msg, signature, timestamp, nonce, app_id=None, **kwargs):
+        """
+        解密并解析回调，``app_id`` 为空时按 ToUserName 查找 crypto，其余参数同 ``WeChatCrypto.decrypt_and_parse``
+
+        :raises InvalidAppIdException: 找不到对应的 crypto
+        """
+        return self._find(msg, app_id).decrypt_and_parse(msg, signature, timestamp, nonce, **kwargs)
+
 
 class WeChatWxaCrypto:
     def __init__(self, key, iv, app_id):
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
 import struct
-import socket
 import base64
 
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
@@ -45,7 +44,7 @@ class BasePrpCrypto:
         text = to_binary(text)
         tmp_list = []
         tmp_list.append(to_binary(self.get_random_string()))
-        length = struct.pack(b"I", socket.htonl(len(text)))
+        length = struct.pack(b"!I", len(text))
         tmp_list.append(length)
         tmp_list.append(text)
         tmp_list.append(to_binary(_id))
@@ -53,21 +52,27 @@ class BasePrpCrypto:
         text = b"".join(tmp_list)
         text = PKCS7Encoder.encode(text)
 
-        ciphertext = to_binary(self.cipher.encrypt(text))
+        ciphertext = self.cipher.encrypt(text)
         return base64.b64encode(ciphertext)
 
     def _decrypt(self, text, _id, exception=None):
+        return str(self._decrypt_view(text, _id, exception), "utf-8")
+
+    def _decrypt_binary(self, text, _id, exception=None):
+        return self._decrypt_view(text, _id, exception).tobytes()
+
+    def _decrypt_view(self, text, _id, exception=None):
         text = to_binary(text)
         plain_text = self.cipher.decrypt(base64.b64decode(text))
         padding = plain_text[-1]
-        content = plain_text[16:-padding]
-        xml_length = socket.ntohl(struct.unpack(b"I", content[:4])[0])
-        xml_content = to_text(content[4 : xml_length + 4])
-        from_id = to_text(content[xml_length + 4 :])
+        # slice without copying, only the XML itself is decoded
+        content = memoryview(plain_text)[16:-padding]
+        (xml_length,) = struct.unpack_from(b"!I", content)
+        from_id = str(content[xml_length + 4 :], "utf-8")
         if from_id != _id:
             exception = exception or Exception
             raise exception()
-        return xml_content
+        return content[4 : xml_length + 4]
 
 
 class BaseRefundCrypto:
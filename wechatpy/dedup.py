@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+    wechatpy.dedup
+    ~~~~~~~~~~~~~~~~
+    This module provides deduplication of callback messages retried by WeChat
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+import hashlib
+import math
+import threading
+import time
+
+
+def message_key(message):
+    """
+    消息的去重键：普通消息使用 ``MsgId``，事件使用 ``FromUserName`` + ``CreateTime``，
+    企业微信应用的事件还包括 ``AgentID``
+
+    :param message: ``parse_message`` 返回的消息，或解析后的 XML 字典
+    :return: 去重键，无法确定时返回 ``None``
+    """
+    data = getattr(message, "_data", message)
+    # every field used for events is part of the lazily parsed header
+    if data.get("MsgType") == "event":
+        msg_id = None
+    else:
+        msg_id = data.get("MsgId")
+    if msg_id:
+        return f"{data.get('ToUserName')}:{msg_id}"
+    if data.get("CreateTime") and data.get("FromUserName"):
+        key = f"{data.get('ToUserName')}:{data['FromUserName']}:{data['CreateTime']}:{data.get('Event')}"
+        # events of different agents can share user and time, read without forcing the parse of a lazy message
+        agent_id = dict.get(data, "AgentID")
+        return f"{key}:{agent_id}" if agent_id else key
+    return None
+
+
+class MessageDeduplicator:
+    """
+    过滤微信服务器重试推送的重复消息::
+
+        dedup = MessageDeduplicator()
+        msg = parse_message(xml, lazy=True, dedup=dedup)
+        if msg is None:
+            return "success"  # 重复推送
+
+    微信服务器在 5 秒内未收到响应时会重试，15 秒内最多推送三次。默认在进程内使用按时间分段的
+    布隆过滤器环记录 ``window`` 秒内见过的消息，占用内存固定，与消息量无关，
+    但有 ``error_rate`` 的概率把新消息误判为重复。
+
+    多进程部署时可以传入 ``session``，此时使用 ``session.add`` 在所有进程间精确去重。
+
+    ``parse_message`` 只从消息头和消息末尾取出去重需要的字段，重复推送的消息不会被完整解析。
+
+    :param window: 去重的时间窗口（秒）
+    :param capacity: 每个时间分段预计的最大消息数，超出后误判率会上升
+    :param error_rate: 容量内误判为重复的概率
+    :param buckets: 时间分段数，越多则记录的时间越接近 ``window``
+    :param session: 可选的 ``SessionStorage``
+    :param prefix: 使用 ``session`` 时的键前缀
+    """
+
+    def __init__(self, window=15, capacity=10000, error_rate=1e-6, buckets=4, session=None, prefix="wechatpy:dedup"):
+        if window <= 0:
+            raise ValueError("window must be positive")
+        if buckets < 2:
+            raise ValueError("buckets must be at least 2")
+        self.window = window
+        self.session = session
+        self.prefix = prefix
+        # the buckets still alive always cover at least ``window`` seconds
+        self._span = window / (buckets - 1)
+        self._bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._hashes = max(1, round(self._bits / capacity * math.log(2)))
+        self._filters = [bytearray((self._bits + 7) // 8) for _ in range(buckets)]
+        self._epochs = [None] * buckets
+        self._epoch = None
+        self._current = None
+        self._live = []
+        self._lock = threading.Lock()
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        bits = self._bits
+        return [(h1 + i * h2) % bits for i in range(self._hashes)]
+
+    def _rotate(self, epoch):
+        size = len(self._filters)
+        index = epoch % size
+        if self._epochs[index] != epoch:
+            self._filters[index][:] = bytes(len(self._filters[index]))
+            self._epochs[index] = epoch
+        self._epoch = epoch
+        self._current = self._filters[index]
+        self._live = [bits for bits, e in zip(self._filters, self._epochs) if e is not None and epoch - e < size]
+
+    def _seen_locally(self, key):
+        positions = self._positions(key)
+        epoch = int(time.monotonic() // self._span)
+        with self._lock:
+            if epoch != self._epoch:
+                self._rotate(epoch)
+            for bits in self._live:
+                for pos in positions:
+                    if not bits[pos >> 3] & (1 << (pos & 7)):
+                        break
+                else:
+                    return True
+            current = self._current
+            for pos in positions:
+                current[pos >> 3] |= 1 << (pos & 7)
+            return False
+
+    def is_duplicate(self, message):
+        """
+        检查消息是否在 ``window`` 秒内出现过，并记录该消息
+
+        :param message: ``parse_message`` 返回的消息，或解析后的 XML 字典
+        :return: 重复时返回 ``True``，无法确定去重键时返回 ``False``
+        """
+        key = message_key(message)
+        if key is None:
+            return False
+        if self.session is not None:
+            return not self.session.add(f"{self.prefix}:{key}", 1, self.window)
+        return self._seen_locally(key)
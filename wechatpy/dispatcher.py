@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+    wechatpy.dispatcher
+    ~~~~~~~~~~~~~~~~~~~~
+    This module provides a dispatcher for parsed WeChat messages and events
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+
+# marks the handler stored in a prefix trie node
+_HANDLER = object()
+
+
+class _Route:
+    """Handlers of one (message type, event type) pair"""
+
+    __slots__ = ("handler", "keys", "trie")
+
+    def __init__(self):
+        self.handler = None
+        self.keys = {}
+        self.trie = {}
+
+    def add_prefix(self, prefix, handler):
+        node = self.trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[_HANDLER] = handler
+
+    def find(self, key):
+        if key:
+            handler = self.keys.get(key)
+            if handler is not None:
+                return handler
+            if self.trie:
+                # longest registered prefix wins
+                node = self.trie
+                for char in key:
+                    node = node.get(char)
+                    if node is None:
+                        break
+                    handler = node.get(_HANDLER, handler)
+                if handler is not None:
+                    return handler
+        return self.handler
+
+
+def _event_types():
+    from wechatpy.events import EVENT_TYPES
+    from wechatpy.work.events import EVENT_TYPES as WORK_EVENT_TYPES
+
+    return EVENT_TYPES.keys() | WORK_EVENT_TYPES.keys()
+
+
+class MessageDispatcher:
+    """
+    根据消息类型、事件类型和 EventKey 分发 ``parse_message`` 解析得到的消息，
+    同时支持公众号和企业微信的消息与事件::
+
+        dispatcher = MessageDispatcher()
+
+        @dispatcher.register("text")
+        def on_text(message):
+            return create_reply(message.content, message)
+
+        @dispatcher.register("event", "click", key="MENU_HELP")
+        def on_help(message):
+            ...
+
+        @dispatcher.register(SubscribeScanEvent, prefix="invite_")
+        def on_invite(message):
+            ...
+
+        reply = dispatcher.dispatch(parse_message(xml))
+
+    消息类型和事件类型通过哈希表查找，EventKey 先按完整值查找，再按最长前缀匹配，
+    分发耗时与注册的处理函数数量无关。查找顺序为：完整 EventKey、最长 EventKey 前缀、
+    事件类型、仅消息类型（``register("event")`` 处理所有事件），最后是 ``default``。
+
+    处理函数可以是协程函数，此时 ``dispatch`` 返回协程，由调用方 ``await``。
+
+    :param default: 没有匹配的处理函数时调用的函数，不传则 ``dispatch`` 返回 ``None``
+    """
+
+    def __init__(self, default=None):
+        self.default = default
+        self._routes = {}
+
+    def register(self, message_type, event=None, key=None, prefix=None):
+        """
+        注册处理函数的装饰器
+
+        :param message_type: 消息类型，如 ``text``、``event``，也可以传入消息或事件类，
+                             如 ``wechatpy.events.ClickEvent``
+        :param event: 事件类型，如 ``click``、``subscribe_scan``，
+                      需要是 ``wechatpy.events`` 或 ``wechatpy.work.events`` 中的事件
+        :param key: 完整匹配的 EventKey
+        :param prefix: 前缀匹配的 EventKey，例如 ``scanbarcode|``
+        """
+        if isinstance(message_type, type):
+            message_type, event = message_type.type, getattr(message_type, "event", None) or None
+        elif event is not None:
+            event = event.lower()
+            if event not in _event_types():
+                raise ValueError(f"Unknown event type: {event}")
+        if (key is not None or prefix is not None) and event is None:
+            raise ValueError("key and prefix routes require an event type")
+
+        def decorator(handler):
+            route = self._routes.setdefault((message_type, event), _Route())
+            if key is not None:
+                route.keys[key] = handler
+            if prefix is not None:
+                route.add_prefix(prefix, handler)
+            if key is None and prefix is None:
+                route.handler = handler
+            return handler
+
+        return decorator
+
+    def find(self, message):
+        """
+        查找消息对应的处理函数
+
+        :param message: ``parse_message`` 返回的消息或事件
+        :return: 处理函数，找不到时返回 ``default``
+        """
+        message_type = message.type
+        event = getattr(message, "event", None) or None
+        route = self._routes.get((message_type, event))
+        if route is not None:
+            # events name the EventKey field differently, scene_id, key, ...
+            handler = route.find(message._data.get("EventKey") if event is not None else None)
+            if handler is not None:
+                return handler
+        if event is not None:
+            route = self._routes.get((message_type, None))
+            if route is not None and route.handler is not None:
+                return route.handler
+        return self.default
+
+    def dispatch(self, message, *args, **kwargs):
+        """
+        调用消息对应的处理函数
+
+        :param message: ``parse_message`` 返回的消息或事件
+        :return: 处理函数的返回值，没有处理函数时返回 ``None``
+        """
+        handler = self.find(message)
+        if handler is None:
+            return None
+        return handler(message, *args, **kwargs)
@@ -29,7 +29,9 @@ class FieldDescriptor:
         if instance is not None:
             value = instance._data.get(self.attr_name)
             if value is None:
-                value = copy.deepcopy(self.field.default)
+                value = self.field.default
+                if isinstance(value, (dict, list)):
+                    value = copy.deepcopy(value)
                 instance._data[self.attr_name] = value
             if isinstance(value, dict):
                 value = ObjectDict(value)
@@ -42,6 +44,26 @@ class FieldDescriptor:
         instance._data[self.attr_name] = value
 
 
+class CachedFieldDescriptor(FieldDescriptor):
+    """Converts the value once per instance and keeps it in ``instance._cache``"""
+
+    def __get__(self, instance, instance_type=None):
+        if instance is None:
+            return self.field
+        cache = instance._cache
+        if cache is None:
+            cache = instance._cache = {}
+        elif self in cache:
+            return cache[self]
+        value = cache[self] = super().__get__(instance, instance_type)
+        return value
+
+    def __set__(self, instance, value):
+        instance._data[self.attr_name] = value
+        # other fields may read the same element, e.g. create_time and time
+        instance._cache = None
+
+
 class BaseField:
     converter: Optional[Callable[..., Any]] = None
 
@@ -52,6 +74,13 @@ class BaseField:
     def to_xml(self, value):
         raise NotImplementedError()
 
+    def xml_template(self):
+        """``to_xml`` 的模板，``{}`` 处填入 ``xml_value`` 的返回值，结构不固定时返回 ``None``"""
+        return None
+
+    def xml_value(self, value):
+        return value
+
     @classmethod
     def from_xml(cls, value):
         raise NotImplementedError()
@@ -67,7 +96,8 @@ class BaseField:
     def add_to_class(self, klass, name):
         self.klass = klass
         klass._fields[name] = self
-        setattr(klass, name, FieldDescriptor(self))
+        descriptor_class = getattr(klass, "_descriptor_class", FieldDescriptor)
+        setattr(klass, name, descriptor_class(self))
 
 
 class StringField(BaseField):
@@ -77,8 +107,13 @@ class StringField(BaseField):
     converter = __to_text
 
     def to_xml(self, value):
-        value = self.converter(value)
-        return f"<{self.name}><![CDATA[{value}]]></{self.name}>"
+        return self.xml_template().format(self.xml_value(value))
+
+    def xml_template(self):
+        return f"<{self.name}><![CDATA[{{}}]]></{self.name}>"
+
+    def xml_value(self, value):
+        return self.converter(value)
 
     @classmethod
     def from_xml(cls, value):
@@ -89,8 +124,13 @@ class IntegerField(BaseField):
     converter = int
 
     def to_xml(self, value):
-        value = self.converter(value) if value is not None else self.default
-        return f"<{self.name}>{value}</{self.name}>"
+        return self.xml_template().format(self.xml_value(value))
+
+    def xml_template(self):
+        return f"<{self.name}>{{}}</{self.name}>"
+
+    def xml_value(self, value):
+        return self.converter(value) if value is not None else self.default
 
     @classmethod
     def from_xml(cls, value):
@@ -127,10 +167,9 @@ class FloatField(BaseField):
 
 
 class ImageField(StringField):
-    def to_xml(self, value):
-        value = self.converter(value)
-        return f"""<Image>
-        <MediaId><![CDATA[{value}]]></MediaId>
+    def xml_template(self):
+        return """<Image>
+        <MediaId><![CDATA[{}]]></MediaId>
         </Image>"""
 
     @classmethod
@@ -139,10 +178,9 @@ class ImageField(StringField):
 
 
 class VoiceField(StringField):
-    def to_xml(self, value):
-        value = self.converter(value)
-        return f"""<Voice>
-        <MediaId><![CDATA[{value}]]></MediaId>
+    def xml_template(self):
+        return """<Voice>
+        <MediaId><![CDATA[{}]]></MediaId>
         </Voice>"""
 
     @classmethod
@@ -207,22 +245,25 @@ class MusicField(StringField):
 
 
 class ArticlesField(StringField):
+    item_template = """<item>
+            <Title><![CDATA[{}]]></Title>
+            <Description><![CDATA[{}]]></Description>
+            <PicUrl><![CDATA[{}]]></PicUrl>
+            <Url><![CDATA[{}]]></Url>
+            </item>"""
+
     def to_xml(self, articles):
         article_count = len(articles)
-        items = []
-        for article in articles:
-            title = self.converter(article.get("title", ""))
-            description = self.converter(article.get("description", ""))
-            image = self.converter(article.get("image", ""))
-            url = self.converter(article.get("url", ""))
-            item = f"""<item>
-            <Title><![CDATA[{title}]]></Title>
-            <Description><![CDATA[{description}]]></Description>
-            <PicUrl><![CDATA[{image}]]></PicUrl>
-            <Url><![CDATA[{url}]]></Url>
-            </item>"""
-            items.append(item)
-        items_str = "\n".join(items)
+        convert = self.converter
+        items_str = "\n".join(
+            self.item_template.format(
+                convert(article.get("title", "")),
+                convert(article.get("description", "")),
+                convert(article.get("image", "")),
+                convert(article.get("url", "")),
+            )
+            for article in articles
+        )
         return f"""<ArticleCount>{article_count}</ArticleCount>
         <Articles>{items_str}</Articles>"""
 
@@ -240,10 +281,9 @@ class ArticlesField(StringField):
 
 
 class TaskCardField(StringField):
-    def to_xml(self, value):
-        value = self.converter(value)
-        return f"""<TaskCard>
-            <ReplaceName><![CDATA[{value}]]></ReplaceName>
+    def xml_template(self):
+        return """<TaskCard>
+            <ReplaceName><![CDATA[{}]]></ReplaceName>
         </TaskCard>"""
 
     @classmethod
@@ -8,9 +8,7 @@
     :copyright: (c) 2014 by messense.
     :license: MIT, see LICENSE for more details.
 """
-import copy
-
-from wechatpy.fields import BaseField, DateTimeField, FieldDescriptor, IntegerField, StringField
+from wechatpy.fields import BaseField, CachedFieldDescriptor, DateTimeField, IntegerField, StringField
 
 MESSAGE_TYPES = {}
 COMPONENT_MESSAGE_TYPES = {}
@@ -36,27 +34,37 @@ class MessageMetaClass(type):
     """Metaclass for all messages"""
 
     def __new__(mcs, name, bases, attrs):
-        for b in bases:
-            if not hasattr(b, "_fields"):
-                continue
-
-            for k, v in b.__dict__.items():
-                if k in attrs:
-                    continue
-                if isinstance(v, FieldDescriptor):
-                    attrs[k] = copy.deepcopy(v.field)
-
+        # built-in subclasses of a class using __slots__ only stay compact without a __dict__ of their own,
+        # subclasses defined outside this package keep their __dict__
+        if (
+            "__slots__" not in attrs
+            and attrs.get("__module__", "").startswith("wechatpy.")
+            and bases
+            and all(hasattr(b, "_fields") and b.__dictoffset__ == 0 for b in bases)
+        ):
+            attrs["__slots__"] = ()
         mcs = super().__new__(mcs, name, bases, attrs)
         mcs._fields = {}
 
-        for name, field in mcs.__dict__.items():
+        for name, field in attrs.items():
             if isinstance(field, BaseField):
                 field.add_to_class(mcs, name)
+        # inherited fields are shared with the base class, only overridden ones are redefined
+        for b in bases:
+            for name, field in getattr(b, "_fields", {}).items():
+                if name not in attrs:
+                    mcs._fields.setdefault(name, field)
         return mcs
 
 
 class BaseMessage(metaclass=MessageMetaClass):
-    """Base class for all messages and events"""
+    """Base class for all messages and events
+
+    Instances use ``__slots__`` and convert each field once, on first access.
+    """
+
+    __slots__ = ("_data", "_cache")
+    _descriptor_class = CachedFieldDescriptor
 
     type = "unknown"
     id = IntegerField("MsgId", 0)
@@ -67,6 +75,14 @@ class BaseMessage(metaclass=MessageMetaClass):
 
     def __init__(self, message):
         self._data = message
+        self._cache = None
+
+    def __getstate__(self):
+        return self._data
+
+    def __setstate__(self, state):
+        self._data = state
+        self._cache = None
 
     def __repr__(self):
         return f"{self.__class__.__name__}({repr(self._data)})"
@@ -118,6 +118,12 @@ class WeChatOAuth:
         url_list.append("#wechat_redirect")
         return "".join(url_list)
 
+    def _update_token(self, res):
+        self.access_token = res["access_token"]
+        self.open_id = res["openid"]
+        self.refresh_token = res["refresh_token"]
+        self.expires_in = res["expires_in"]
+
     def fetch_access_token(self, code):
         """获取 access_token
 
@@ -133,10 +139,7 @@ class WeChatOAuth:
                 "grant_type": "authorization_code",
             },
         )
-        self.access_token = res["access_token"]
-        self.open_id = res["openid"]
-        self.refresh_token = res["refresh_token"]
-        self.expires_in = res["expires_in"]
+        self._update_token(res)
         return res
 
     def refresh_access_token(self, refresh_token):
@@ -153,10 +156,7 @@ class WeChatOAuth:
                 "refresh_token": refresh_token,
             },
         )
-        self.access_token = res["access_token"]
-        self.open_id = res["openid"]
-        self.refresh_token = res["refresh_token"]
-        self.expires_in = res["expires_in"]
+        self._update_token(res)
         return res
 
     def get_user_info(self, openid=None, access_token=None, lang="zh_CN"):
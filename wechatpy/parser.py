@@ -7,23 +7,38 @@
     :copyright: (c) 2014 by messense.
     :license: MIT, see LICENSE for more details.
 """
-import xmltodict
-
 from wechatpy.messages import MESSAGE_TYPES, UnknownMessage
 from wechatpy.events import EVENT_TYPES
-from wechatpy.utils import to_text
+from wechatpy.utils import LazyXMLDict, parse_xml, parse_xml_lazily
+
+# 消息路由需要的字段，微信推送时这些字段位于消息开头
+HEADER_FIELDS = frozenset(("ToUserName", "FromUserName", "CreateTime", "MsgType", "Event", "EventKey"))
+# 普通消息的去重字段，位于消息末尾
+TRAILER_FIELDS = ("MsgId",)
 
 
-def parse_message(xml):
+def parse_message(xml, lazy=False, dedup=None):
     """
     解析微信服务器推送的 XML 消息
 
     :param xml: XML 消息
-    :return: 解析成功返回对应的消息或事件，否则返回 ``UnknownMessage``
+    :param lazy: 是否延迟解析。为 ``True`` 时只解析 ``MsgType``、``Event``、``EventKey``、
+                 ``FromUserName`` 等消息头，其余字段在首次访问时才解析，
+                 适合大部分消息会被直接丢弃或去重的场景
+    :param dedup: 可选的 ``wechatpy.dedup.MessageDeduplicator``，用于过滤微信服务器重试推送的消息
+    :return: 解析成功返回对应的消息或事件，否则返回 ``UnknownMessage``，重复的消息返回 ``None``
     """
     if not xml:
         return
-    message = xmltodict.parse(to_text(xml))["xml"]
+    if lazy or dedup is not None:
+        # the dedup key comes from the header and trailer, a retried message is dropped before the full parse
+        message = parse_xml_lazily(xml, HEADER_FIELDS, TRAILER_FIELDS)
+        if dedup is not None and dedup.is_duplicate(message):
+            return None
+        if not lazy and isinstance(message, LazyXMLDict):
+            message = parse_xml(xml)["xml"]
+    else:
+        message = parse_xml(xml)["xml"]
     message_type = message["MsgType"].lower()
     event_type = None
     if message_type == "event" or message_type.startswith("device_"):
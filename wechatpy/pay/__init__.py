@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 
-import inspect
 import logging
 
 import requests
@@ -17,16 +16,11 @@ from wechatpy.pay.utils import (
     _check_signature,
     dict_to_xml,
 )
-from wechatpy.pay.api.base import BaseWeChatPayAPI
 from wechatpy.pay import api
 
 logger = logging.getLogger(__name__)
 
 
-def _is_api_endpoint(obj):
-    return isinstance(obj, BaseWeChatPayAPI)
-
-
 class WeChatPay:
     """
     微信支付接口
@@ -67,15 +61,6 @@ class WeChatPay:
 
     API_BASE_URL = "https://api.mch.weixin.qq.com/"
 
-    def __new__(cls, *args, **kwargs):
-        self = super().__new__(cls)
-        api_endpoints = inspect.getmembers(self, _is_api_endpoint)
-        for name, _api in api_endpoints:
-            api_cls = type(_api)
-            _api = api_cls(self)
-            setattr(self, name, _api)
-        return self
-
     def __init__(
         self,
         appid,
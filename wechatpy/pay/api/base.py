@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
+from wechatpy.utils import LazyAPIMixin
 
 
-class BaseWeChatPayAPI:
+class BaseWeChatPayAPI(LazyAPIMixin):
     """WeChat Pay API base class"""
 
     def __init__(self, client=None):
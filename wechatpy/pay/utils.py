@@ -123,11 +123,35 @@ def rsa_decrypt(encrypted_data, pem, password=None):
     return data
 
 
+def load_private_key(private_key):
+    """
+    加载 RSA 私钥，解析并校验 RSA 私钥需要数十毫秒，频繁签名时应保存返回的私钥对象重复使用
+
+    :param private_key: PEM 格式的私钥内容，或已经加载的私钥对象
+    :return: 私钥对象
+    """
+    if isinstance(private_key, (str, bytes)):
+        return serialization.load_pem_private_key(to_binary(private_key), password=None, backend=default_backend())
+    return private_key
+
+
+def sign_rsa(private_key, data):
+    """
+    SHA256 with RSA 签名
+
+    :param private_key: RSA private key，PEM 内容（每次调用都会解析）或私钥对象
+    :param data: 待签名字符串/binary
+    :return: base64 处理后的签名
+    """
+    signature = load_private_key(private_key).sign(to_binary(data), padding=padding.PKCS1v15(), algorithm=SHA256())
+    return to_text(base64.b64encode(signature))
+
+
 def calculate_signature_rsa(private_key, request_method, request_path, request_body, timestamp=None, nonce_str=None):
     """
     v3接口 rsa 签名
 
-    :param private_key: RSA private key
+    :param private_key: RSA private key，PEM 内容或 ``load_private_key`` 返回的私钥对象
     :param request_method: 请求方法
     :param request_path: 请求路径
     :param request_body: 请求内容
@@ -139,19 +163,14 @@ def calculate_signature_rsa(private_key, request_method, request_path, request_b
     nonce_str = nonce_str or "".join(random.choice(string.ascii_letters + string.digits) for _ in range(32))
     data = f"{request_method.upper()}\n{request_path}\n{timestamp}\n{nonce_str}\n{request_body}\n"
     logger.debug("Calculate Signature: %s", data)
-    encoded_data = to_binary(data)
-    pem = to_binary(private_key)
-    public_key = serialization.load_pem_private_key(pem, password=None, backend=default_backend())
-    encrypted_data = public_key.sign(encoded_data, padding=padding.PKCS1v15(), algorithm=SHA256())
-    encrypted_data = base64.b64encode(encrypted_data)
-    return to_text(encrypted_data)
+    return sign_rsa(private_key, data)
 
 
 def calculate_pay_params_signature_rsa(private_key, app_id, package, timestamp=None, nonce_str=None):
     """
     v3接口 支付rsa签名
 
-    :param private_key: RSA private key
+    :param private_key: RSA private key，PEM 内容或 ``load_private_key`` 返回的私钥对象
     :param app_id: 小程序app_id
     :param package: 订单详情扩展字符串
     :param timestamp: 时间戳（可选，不填自动当前时间）
@@ -162,12 +181,7 @@ def calculate_pay_params_signature_rsa(private_key, app_id, package, timestamp=N
     nonce_str = nonce_str or "".join(random.choice(string.ascii_letters + string.digits) for _ in range(32))
     data = f"{app_id}\n{timestamp}\n{nonce_str}\n{package}\n"
     logger.debug("Calculate Signature: %s", data)
-    encoded_data = to_binary(data)
-    pem = to_binary(private_key)
-    public_key = serialization.load_pem_private_key(pem, password=None, backend=default_backend())
-    encrypted_data = public_key.sign(encoded_data, padding=padding.PKCS1v15(), algorithm=SHA256())
-    encrypted_data = base64.b64encode(encrypted_data)
-    return to_text(encrypted_data)
+    return sign_rsa(private_key, data)
 
 
 def check_rsa_signature(certificate, timestamp, nonce_str, response_body, signature):
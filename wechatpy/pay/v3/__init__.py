@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import datetime
-import inspect
 import json
 import logging
 import os
@@ -13,14 +13,14 @@ from cryptography.hazmat.backends import default_backend
 from cryptography.x509 import load_pem_x509_certificate
 
 from wechatpy.exceptions import InvalidSignatureException, WeChatPayV3Exception
-from wechatpy.pay.v3.api.base import BaseWeChatPayAPI
 from wechatpy.pay.utils import (
-    calculate_signature_rsa,
     check_rsa_signature,
     aes_decrypt,
     rsa_public_encrypt,
     calculate_pay_params_signature_rsa,
     get_serial_no,
+    load_private_key,
+    sign_rsa,
 )
 from wechatpy.utils import random_string, to_text
 from wechatpy.pay.v3 import api
@@ -28,10 +28,6 @@ from wechatpy.pay.v3 import api
 logger = logging.getLogger(__name__)
 
 
-def _is_api_endpoint(obj):
-    return isinstance(obj, BaseWeChatPayAPI)
-
-
 class WeChatPay:
     """
     微信支付接口
@@ -45,6 +41,8 @@ class WeChatPay:
     :param apiclient_key_path: 必填，商户证书私钥路径
     :param wechat_cert_dir: 必填，微信证书保存文件夹
     :param timeout: 可选，请求超时时间，单位秒，默认无超时设置
+    :param signer: 可选，``wechatpy.pay.v3.signer`` 中的签名器，在线程池或进程池中计算请求签名，
+                   默认在当前线程签名
     """
 
     # 媒体文件接口
@@ -58,15 +56,6 @@ class WeChatPay:
 
     API_BASE_URL = "https://api.mch.weixin.qq.com/v3/"
 
-    def __new__(cls, *args, **kwargs):
-        self = super().__new__(cls)
-        api_endpoints = inspect.getmembers(self, _is_api_endpoint)
-        for name, _api in api_endpoints:
-            api_cls = type(_api)
-            _api = api_cls(self)
-            setattr(self, name, _api)
-        return self
-
     def __init__(
         self,
         appid,
@@ -78,6 +67,7 @@ class WeChatPay:
         timeout=None,
         sub_appid=None,
         skip_check_signature=False,
+        signer=None,
     ):
         self.appid = appid
         self.sub_appid = sub_appid
@@ -88,6 +78,7 @@ class WeChatPay:
         self.wechat_cert_dir = wechat_cert_dir
         self.timeout = timeout
         self.skip_check_signature = skip_check_signature
+        self.signer = signer
         self._http = requests.Session()
 
         # 证书内存缓存
@@ -101,22 +92,57 @@ class WeChatPay:
 
         pem_x509 = cryptography.x509.load_pem_x509_certificate(self.apiclient_cert)
         self.serial_no = get_serial_no(pem_x509)
+        self._private_key = None
+        self._wechat_serial_no = (None, None)
 
-    def download_file(self, url, method="get", headers=None, **kwargs):
+    @property
+    def private_key(self):
+        """加载后的商户私钥，只在 ``apiclient_key`` 变化时重新加载"""
+        if self._private_key is None or self._private_key[0] is not self.apiclient_key:
+            self._private_key = (self.apiclient_key, load_private_key(self.apiclient_key))
+        return self._private_key[1]
+
+    def _signing_message(self, method, path, body):
         nonce_str = random_string(32).upper()
         timestamp = str(int(time.time()))
-        sign = calculate_signature_rsa(
-            self.apiclient_key,
-            method,
-            url,
-            "",
-            nonce_str=nonce_str,
-            timestamp=timestamp,
-        )
-        authorization = (
+        message = f"{method.upper()}\n{path}\n{timestamp}\n{nonce_str}\n{body}\n"
+        logger.debug("Calculate Signature: %s", message)
+        return nonce_str, timestamp, message
+
+    def _format_authorization(self, nonce_str, timestamp, sign):
+        return (
             f'WECHATPAY2-SHA256-RSA2048 mchid="{self.mch_id}",nonce_str="{nonce_str}",signature="{sign}",'
             f'timestamp="{timestamp}",serial_no="{self.serial_no}"'
         )
+
+    def _authorization(self, method, path, body):
+        nonce_str, timestamp, message = self._signing_message(method, path, body)
+        if self.signer is None:
+            sign = sign_rsa(self.private_key, message)
+        else:
+            sign = self.signer.sign(message)
+        return self._format_authorization(nonce_str, timestamp, sign)
+
+    async def authorization_async(self, method, path, body=""):
+        """
+        生成请求的 ``Authorization`` 头，签名在 ``signer`` 或默认线程池中进行，不阻塞事件循环，
+        供使用 httpx 等异步 HTTP 客户端调用 v3 接口时使用
+
+        :param method: 请求方法
+        :param path: 请求路径，包含查询参数，如 ``/v3/certificates``
+        :param body: 请求内容
+        :return: ``Authorization`` 头的值
+        """
+        nonce_str, timestamp, message = self._signing_message(method, path, body)
+        if self.signer is None:
+            loop = asyncio.get_running_loop()
+            sign = await loop.run_in_executor(None, sign_rsa, self.private_key, message)
+        else:
+            sign = await self.signer.sign_async(message)
+        return self._format_authorization(nonce_str, timestamp, sign)
+
+    def download_file(self, url, method="get", headers=None, **kwargs):
+        authorization = self._authorization(method, url, "")
         headers = headers or {}
         headers.update(
             {
@@ -150,21 +176,8 @@ class WeChatPay:
         else:
             endpoint = url_parse.path
 
-        nonce_str = random_string(32).upper()
-        timestamp = str(int(time.time()))
         sign_data = sign_data or kwargs.get("json")
-        sign = calculate_signature_rsa(
-            self.apiclient_key,
-            method,
-            endpoint,
-            json.dumps(sign_data) if sign_data else "",
-            nonce_str=nonce_str,
-            timestamp=timestamp,
-        )
-        authorization = (
-            f'WECHATPAY2-SHA256-RSA2048 mchid="{self.mch_id}",nonce_str="{nonce_str}",signature="{sign}",'
-            f'timestamp="{timestamp}",serial_no="{self.serial_no}"'
-        )
+        authorization = self._authorization(method, endpoint, json.dumps(sign_data) if sign_data else "")
 
         headers = headers or {}
         headers.update(
@@ -175,7 +188,7 @@ class WeChatPay:
         )
         if skip_check_signature is False and self.skip_check_signature is False:
             # 跳过，首次获取证书的时候不需要这个
-            headers.update({"Wechatpay-Serial": get_serial_no(self._get_wechat_cert())})
+            headers.update({"Wechatpay-Serial": self._get_wechat_serial_no()})
 
         kwargs["timeout"] = kwargs.get("timeout", self.timeout)
         logger.debug("Request to WeChat API: %s %s\n%s", method, url, kwargs)
@@ -268,16 +281,22 @@ class WeChatPay:
     def _get_wechat_cert(self):
         if len(self.wechat_cert_dict.keys()) == 0:
             raise WeChatPayV3Exception(code=0, message="请先加载微信证书")
-        certificate = list(self.wechat_cert_dict.values())[0]
+        certificate = next(iter(self.wechat_cert_dict.values()))
         return certificate
 
+    def _get_wechat_serial_no(self):
+        certificate = self._get_wechat_cert()
+        if self._wechat_serial_no[0] is not certificate:
+            self._wechat_serial_no = (certificate, get_serial_no(certificate))
+        return self._wechat_serial_no[1]
+
     def rsa_encrypt_data(self, data):
         certificate = self._get_wechat_cert()
         return rsa_public_encrypt(data, certificate)
 
     def calculate_pay_params_signature_rsa(self, app_id, package, timestamp=None, nonce_str=None):
         """支付参数rsa签名"""
-        return calculate_pay_params_signature_rsa(self.apiclient_key, app_id, package, timestamp, nonce_str)
+        return calculate_pay_params_signature_rsa(self.private_key, app_id, package, timestamp, nonce_str)
 
     def check_response_signature(self, headers, response_body):
         """校验微信响应签名"""
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+    wechatpy.pay.v3.signer
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    This module provides signer backends that move Pay v3 RSA signing off the calling thread
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+import asyncio
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from cryptography.hazmat.primitives import serialization
+
+from wechatpy.pay.utils import load_private_key, sign_rsa
+from wechatpy.utils import create_process_pool, to_binary
+
+
+class _PoolSigner:
+    def submit(self, data):
+        raise NotImplementedError()
+
+    def sign(self, data):
+        """
+        签名，阻塞当前线程直到签名完成
+
+        :param data: 待签名字符串
+        :return: base64 处理后的签名
+        """
+        return self.submit(data).result()
+
+    async def sign_async(self, data):
+        """
+        签名，等待签名时不阻塞事件循环
+
+        :param data: 待签名字符串
+        :return: base64 处理后的签名
+        """
+        return await asyncio.wrap_future(self.submit(data))
+
+    def close(self):
+        raise NotImplementedError()
+
+
+class ThreadPoolSigner(_PoolSigner):
+    """
+    在线程池中签名，适合 asyncio 应用，签名时不阻塞事件循环
+
+    :param private_key: 商户私钥，PEM 内容或私钥对象
+    :param workers: 线程数
+    """
+
+    def __init__(self, private_key, workers=None):
+        self.private_key = load_private_key(private_key)
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="wechatpy-signer")
+
+    def submit(self, data):
+        return self._executor.submit(sign_rsa, self.private_key, data)
+
+    def close(self):
+        self._executor.shutdown()
+
+
+# the key loaded once in each worker process of ProcessPoolSigner
+_worker_key = None
+
+
+def _init_worker(pem):
+    global _worker_key
+    _worker_key = load_private_key(pem)
+
+
+def _sign_batch(messages):
+    return [sign_rsa(_worker_key, message) for message in messages]
+
+
+def _to_pem(private_key):
+    if isinstance(private_key, (str, bytes)):
+        return to_binary(private_key)
+    return private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+
+
+class ProcessPoolSigner(_PoolSigner):
+    """
+    在进程池中签名，RSA 签名占满单核 CPU 时可以利用多核::
+
+        signer = ProcessPoolSigner(apiclient_key, workers=4)
+        pay = WeChatPay(..., signer=signer)
+
+    多个线程同时提交的签名会合并成一批发送给同一个进程，减少进程间通信的开销，
+    空闲时单个签名不会等待凑批。每个进程只加载一次私钥。
+
+    :param private_key: 商户私钥，PEM 内容或私钥对象
+    :param workers: 进程数，默认为 CPU 核数
+    :param batch_size: 每批最多的签名数
+    """
+
+    def __init__(self, private_key, workers=None, batch_size=64):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self._pem = _to_pem(private_key)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._closed = False
+        self._broken = False
+        self._executor = None
+        self._queue = None
+        self._thread = None
+
+    def _new_executor(self):
+        return create_process_pool(self.workers, _init_worker, (self._pem,))
+
+    def submit(self, data):
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot sign after the signer has been closed")
+            # the pool and the batching thread do not survive fork, start them in the current process
+            if self._pid != os.getpid():
+                self._executor = self._new_executor()
+                self._broken = False
+                self._queue = queue.SimpleQueue()
+                self._thread = threading.Thread(target=self._run, name="wechatpy-signer", daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+            self._queue.put((to_binary(data), future))
+        return future
+
+    def _run(self):
+        requests = self._queue
+        while True:
+            batch = [requests.get()]
+            # take whatever else is already waiting, never wait for more
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(requests.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            batch = [request for request in batch if request is not None]
+            if batch:
+                self._dispatch(batch)
+            if stop:
+                return
+
+    def _dispatch(self, batch):
+        if self._broken:
+            # a worker died, the pool refuses all work from now on, replace it
+            self._executor.shutdown(wait=False)
+            self._executor = self._new_executor()
+            self._broken = False
+        futures = [future for _, future in batch]
+        try:
+            task = self._executor.submit(_sign_batch, [data for data, _ in batch])
+        except Exception as e:
+            self._broken = isinstance(e, BrokenProcessPool)
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        def resolve(task):
+            error = task.exception()
+            if error is not None:
+                if isinstance(error, BrokenProcessPool):
+                    self._broken = True
+                for future in futures:
+                    future.set_exception(error)
+                return
+            for future, signature in zip(futures, task.result()):
+                future.set_result(signature)
+
+        task.add_done_callback(resolve)
+
+    def close(self):
+        """等待已提交的签名完成，关闭进程池，之后不能再签名"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._pid != os.getpid():
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._executor.shutdown()
@@ -8,7 +8,9 @@
     :license: MIT, see LICENSE for more details.
 """
 
+import re
 import time
+
 import xmltodict
 
 from wechatpy.fields import (
@@ -21,8 +23,10 @@ from wechatpy.fields import (
     ArticlesField,
     Base64EncodeField,
     HardwareField,
+    FieldDescriptor,
 )
 from wechatpy.messages import BaseMessage, MessageMetaClass
+from wechatpy.utils import to_binary
 
 
 REPLY_TYPES = {}
@@ -36,6 +40,74 @@ def register_reply(reply_type):
     return register
 
 
+def _field_template(field):
+    """The field's ``xml_template`` unless a subclass overrides ``to_xml`` below it"""
+    mro = type(field).__mro__
+    owner = next(klass for klass in mro if "xml_template" in klass.__dict__)
+    renderer = next(klass for klass in mro if "to_xml" in klass.__dict__)
+    if mro.index(owner) > mro.index(renderer):
+        return None
+    return field.xml_template()
+
+
+def _reads_data(klass, name, field):
+    """Whether ``getattr(reply, name)`` is the plain ``FieldDescriptor`` of ``field``"""
+    attr = next((base.__dict__[name] for base in klass.__mro__ if name in base.__dict__), None)
+    return type(attr) is FieldDescriptor and attr.field is field
+
+
+def _compile_renderer(klass):
+    """Build the render function of a reply class: one template filled by one ``format`` call"""
+    templates = ["<MsgType><![CDATA[{}]]></MsgType>"]
+    steps = []
+    for name, field in klass._fields.items():
+        template = _field_template(field)
+        if template is None:
+            templates.append("{}")
+            finish = field.to_xml
+        else:
+            templates.append(template)
+            finish = field.xml_value
+        if _reads_data(klass, name, field):
+            convert = field.converter if callable(field.converter) else None
+            steps.append((field.name, None, field.default, convert, finish))
+        else:
+            steps.append((None, name, field.default, None, finish))
+    template = "<xml>\n{}\n</xml>".format("\n".join(templates))
+    names = list(klass._fields)
+
+    def render(reply, overrides=None):
+        data = reply._data
+        values = []
+        for key, name, default, convert, finish in steps:
+            if key is None:
+                value = getattr(reply, name, default)
+            else:
+                # what FieldDescriptor.__get__ returns, without storing the default
+                value = data.get(key)
+                if value is None:
+                    value = default
+                if convert is not None and value and not isinstance(value, (dict, list, tuple)):
+                    value = convert(value)
+            values.append(finish(value))
+        if overrides:
+            # the XML fragment inside a field's template, used by FrozenReply
+            for index, name in enumerate(names):
+                if name in overrides:
+                    values[index] = overrides[name]
+        return template.format(reply.type, *values)
+
+    klass._renderer = render
+    return render
+
+
+def _get_renderer(klass):
+    renderer = klass.__dict__.get("_renderer")
+    if renderer is None:
+        renderer = _compile_renderer(klass)
+    return renderer
+
+
 class BaseReply(metaclass=MessageMetaClass):
     """Base class for all replies"""
 
@@ -65,15 +137,102 @@ class BaseReply(metaclass=MessageMetaClass):
 
     def render(self):
         """Render reply from Python object to XML string"""
-        nodes = []
-        msg_type = f"<MsgType><![CDATA[{self.type}]]></MsgType>"
-        nodes.append(msg_type)
-        for name, field in self._fields.items():
-            value = getattr(self, name, field.default)
-            node_xml = field.to_xml(value)
-            nodes.append(node_xml)
-        data = "\n".join(nodes)
-        return f"<xml>\n{data}\n</xml>"
+        return _get_renderer(type(self))(self)
+
+    def freeze(self):
+        """
+        预先渲染回复，得到可以发送给任意用户的 ``FrozenReply``，
+        适用于欢迎语、菜单图文等对所有用户都相同的回复
+        """
+        return FrozenReply(self)
+
+    def __str__(self):
+        return self.render()
+
+
+_ENVELOPE = ("source", "target", "time")
+_ENVELOPE_SLOT = re.compile("\0(source|target|time)\0")
+
+
+class FrozenReply:
+    """
+    预先渲染的回复，发送给不同用户时只替换 ``ToUserName``、``FromUserName`` 和 ``CreateTime``::
+
+        welcome = ArticlesReply(articles=articles).freeze()
+
+        reply = create_reply(welcome, message)
+        xml = reply.render()
+        # 安全模式
+        xml = crypto.encrypt_message(reply, nonce, timestamp)
+
+    其余字段在 ``freeze`` 时渲染，之后修改原回复不会影响冻结的回复。冻结的回复可以在多个线程间共享。
+
+    :param reply: 要冻结的回复
+    """
+
+    __slots__ = ("reply", "source", "target", "time", "_chunks", "_binary_chunks", "_slots")
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.time = None
+        if type(reply).render is not BaseReply.render:
+            # e.g. EmptyReply, nothing to substitute
+            self.source = self.target = None
+            chunks = [reply.render()]
+        else:
+            for name in _ENVELOPE:
+                if _field_template(reply._fields[name]) is None:
+                    raise ValueError(f"{type(reply).__name__}.{name} does not render from a template")
+            self.source = reply.source
+            self.target = reply.target
+            xml = _get_renderer(type(reply))(reply, {name: f"\0{name}\0" for name in _ENVELOPE})
+            chunks = _ENVELOPE_SLOT.split(xml)
+        self._chunks = chunks[0::2]
+        self._binary_chunks = [to_binary(chunk) for chunk in self._chunks]
+        self._slots = tuple((name, reply._fields[name].xml_value) for name in chunks[1::2])
+
+    def __getattr__(self, name):
+        # content, media_id, ... of the frozen reply; slots are never delegated
+        if name in FrozenReply.__slots__:
+            raise AttributeError(name)
+        return getattr(self.reply, name)
+
+    def reply_to(self, message):
+        """
+        返回发送给 ``message`` 发送者的回复
+
+        :param message: 收到的消息
+        :return: 新的 ``FrozenReply``，与原回复共享渲染结果
+        """
+        reply = object.__new__(FrozenReply)
+        reply.reply = self.reply
+        reply.source = message.target
+        reply.target = message.source
+        reply.time = None
+        reply._chunks = self._chunks
+        reply._binary_chunks = self._binary_chunks
+        reply._slots = self._slots
+        return reply
+
+    def _envelope(self):
+        now = self.time or time.time()
+        return [str(convert(now if name == "time" else getattr(self, name))) for name, convert in self._slots]
+
+    @staticmethod
+    def _join(chunks, values):
+        parts = [None] * (2 * len(chunks) - 1)
+        parts[0::2] = chunks
+        parts[1::2] = values
+        return parts
+
+    def render(self):
+        """Render reply to XML string, substituting the envelope only"""
+        return "".join(self._join(self._chunks, self._envelope()))
+
+    def render_binary(self):
+        """Render reply to UTF-8 encoded XML, without encoding the frozen fields again"""
+        values = [to_binary(value) for value in self._envelope()]
+        return b"".join(self._join(self._binary_chunks, values))
 
     def __str__(self):
         return self.render()
@@ -321,6 +480,8 @@ def create_reply(reply, message=None, render=False):
     r = None
     if not reply:
         r = EmptyReply()
+    elif isinstance(reply, FrozenReply):
+        r = reply.reply_to(message) if message else reply
     elif isinstance(reply, BaseReply):
         r = reply
         if message:
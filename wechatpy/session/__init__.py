@@ -11,6 +11,38 @@ class SessionStorage:
     def delete(self, key):
         raise NotImplementedError()
 
+    def add(self, key, value, ttl=None):
+        """Set ``key`` only if it does not exist, return whether the value was stored
+
+        The default implementation is not atomic, backends shared by several
+        processes should override it.
+        """
+        if self.get(key) is not None:
+            return False
+        self.set(key, value, ttl)
+        return True
+
+    def get_many(self, keys):
+        """Return a dict of the values of ``keys`` which exist
+
+        The default implementation loops over ``get``, backends with a
+        network round trip per call should override it.
+        """
+        values = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    def set_many(self, mapping, ttl=None):
+        for key, value in mapping.items():
+            self.set(key, value, ttl)
+
+    def delete_many(self, keys):
+        for key in keys:
+            self.delete(key)
+
     def __getitem__(self, key):
         self.get(key)
 
@@ -19,3 +51,38 @@ class SessionStorage:
 
     def __delitem__(self, key):
         self.delete(key)
+
+
+class AsyncSessionStorage:
+    """asyncio 版本的 session 存储基类，供 ``wechatpy.client.aio`` 中的异步客户端使用"""
+
+    async def get(self, key, default=None):
+        raise NotImplementedError()
+
+    async def set(self, key, value, ttl=None):
+        raise NotImplementedError()
+
+    async def delete(self, key):
+        raise NotImplementedError()
+
+    async def add(self, key, value, ttl=None):
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def get_many(self, keys):
+        values = {}
+        for key in keys:
+            value = await self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    async def set_many(self, mapping, ttl=None):
+        for key, value in mapping.items():
+            await self.set(key, value, ttl)
+
+    async def delete_many(self, keys):
+        for key in keys:
+            await self.delete(key)
@@ -32,3 +32,27 @@ class MemcachedStorage(SessionStorage):
     def delete(self, key):
         key = self.key_name(key)
         self.mc.delete(key)
+
+    def add(self, key, value, ttl=0):
+        key = self.key_name(key)
+        value = json.dumps(value)
+        try:
+            # pymemcache does not report the result unless noreply is disabled
+            return bool(self.mc.add(key, value, ttl, noreply=False))
+        except TypeError:
+            return bool(self.mc.add(key, value, ttl))
+
+    def get_many(self, keys):
+        names = {self.key_name(key): key for key in keys}
+        values = self.mc.get_multi(list(names))
+        return {names[name]: json.loads(to_text(value)) for name, value in values.items() if value is not None}
+
+    def set_many(self, mapping, ttl=0):
+        values = {self.key_name(key): json.dumps(value) for key, value in mapping.items() if value is not None}
+        if values:
+            self.mc.set_multi(values, ttl or 0)
+
+    def delete_many(self, keys):
+        names = [self.key_name(key) for key in keys]
+        if names:
+            self.mc.delete_multi(names)
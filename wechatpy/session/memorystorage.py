@@ -1,19 +1,98 @@
 # -*- coding: utf-8 -*-
+import threading
+import time
+from collections import OrderedDict
 
 from wechatpy.session import SessionStorage
 
 
 class MemoryStorage(SessionStorage):
-    def __init__(self):
-        self._data = {}
+    """进程内存储
+
+    过期的条目在读取时丢弃，同时每隔 ``sweep_interval`` 秒在写入时清理一次全部过期条目。
+
+    :param maxsize: 最大条目数，超出时淘汰最久未使用的条目，默认不限制
+    :param sweep_interval: 清理过期条目的间隔（秒）
+    """
+
+    def __init__(self, maxsize=None, sweep_interval=60):
+        self.maxsize = maxsize
+        self.sweep_interval = sweep_interval
+        # key -> (value, monotonic expiry or None)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def _get(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= now:
+            del self._data[key]
+            return None
+        if self.maxsize:
+            self._data.move_to_end(key)
+        return value
+
+    def _set(self, key, value, ttl, now):
+        self._data[key] = (value, now + ttl if ttl else None)
+        if self.maxsize:
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+    def _sweep(self, now):
+        expired = [key for key, (_, expires_at) in self._data.items() if expires_at is not None and expires_at <= now]
+        for key in expired:
+            del self._data[key]
+        self._next_sweep = now + self.sweep_interval
 
     def get(self, key, default=None):
-        return self._data.get(key, default)
+        with self._lock:
+            value = self._get(key, time.monotonic())
+        return default if value is None else value
 
     def set(self, key, value, ttl=None):
         if value is None:
             return
-        self._data[key] = value
+        with self._lock:
+            self._set(key, value, ttl, time.monotonic())
 
     def delete(self, key):
-        self._data.pop(key, None)
+        with self._lock:
+            self._data.pop(key, None)
+
+    def add(self, key, value, ttl=None):
+        if value is None:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if self._get(key, now) is not None:
+                return False
+            self._set(key, value, ttl, now)
+            return True
+
+    def get_many(self, keys):
+        values = {}
+        with self._lock:
+            now = time.monotonic()
+            for key in keys:
+                value = self._get(key, now)
+                if value is not None:
+                    values[key] = value
+        return values
+
+    def set_many(self, mapping, ttl=None):
+        with self._lock:
+            now = time.monotonic()
+            for key, value in mapping.items():
+                if value is not None:
+                    self._set(key, value, ttl, now)
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 import json
+import uuid
 
-from wechatpy.session import SessionStorage
+from wechatpy.session import AsyncSessionStorage, SessionStorage
 from wechatpy.utils import to_text
 
 
@@ -32,3 +33,111 @@ class RedisStorage(SessionStorage):
     def delete(self, key):
         key = self.key_name(key)
         self.redis.delete(key)
+
+    def add(self, key, value, ttl=None):
+        key = self.key_name(key)
+        value = json.dumps(value)
+        return bool(self.redis.set(key, value, ex=ttl, nx=True))
+
+    def get_many(self, keys):
+        keys = list(keys)
+        values = self.redis.mget([self.key_name(key) for key in keys])
+        return {key: json.loads(to_text(value)) for key, value in zip(keys, values) if value is not None}
+
+    def set_many(self, mapping, ttl=None):
+        pipe = self.redis.pipeline(transaction=False)
+        for key, value in mapping.items():
+            if value is not None:
+                pipe.set(self.key_name(key), json.dumps(value), ex=ttl)
+        pipe.execute()
+
+    def delete_many(self, keys):
+        names = [self.key_name(key) for key in keys]
+        if names:
+            self.redis.delete(*names)
+
+
+class RedisInvalidation:
+    """通过 Redis pub/sub 在多个进程间通知 ``TieredStorage`` 丢弃进程内缓存
+
+    :param redis: ``redis.Redis`` 实例
+    :param channel: pub/sub 频道名称
+    """
+
+    def __init__(self, redis, channel="wechatpy:invalidate"):
+        self.redis = redis
+        self.channel = channel
+        self.sender = uuid.uuid4().hex
+        self._thread = None
+
+    def publish(self, key):
+        self.redis.publish(self.channel, f"{self.sender} {key}")
+
+    def subscribe(self, callback):
+        def handler(message):
+            sender, key = to_text(message["data"]).split(" ", 1)
+            # a process does not need to invalidate its own writes
+            if sender != self.sender:
+                callback(key)
+
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.channel: handler})
+        self._thread = pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def close(self):
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+
+class AsyncRedisStorage(AsyncSessionStorage):
+    """基于 ``redis.asyncio.Redis`` 的异步 session 存储"""
+
+    def __init__(self, redis, prefix="wechatpy"):
+        for method_name in ("get", "set", "delete"):
+            assert hasattr(redis, method_name)
+        self.redis = redis
+        self.prefix = prefix
+
+    def key_name(self, key):
+        return f"{self.prefix}:{key}"
+
+    async def get(self, key, default=None):
+        key = self.key_name(key)
+        value = await self.redis.get(key)
+        if value is None:
+            return default
+        return json.loads(to_text(value))
+
+    async def set(self, key, value, ttl=None):
+        if value is None:
+            return
+        key = self.key_name(key)
+        value = json.dumps(value)
+        await self.redis.set(key, value, ex=ttl)
+
+    async def delete(self, key):
+        key = self.key_name(key)
+        await self.redis.delete(key)
+
+    async def add(self, key, value, ttl=None):
+        key = self.key_name(key)
+        value = json.dumps(value)
+        return bool(await self.redis.set(key, value, ex=ttl, nx=True))
+
+    async def get_many(self, keys):
+        keys = list(keys)
+        values = await self.redis.mget([self.key_name(key) for key in keys])
+        return {key: json.loads(to_text(value)) for key, value in zip(keys, values) if value is not None}
+
+    async def set_many(self, mapping, ttl=None):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                if value is not None:
+                    pipe.set(self.key_name(key), json.dumps(value), ex=ttl)
+            await pipe.execute()
+
+    async def delete_many(self, keys):
+        names = [self.key_name(key) for key in keys]
+        if names:
+            await self.redis.delete(*names)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from wechatpy.session import SessionStorage
+
+# keys bound in one ``IN`` clause
+_MAX_IN_KEYS = 500
+
+
+class SQLiteStorage(SessionStorage):
+    """基于 SQLite（WAL 模式）的存储，同一台机器上的多个进程可以共享 access token::
+
+        session = SQLiteStorage("/var/run/wechatpy/session.db")
+
+    适用于 gunicorn 等多进程部署但没有 Redis 的场景，每个进程、线程使用各自的连接。
+
+    :param path: 数据库文件路径，所有进程需使用同一个文件
+    :param table: 表名
+    :param timeout: 等待其他进程释放写锁的秒数
+    :param sweep_interval: 清理过期条目的间隔（秒）
+    """
+
+    def __init__(self, path, table="wechatpy_session", timeout=5, sweep_interval=300):
+        self.path = path
+        self.table = table
+        self.timeout = timeout
+        self.sweep_interval = sweep_interval
+        self._local = threading.local()
+        self._next_sweep = time.time() + sweep_interval
+        with self._connection as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+
+    @property
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        # connections must not be shared with forked worker processes
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def close(self):
+        """关闭当前线程的连接"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _maybe_sweep(self, conn, now):
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.sweep_interval
+        conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+
+    @staticmethod
+    def _expires_at(ttl, now):
+        return now + ttl if ttl else None
+
+    def get(self, key, default=None):
+        row = self._connection.execute(
+            f"SELECT value FROM {self.table} WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ).fetchone()
+        if row is None:
+            return default
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        if value is None:
+            return
+        now = time.time()
+        with self._connection as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), self._expires_at(ttl, now)),
+            )
+            self._maybe_sweep(conn, now)
+
+    def delete(self, key):
+        with self._connection as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def add(self, key, value, ttl=None):
+        if value is None:
+            return False
+        now = time.time()
+        with self._connection as conn:
+            cursor = conn.execute(
+                f"INSERT INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?) "
+                f"ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+                f"WHERE {self.table}.expires_at IS NOT NULL AND {self.table}.expires_at <= ?",
+                (key, json.dumps(value), self._expires_at(ttl, now), now),
+            )
+            return cursor.rowcount == 1
+
+    @staticmethod
+    def _chunks(keys):
+        # older SQLite builds allow at most 999 variables per statement
+        keys = list(keys)
+        for i in range(0, len(keys), _MAX_IN_KEYS):
+            yield keys[i : i + _MAX_IN_KEYS]
+
+    def get_many(self, keys):
+        conn = self._connection
+        now = time.time()
+        result = {}
+        for chunk in self._chunks(keys):
+            placeholders = ", ".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, value FROM {self.table} "
+                f"WHERE key IN ({placeholders}) AND (expires_at IS NULL OR expires_at > ?)",
+                (*chunk, now),
+            ).fetchall()
+            result.update((key, json.loads(value)) for key, value in rows)
+        return result
+
+    def set_many(self, mapping, ttl=None):
+        now = time.time()
+        expires_at = self._expires_at(ttl, now)
+        rows = [(key, json.dumps(value), expires_at) for key, value in mapping.items() if value is not None]
+        with self._connection as conn:
+            conn.executemany(f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)", rows)
+            self._maybe_sweep(conn, now)
+
+    def delete_many(self, keys):
+        with self._connection as conn:
+            for chunk in self._chunks(keys):
+                conn.execute(f"DELETE FROM {self.table} WHERE key IN ({', '.join('?' * len(chunk))})", chunk)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from collections import OrderedDict
+
+from wechatpy.session import SessionStorage
+
+# suffix of the lease keys stored by wechatpy.client.base.single_flight_refresh
+_LEASE_SUFFIX = "_refresh_lock"
+
+
+class TieredStorage(SessionStorage):
+    """在任意 ``SessionStorage`` 前增加一层进程内缓存::
+
+        session = TieredStorage(RedisStorage(redis), max_staleness=60)
+
+    读取命中缓存时不访问后端存储，写入和删除会同时写穿到后端存储。缓存时间不超过
+    ``max_staleness`` 秒、写入时的 ``ttl``，以及 token 记录自身的 ``expires_at``。
+
+    其他进程通过后端存储写入的新值最多延迟 ``max_staleness`` 秒可见，微信刷新 access token
+    后旧 token 仍有 5 分钟有效期，因此 ``max_staleness`` 不宜超过 300 秒。
+    如需立即可见，可以传入 ``invalidation``，例如 ``wechatpy.session.redisstorage.RedisInvalidation``。
+    取得 token 刷新租约时会丢弃该 token 的缓存，刷新前总是从后端存储确认是否已被其他进程刷新。
+
+    :param storage: 后端存储
+    :param max_staleness: 进程内缓存的最长时间（秒）
+    :param maxsize: 进程内缓存的最大条目数，超出时淘汰最久未使用的条目
+    :param invalidation: 可选的失效通知通道，需提供 ``publish(key)`` 和 ``subscribe(callback)`` 方法
+    """
+
+    def __init__(self, storage, max_staleness=60, maxsize=1024, invalidation=None):
+        self.storage = storage
+        self.max_staleness = max_staleness
+        self.maxsize = maxsize
+        self.invalidation = invalidation
+        # key -> (value, cached until)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        if invalidation is not None:
+            invalidation.subscribe(self.invalidate)
+
+    def _cache_until(self, value, ttl=None):
+        until = time.time() + self.max_staleness
+        if ttl:
+            until = min(until, time.time() + ttl)
+        if isinstance(value, dict) and isinstance(value.get("expires_at"), (int, float)):
+            until = min(until, value["expires_at"])
+        return until
+
+    def _cache_get(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry[0]
+
+    def _cache_set(self, key, value, ttl=None):
+        if value is None:
+            return
+        until = self._cache_until(value, ttl)
+        with self._lock:
+            self._cache[key] = (value, until)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def invalidate(self, key):
+        """丢弃进程内缓存的 ``key``，不影响后端存储"""
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def _publish(self, key):
+        if self.invalidation is not None:
+            self.invalidation.publish(key)
+
+    def get(self, key, default=None):
+        value = self._cache_get(key)
+        if value is not None:
+            return value
+        value = self.storage.get(key)
+        if value is None:
+            return default
+        self._cache_set(key, value)
+        return value
+
+    def set(self, key, value, ttl=None):
+        if value is None:
+            return
+        self.storage.set(key, value, ttl)
+        self._cache_set(key, value, ttl)
+        self._publish(key)
+
+    def delete(self, key):
+        self.storage.delete(key)
+        self.invalidate(key)
+        self._publish(key)
+
+    def add(self, key, value, ttl=None):
+        self.invalidate(key)
+        added = self.storage.add(key, value, ttl)
+        if added and key.endswith(_LEASE_SUFFIX):
+            # the winner of a refresh lease must re-check the credential it guards in the backend,
+            # another process may have refreshed it while this one still caches the old value
+            guarded = key[: -len(_LEASE_SUFFIX)]
+            with self._lock:
+                for cached in [k for k in self._cache if k.startswith(guarded)]:
+                    del self._cache[cached]
+        return added
+
+    def get_many(self, keys):
+        values = {}
+        missing = []
+        for key in keys:
+            value = self._cache_get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                values[key] = value
+        if missing:
+            fetched = self.storage.get_many(missing)
+            for key, value in fetched.items():
+                self._cache_set(key, value)
+            values.update(fetched)
+        return values
+
+    def set_many(self, mapping, ttl=None):
+        self.storage.set_many(mapping, ttl)
+        for key, value in mapping.items():
+            self._cache_set(key, value, ttl)
+            self._publish(key)
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        self.storage.delete_many(keys)
+        for key in keys:
+            self.invalidate(key)
+            self._publish(key)
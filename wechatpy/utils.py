@@ -12,6 +12,55 @@
 import string
 import random
 import hashlib
+import importlib
+import re
+import sys
+from xml.parsers import expat
+
+
+def lazy_exports(module_name, exports):
+    """Build module level ``__getattr__`` and ``__dir__`` which import ``exports`` on first access
+
+    Submodules not imported yet are resolved too, as attribute access on a package
+    used to find them when the package imported them eagerly.
+
+    :param module_name: name of the module using it, usually ``__name__``
+    :param exports: dict of exported name to the module defining it
+    :return: tuple of ``(__getattr__, __dir__)``
+    """
+
+    def __getattr__(name):
+        source = exports.get(name)
+        if source is not None:
+            value = getattr(importlib.import_module(source), name)
+            setattr(sys.modules[module_name], name, value)
+            return value
+        if not name.startswith("__"):
+            submodule = f"{module_name}.{name}"
+            try:
+                return importlib.import_module(submodule)
+            except ModuleNotFoundError as e:
+                if e.name != submodule:
+                    raise
+        raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[module_name])) | set(exports))
+
+    return __getattr__, __dir__
+
+
+def create_process_pool(workers, initializer=None, initargs=()):
+    """Create a ``ProcessPoolExecutor`` whose workers are spawned, not forked
+
+    Forking a process that already runs other threads can deadlock the child.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(
+        workers, mp_context=multiprocessing.get_context("spawn"), initializer=initializer, initargs=initargs
+    )
 
 
 class ObjectDict(dict):
@@ -26,6 +75,24 @@ class ObjectDict(dict):
         self[key] = value
 
 
+class LazyAPIMixin:
+    """Lets an API class declared on a client class be bound to each client on first access"""
+
+    def __set_name__(self, owner, name):
+        self._attr_name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        # bind a new endpoint to the client on first access, the instance
+        # attribute then takes precedence over this non-data descriptor
+        api = type(self)(instance)
+        name = getattr(self, "_attr_name", None)
+        if name is not None:
+            instance.__dict__[name] = api
+        return api
+
+
 class WeChatSigner:
     """WeChat data signer"""
 
@@ -136,3 +203,216 @@ def random_string(length=16):
     rule = string.ascii_letters + string.digits
     rand_list = random.sample(rule, length)
     return "".join(rand_list)
+
+
+class _NotFlat(Exception):
+    pass
+
+
+def _parse_flat_xml(xml):
+    parser = expat.ParserCreate("utf-8")
+    parser.buffer_text = True
+    data = {}
+    text = []
+    root = None
+    tag = None
+    depth = 0
+
+    def start_element(name, attrs):
+        nonlocal root, tag, depth
+        if attrs:
+            raise _NotFlat()
+        depth += 1
+        if depth == 1:
+            root = name
+        elif depth == 2 and name not in data:
+            tag = name
+            text.clear()
+        else:
+            # nested or repeated elements
+            raise _NotFlat()
+
+    def end_element(name):
+        nonlocal depth
+        depth -= 1
+        if depth == 1:
+            data[tag] = "".join(text).strip() or None
+
+    def character_data(value):
+        if depth == 2:
+            text.append(value)
+        elif value.strip():
+            raise _NotFlat()
+
+    def start_doctype(*args):
+        # leave DTD and entity handling to xmltodict
+        raise _NotFlat()
+
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+    parser.StartDoctypeDeclHandler = start_doctype
+    parser.Parse(xml, True)
+    return {root: data or None}
+
+
+def parse_xml(xml):
+    """Parse XML into the same dict ``xmltodict.parse`` returns
+
+    Callback messages are mostly a flat ``<xml>`` element with text children,
+    those are parsed with expat directly. Nested or repeated elements, attributes
+    and DTDs fall back to xmltodict.
+
+    :param xml: XML str or bytes
+    """
+    xml = to_binary(xml)
+    try:
+        return _parse_flat_xml(xml)
+    except _NotFlat:
+        import xmltodict
+
+        return xmltodict.parse(xml, encoding="utf-8")
+
+
+_XML_START = re.compile(r"[ \t\n]*(?:<\?xml[^>]*\?>[ \t\n]*)?<xml>")
+# each match is anchored at the end of the previous one, so text inside CDATA is never taken for an element
+_XML_TEXT_ELEMENT = re.compile(r"[ \t\n]*<([A-Za-z_][\w.-]*)>(?:<!\[CDATA\[([^\]\r]*)\]\]>|([^<&\r]*))</\1>")
+_XML_END = re.compile(r"[ \t\n]*</xml>[ \t\n]*$")
+
+
+def _parse_xml_header(xml, header):
+    match = _XML_START.match(xml)
+    if match is None:
+        raise _NotFlat()
+    data = {}
+    match = _XML_TEXT_ELEMENT.match(xml, match.end())
+    while match is not None:
+        name = match[1]
+        if name not in header or name in data:
+            break
+        data[name] = match[match.lastindex].strip() or None
+        match = _XML_TEXT_ELEMENT.match(xml, match.end())
+    return data
+
+
+def _parse_xml_trailer(xml, trailer):
+    data = {}
+    for name in trailer:
+        start = xml.rfind(f"<{name}>")
+        match = _XML_TEXT_ELEMENT.match(xml, start) if start >= 0 else None
+        if match is None:
+            continue
+        value = match[match.lastindex].strip() or None
+        # only the plain elements closing the document may follow, otherwise it was text inside CDATA or nested
+        while match is not None:
+            end = match.end()
+            match = _XML_TEXT_ELEMENT.match(xml, end)
+        if _XML_END.match(xml, end):
+            data[name] = value
+    return data
+
+
+class LazyXMLDict(dict):
+    """Children of ``<xml>``, holding only the leading header elements until
+    something outside of them is looked up, then the whole document is parsed
+    """
+
+    def __init__(self, header, xml):
+        super().__init__(header)
+        self._xml = xml
+
+    def _load(self):
+        if self._xml is None:
+            return
+        data = parse_xml(self._xml)["xml"] or {}
+        self._xml = None
+        # keep values changed before loading
+        data.update(dict.items(self))
+        dict.update(self, data)
+
+    def __missing__(self, key):
+        if self._xml is None:
+            raise KeyError(key)
+        self._load()
+        return self[key]
+
+    def get(self, key, default=None):
+        if self._xml is not None and not dict.__contains__(self, key):
+            self._load()
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        if self._xml is not None and not dict.__contains__(self, key):
+            self._load()
+        return dict.__contains__(self, key)
+
+    def __delitem__(self, key):
+        self._load()
+        dict.__delitem__(self, key)
+
+    def pop(self, *args):
+        self._load()
+        return dict.pop(self, *args)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def __iter__(self):
+        self._load()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._load()
+        return dict.__len__(self)
+
+    def __eq__(self, other):
+        self._load()
+        return dict.__eq__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        self._load()
+        return dict.__repr__(self)
+
+    def keys(self):
+        self._load()
+        return dict.keys(self)
+
+    def values(self):
+        self._load()
+        return dict.values(self)
+
+    def items(self):
+        self._load()
+        return dict.items(self)
+
+    def copy(self):
+        self._load()
+        return dict(self)
+
+    def __reduce__(self):
+        return dict, (dict(self.items()),)
+
+
+def parse_xml_lazily(xml, header, trailer=()):
+    """Parse the leading ``header`` elements of a ``<xml>`` document now and
+    the rest of it on first access to anything else
+
+    Falls back to :func:`parse_xml` when the header can not be parsed on its own.
+
+    :param xml: XML str or bytes
+    :param header: names of the elements to parse eagerly
+    :param trailer: names of elements to parse eagerly when they are among the plain elements closing the document
+    :return: dict of the children of ``<xml>``
+    """
+    xml = to_text(xml)
+    try:
+        data = _parse_xml_header(xml, header)
+    except _NotFlat:
+        return parse_xml(xml)["xml"]
+    if trailer:
+        data.update(_parse_xml_trailer(xml, [name for name in trailer if name not in data]))
+    return LazyXMLDict(data, xml)
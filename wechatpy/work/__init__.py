@@ -1,7 +1,19 @@
 # -*- coding: utf-8 -*-
+from typing import TYPE_CHECKING
 
+from wechatpy.utils import lazy_exports
 
-from wechatpy.work.client import WeChatClient  # NOQA
-from wechatpy.work.crypto import WeChatCrypto  # NOQA
-from wechatpy.work.parser import parse_message  # NOQA
-from wechatpy.work.replies import create_reply  # NOQA
+if TYPE_CHECKING:
+    from wechatpy.work.client import WeChatClient  # NOQA
+    from wechatpy.work.crypto import WeChatCrypto  # NOQA
+    from wechatpy.work.parser import parse_message  # NOQA
+    from wechatpy.work.replies import create_reply  # NOQA
+
+_exports = {
+    "WeChatClient": "wechatpy.work.client",
+    "WeChatCrypto": "wechatpy.work.crypto",
+    "parse_message": "wechatpy.work.parser",
+    "create_reply": "wechatpy.work.replies",
+}
+__all__ = list(_exports)
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+    wechatpy.work.client.aio
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    asyncio 版本的企业微信客户端，用法参见 ``wechatpy.client.aio``。
+
+    :copyright: (c) 2014 by messense.
+    :license: MIT, see LICENSE for more details.
+"""
+import time
+
+from wechatpy.client.aio import AsyncBaseWeChatClient
+from wechatpy.work.client import WeChatClient
+from wechatpy.work.client.api import WeChatJSAPI
+
+
+class AsyncWeChatJSAPI(WeChatJSAPI):
+    async def _fetch_ticket(self, get_ticket, ticket_key):
+        jsapi_ticket = await get_ticket()
+        ticket = jsapi_ticket["ticket"]
+        expires_at = int(time.time()) + int(jsapi_ticket["expires_in"])
+        await self._client._session_set_many({ticket_key: ticket, f"{ticket_key}_expires_at": expires_at})
+        return ticket
+
+    async def _get_cached_ticket(self, get_ticket, ticket_key):
+        values = await self._client._session_get_many([ticket_key, f"{ticket_key}_expires_at"])
+        ticket = values.get(ticket_key)
+        expires_at = values.get(f"{ticket_key}_expires_at", 0)
+        if not ticket or expires_at < int(time.time()):
+            ticket = await self._fetch_ticket(get_ticket, ticket_key)
+        return ticket
+
+    async def fetch_jsapi_ticket(self):
+        return await self._fetch_ticket(self.get_ticket, f"{self._client.corp_id}_jsapi_ticket")
+
+    async def get_jsapi_ticket(self):
+        return await self._get_cached_ticket(self.get_ticket, f"{self._client.corp_id}_jsapi_ticket")
+
+    async def fetch_agent_jsapi_ticket(self):
+        return await self._fetch_ticket(self.get_agent_ticket, f"{self._client.corp_id}_agent_jsapi_ticket")
+
+    async def get_agent_jsapi_ticket(self):
+        return await self._get_cached_ticket(self.get_agent_ticket, f"{self._client.corp_id}_agent_jsapi_ticket")
+
+
+class AsyncWeChatClient(AsyncBaseWeChatClient, WeChatClient):
+    """
+    asyncio 版本的企业微信 API 操作类，API 方法均需 ``await`` 调用
+    """
+
+    jsapi = AsyncWeChatJSAPI()
+
+    def __init__(
+        self,
+        corp_id,
+        secret,
+        access_token=None,
+        session=None,
+        timeout=None,
+        auto_retry=True,
+        http_client=None,
+    ):
+        super().__init__(corp_id, secret, None, session, timeout, auto_retry)
+        self._init_async(http_client)
+        if access_token:
+            self._preset_access_token(access_token)
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 
+from operator import itemgetter
 from optionaldict import optionaldict
 
 from wechatpy.client.api.base import BaseWeChatAPI
@@ -28,8 +29,7 @@ class WeChatAgent(BaseWeChatAPI):
 
         :return: 应用概况列表
         """
-        res = self._get("agent/list")
-        return res["agentlist"]
+        return self._get("agent/list", result_processor=itemgetter("agentlist"))
 
     def set(
         self,
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 
+from operator import itemgetter
 from optionaldict import optionaldict
 
 from wechatpy.client.api.base import BaseWeChatAPI
@@ -47,8 +48,7 @@ class WeChatAppChat(BaseWeChatAPI):
         :param chat_id: 群聊id
         :return: 会话信息
         """
-        res = self._get("appchat/get", params={"chatid": chat_id})
-        return res["chat_info"]
+        return self._get("appchat/get", params={"chatid": chat_id}, result_processor=itemgetter("chat_info"))
 
     def update(self, chat_id, name=None, owner=None, add_user_list=None, del_user_list=None):
         """
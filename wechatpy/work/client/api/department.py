@@ -2,6 +2,7 @@
 
 
 from itertools import chain
+from operator import itemgetter
 from optionaldict import optionaldict
 
 from wechatpy.client.api.base import BaseWeChatAPI
@@ -67,11 +68,8 @@ class WeChatDepartment(BaseWeChatAPI):
         :param id: 部门id。获取指定部门及其下的子部门。 如果不填，默认获取全量组织架构
         :return: 部门列表
         """
-        if id is None:
-            res = self._get("department/list")
-        else:
-            res = self._get("department/list", params={"id": id})
-        return res["department"]
+        params = {} if id is None else {"id": id}
+        return self._get("department/list", params=params, result_processor=itemgetter("department"))
 
     def simple_list(self, id=None):
         """
@@ -83,11 +81,8 @@ class WeChatDepartment(BaseWeChatAPI):
         :param id: 部门id。获取指定部门及其下的子部门（以及子部门的子部门等等，递归）。 如果不填，默认获取全量组织架构
         :return: 部门列表
         """
-        if id is None:
-            res = self._get("department/simplelist")
-        else:
-            res = self._get("department/simplelist", params={"id": id})
-        return res["department_id"]
+        params = {} if id is None else {"id": id}
+        return self._get("department/simplelist", params=params, result_processor=itemgetter("department_id"))
 
     def get(self, id):
         """
@@ -99,8 +94,7 @@ class WeChatDepartment(BaseWeChatAPI):
         :param id: 部门 ID
         :return: 部门信息
         """
-        res = self._get("department/get", params={"id": id})
-        return res["department"]
+        return self._get("department/get", params={"id": id}, result_processor=itemgetter("department"))
 
     def get_users(self, id, fetch_child=0, simple=True):
         """
@@ -114,14 +108,14 @@ class WeChatDepartment(BaseWeChatAPI):
         :return: 部门成员列表
         """
         url = "user/simplelist" if simple else "user/list"
-        res = self._get(
+        return self._get(
             url,
             params={
                 "department_id": id,
                 "fetch_child": 1 if fetch_child else 0,
             },
+            result_processor=itemgetter("userlist"),
         )
-        return res["userlist"]
 
     def get_map_users(self, id=None, key="name", fetch_child=0):
         """
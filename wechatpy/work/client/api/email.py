@@ -243,7 +243,11 @@ class WeChatEMail(BaseWeChatAPI):
 
         :param email_id: 必填，业务邮箱 ID。
         """
-        return self.batch_get_public_email([email_id])[0]
+        return self._post(
+            "exmail/publicmail/get",
+            data={"id_list": [email_id]},
+            result_processor=lambda result: result["list"][0],
+        )
 
     def batch_get_public_email(self, email_ids):
         """
@@ -54,6 +54,19 @@ class WeChatJSAPI(BaseWeChatAPI):
         """
         return self._get("ticket/get", params={"type": "agent_config"})
 
+    def fetch_jsapi_ticket(self):
+        """
+        获取企业的 jsapi_ticket 并存入 session
+
+        :return: ticket
+        """
+        jsapi_ticket = self.get_ticket()
+        ticket = jsapi_ticket["ticket"]
+        expires_at = int(time.time()) + int(jsapi_ticket["expires_in"])
+        ticket_key = f"{self._client.corp_id}_jsapi_ticket"
+        self.session.set_many({ticket_key: ticket, f"{ticket_key}_expires_at": expires_at})
+        return ticket
+
     def get_jsapi_ticket(self):
         """
         获取微信 JS-SDK ticket
@@ -63,15 +76,24 @@ class WeChatJSAPI(BaseWeChatAPI):
         :return: ticket
         """
         ticket_key = f"{self._client.corp_id}_jsapi_ticket"
-        expires_at_key = f"{self._client.corp_id}_jsapi_ticket_expires_at"
-        ticket = self.session.get(ticket_key)
-        expires_at = self.session.get(expires_at_key) or 0
+        values = self.session.get_many([ticket_key, f"{ticket_key}_expires_at"])
+        ticket = values.get(ticket_key)
+        expires_at = values.get(f"{ticket_key}_expires_at", 0)
         if not ticket or expires_at < int(time.time()):
-            jsapi_ticket = self.get_ticket()
-            ticket = jsapi_ticket["ticket"]
-            expires_at = int(time.time()) + int(jsapi_ticket["expires_in"])
-            self.session.set(ticket_key, ticket)
-            self.session.set(expires_at_key, expires_at)
+            ticket = self.fetch_jsapi_ticket()
+        return ticket
+
+    def fetch_agent_jsapi_ticket(self):
+        """
+        获取应用的 jsapi_ticket 并存入 session
+
+        :return: ticket
+        """
+        jsapi_ticket = self.get_agent_ticket()
+        ticket = jsapi_ticket["ticket"]
+        expires_at = int(time.time()) + int(jsapi_ticket["expires_in"])
+        ticket_key = f"{self._client.corp_id}_agent_jsapi_ticket"
+        self.session.set_many({ticket_key: ticket, f"{ticket_key}_expires_at": expires_at})
         return ticket
 
     def get_agent_jsapi_ticket(self):
@@ -83,13 +105,9 @@ class WeChatJSAPI(BaseWeChatAPI):
         :return: ticket
         """
         ticket_key = f"{self._client.corp_id}_agent_jsapi_ticket"
-        expires_at_key = f"{self._client.corp_id}_agent_jsapi_ticket_expires_at"
-        ticket = self.session.get(ticket_key)
-        expires_at = self.session.get(expires_at_key) or 0
+        values = self.session.get_many([ticket_key, f"{ticket_key}_expires_at"])
+        ticket = values.get(ticket_key)
+        expires_at = values.get(f"{ticket_key}_expires_at", 0)
         if not ticket or expires_at < int(time.time()):
-            jsapi_ticket = self.get_agent_ticket()
-            ticket = jsapi_ticket["ticket"]
-            expires_at = int(time.time()) + int(jsapi_ticket["expires_in"])
-            self.session.set(ticket_key, ticket)
-            self.session.set(expires_at_key, expires_at)
+            ticket = self.fetch_agent_jsapi_ticket()
         return ticket
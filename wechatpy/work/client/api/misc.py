@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 
+from operator import itemgetter
 from wechatpy.client.api.base import BaseWeChatAPI
 
 
@@ -13,5 +14,4 @@ class WeChatMisc(BaseWeChatAPI):
 
         :return: 企业微信回调的IP段
         """
-        res = self._get("getcallbackip")
-        return res["ip_list"]
+        return self._get("getcallbackip", result_processor=itemgetter("ip_list"))
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+from operator import itemgetter
 from typing import Optional, List, Dict, Any
 
 from wechatpy.client.api.base import BaseWeChatAPI
@@ -357,5 +358,4 @@ class WeChatTag(BaseWeChatAPI):
 
         :return: 标签信息列表，不包含errcode等信息
         """
-        res = self._get("tag/list")
-        return res["taglist"]
+        return self._get("tag/list", result_processor=itemgetter("taglist"))
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+from operator import itemgetter
 from typing import Optional
 
 from optionaldict import optionaldict
@@ -120,15 +121,15 @@ class WeChatUser(BaseWeChatAPI):
         此接口和 `WeChatDepartment.get_users` 是同一个接口，区别为 simple 的默认值不同。
         """
         url = "user/simplelist" if simple else "user/list"
-        res = self._get(
+        return self._get(
             url,
             params={
                 "department_id": department_id,
                 "fetch_child": 1 if fetch_child else 0,
                 "status": status,
             },
+            result_processor=itemgetter("userlist"),
         )
-        return res["userlist"]
 
     def convert_to_openid(self, user_id, agent_id=None):
         """
@@ -152,8 +153,7 @@ class WeChatUser(BaseWeChatAPI):
         :param openid: 在使用微信支付、微信红包和企业转账之后，返回结果的openid
         :return: 该 openid 在企业微信中对应的成员 user_id
         """
-        res = self._post("user/convert_to_userid", data={"openid": openid})
-        return res["userid"]
+        return self._post("user/convert_to_userid", data={"openid": openid}, result_processor=itemgetter("userid"))
 
     def verify(self, user_id):
         """
@@ -186,8 +186,7 @@ class WeChatUser(BaseWeChatAPI):
           **通讯录同步** 的 ``secret``，否则调用接口时会出现错误。
         """
         params = optionaldict(size_type=size_type)
-        resp = self._get("corp/get_join_qrcode", params=params)
-        return resp["join_qrcode"]
+        return self._get("corp/get_join_qrcode", params=params, result_processor=itemgetter("join_qrcode"))
 
     def get_active_stat(self, date: str) -> int:
         """
@@ -202,8 +201,7 @@ class WeChatUser(BaseWeChatAPI):
 
         .. warning:: 仅通讯录同步助手可调用。
         """
-        resp = self._post("user/get_active_stat", data={"date": date})
-        return resp["active_cnt"]
+        return self._post("user/get_active_stat", data={"date": date}, result_processor=itemgetter("active_cnt"))
 
     def getuserid(self, mobile: str) -> int:
         """
@@ -217,8 +215,7 @@ class WeChatUser(BaseWeChatAPI):
         :param mobile: 用户在企业微信通讯录中的手机号码。长度为5~32个字节
         :return:
         """
-        resp = self._post("user/getuserid", data={"mobile": mobile})
-        return resp["userid"]
+        return self._post("user/getuserid", data={"mobile": mobile}, result_processor=itemgetter("userid"))
 
     def list_id(self, cursor: str, limit: int = 10000) -> dict:
         """
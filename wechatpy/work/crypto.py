@@ -9,6 +9,9 @@ class PrpCrypto(BasePrpCrypto):
     def decrypt(self, text, corp_id):
         return self._decrypt(text, corp_id, InvalidCorpIdException)
 
+    def decrypt_binary(self, text, corp_id):
+        return self._decrypt_binary(text, corp_id, InvalidCorpIdException)
+
 
 class WeChatCrypto(BaseWeChatCrypto):
     def __init__(self, token, encoding_aes_key, corp_id):
@@ -23,3 +26,15 @@ class WeChatCrypto(BaseWeChatCrypto):
 
     def decrypt_message(self, msg, signature, timestamp, nonce):
         return self._decrypt_message(msg, signature, timestamp, nonce, PrpCrypto)
+
+    def decrypt_and_parse(self, msg, signature, timestamp, nonce, parser=None, **kwargs):
+        """
+        解密企业微信推送的消息并解析，与 ``parse_message(crypto.decrypt_message(...))`` 结果相同
+
+        :param parser: 解析 XML 的函数，默认为 ``wechatpy.work.parse_message``
+        :param kwargs: 传给 ``parser`` 的参数，如 ``lazy``、``dedup``
+        :return: ``parser`` 的返回值
+        """
+        if parser is None:
+            from wechatpy.work.parser import parse_message as parser
+        return self._decrypt_and_parse(msg, signature, timestamp, nonce, parser, PrpCrypto, **kwargs)
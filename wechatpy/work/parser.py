@@ -1,18 +1,35 @@
 # -*- coding: utf-8 -*-
 
 
-import xmltodict
-
 from wechatpy.work.events import EVENT_TYPES
 from wechatpy.work.messages import MESSAGE_TYPES
 from wechatpy.messages import UnknownMessage
-from wechatpy.utils import to_text
+from wechatpy.utils import LazyXMLDict, parse_xml, parse_xml_lazily
+
+HEADER_FIELDS = frozenset(("ToUserName", "FromUserName", "CreateTime", "MsgType", "Event", "EventKey", "AgentID"))
+TRAILER_FIELDS = ("MsgId", "AgentID")
 
 
-def parse_message(xml):
+def parse_message(xml, lazy=False, dedup=None):
+    """
+    解析企业微信推送的 XML 消息
+
+    :param xml: XML 消息
+    :param lazy: 是否只解析消息头，其余字段在首次访问时解析，参见 ``wechatpy.parser.parse_message``
+    :param dedup: 可选的 ``wechatpy.dedup.MessageDeduplicator``，用于过滤重试推送的消息
+    :return: 解析成功返回对应的消息或事件，否则返回 ``UnknownMessage``，重复的消息返回 ``None``
+    """
     if not xml:
         return
-    message = xmltodict.parse(to_text(xml))["xml"]
+    if lazy or dedup is not None:
+        # the dedup key comes from the header and trailer, a retried message is dropped before the full parse
+        message = parse_xml_lazily(xml, HEADER_FIELDS, TRAILER_FIELDS)
+        if dedup is not None and dedup.is_duplicate(message):
+            return None
+        if not lazy and isinstance(message, LazyXMLDict):
+            message = parse_xml(xml)["xml"]
+    else:
+        message = parse_xml(xml)["xml"]
     message_type = message["MsgType"].lower()
     if message_type == "event":
         event_type = message["Event"].lower()
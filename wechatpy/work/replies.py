@@ -62,7 +62,9 @@ class TaskCardReply(replies.BaseReply):
 
 def create_reply(reply, message=None, render=False):
     r = None
-    if isinstance(reply, replies.BaseReply):
+    if isinstance(reply, replies.FrozenReply):
+        r = reply.reply_to(message) if message else reply
+    elif isinstance(reply, replies.BaseReply):
         r = reply
         if message:
             r.source = message.target
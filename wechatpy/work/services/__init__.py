@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import json
-import time
 import logging
 import requests
 
@@ -69,8 +68,7 @@ class WeChatServiceClient(BaseWeChatClient):
         expires_in = 7200
         if "expires_in" in result:
             expires_in = result["expires_in"]
-        self.session.set(self.access_token_key, result["suite_access_token"], expires_in)
-        self.expires_at = int(time.time()) + expires_in
+        self._store_access_token(result["suite_access_token"], expires_in)
         return result
 
     def _request(self, method, url_or_endpoint, **kwargs):